@@ -0,0 +1 @@
+"""AI Safety website build benchmarks"""
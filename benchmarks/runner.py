@@ -0,0 +1,327 @@
+"""
+Benchmark runner for AI Safety website builds
+Times the build pipeline on synthetic sites and compares results against a baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from src.builders.figures import render_job
+from src.builders.markdown_processor import MarkdownProcessor
+from src.builders.plot_generator import plot_jobs
+from src.builders.site_builder import SiteBuilder
+from src.builders.site_index import SiteIndex
+from src.builders.template_engine import TemplateEngine
+
+from .synthetic import REPO_ROOT, generate_site, write_minute_prices
+
+SUITES = ('markdown', 'index', 'templates', 'plots', 'build', 'streaming')
+
+# Streaming writes a multi-gigabyte file, so it only runs when asked for with --suite
+DEFAULT_SUITES = ('markdown', 'index', 'templates', 'plots', 'build')
+DEFAULT_RESULTS = REPO_ROOT / 'benchmarks' / 'results' / 'latest.json'
+
+# Relative slowdown of the median that counts as a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+def measure(func: Callable[[], Any], repeat: int, items: int = 1,
+            setup: Callable[[], Any] | None = None) -> dict[str, Any]:
+    """Run func repeat times and summarise its wall-clock samples"""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append(round(time.perf_counter() - started, 6))
+    median = statistics.median(samples)
+    return {
+        'items': items,
+        'repeat': repeat,
+        'min_s': min(samples),
+        'median_s': median,
+        'per_item_s': round(median / items, 9),
+        'samples': samples,
+    }
+
+
+def bench_markdown(site: Path, repeat: int) -> dict[str, Any]:
+    """MarkdownProcessor.convert over every page of the site"""
+    processor = MarkdownProcessor()
+    sources = [path.read_text(encoding='utf-8') for path in sorted((site / 'src' / 'content').glob('*.md'))]
+
+    def run() -> None:
+        for content in sources:
+            processor.convert(content)
+
+    return measure(run, repeat, len(sources))
+
+
+def bench_site_index(site: Path, repeat: int) -> dict[str, dict[str, Any]]:
+    """Scanning the frontmatter of every page, from scratch and with an up-to-date cache"""
+    content_dir = site / 'src' / 'content'
+    cache_path = site / 'site-index.json'
+    pages = len(list(content_dir.glob('*.md')))
+    SiteIndex(content_dir, cache_path).refresh()
+    return {
+        'cold': measure(lambda: SiteIndex(content_dir).refresh(), repeat, pages),
+        'cached': measure(lambda: SiteIndex(content_dir, cache_path).refresh(), repeat, pages),
+    }
+
+
+def bench_templates(site: Path, repeat: int) -> dict[str, Any]:
+    """TemplateEngine.render_page over every page of the site, with a fresh engine per build"""
+    processor = MarkdownProcessor()
+    pages = [
+        (path.stem, *processor.convert(path.read_text(encoding='utf-8')))
+        for path in sorted((site / 'src' / 'content').glob('*.md'))
+    ]
+    engine = TemplateEngine(str(site / 'src' / 'templates'))
+
+    def setup() -> None:
+        # Like a build, start without rendered fragments but with compiled templates
+        nonlocal engine
+        engine = TemplateEngine(str(site / 'src' / 'templates'))
+        engine.precompile()
+
+    def run() -> None:
+        for name, frontmatter, html in pages:
+            engine.render_page('page.html', html, frontmatter, name)
+
+    return measure(run, repeat, len(pages), setup)
+
+
+def bench_template_load(directory: Path, repeat: int) -> dict[str, dict[str, Any]]:
+    """Loading every template into a fresh engine, compiled from source and from the bytecode cache"""
+    templates_dir = str(REPO_ROOT / 'src' / 'templates')
+    cache_dir = directory / 'template-cache'
+    TemplateEngine(templates_dir, cache_dir=cache_dir).precompile()
+    return {
+        'compile': measure(lambda: TemplateEngine(templates_dir).precompile(), repeat),
+        'bytecode': measure(lambda: TemplateEngine(templates_dir, cache_dir=cache_dir).precompile(), repeat),
+    }
+
+
+def bench_plots(site: Path, repeat: int) -> dict[str, dict[str, Any]]:
+    """Each plot function on its own, against the site's data files"""
+    output_dir = site / 'plots'
+    output_dir.mkdir(exist_ok=True)
+    jobs = plot_jobs(str(site / 'src' / 'data'), str(output_dir))
+    return {job.output: measure(lambda job=job: render_job(job), repeat) for job in jobs}
+
+
+def bench_build(site: Path, repeat: int, workers: int | None) -> dict[str, Any]:
+    """A clean SiteBuilder.build of the whole site, without the render cache"""
+    pages = len(list((site / 'src' / 'content').glob('*.md')))
+
+    def run() -> None:
+        builder = SiteBuilder(str(site), workers=workers, use_cache=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            builder.build()
+
+    return measure(run, repeat, pages)
+
+
+# Streams a price history in a fresh interpreter so peak RSS reflects only the streaming.
+# getrusage keeps the parent's peak across fork and exec, so the kernel's
+# per-process high-water mark is read instead where it is available.
+STREAMING_PROBE = """
+import json, sys, time
+from pathlib import Path
+from src.builders.data_catalog import SCHEMAS
+from src.builders.profiling import peak_rss_mb
+from src.builders.streaming import stream_price_history
+
+def high_water_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+imported = high_water_mb()
+started = time.perf_counter()
+history = stream_price_history(Path(sys.argv[1]), SCHEMAS['market_trends'], 'D')
+print(json.dumps({'seconds': time.perf_counter() - started, 'rows': history.rows,
+                  'periods': len(history.periods), 'import_rss_mb': imported,
+                  'peak_rss_mb': high_water_mb()}))
+"""
+
+
+def bench_streaming(directory: Path, size_mb: int, repeat: int) -> dict[str, Any]:
+    """Daily OHLC aggregation of a minute-level price file of about size_mb megabytes"""
+    path = directory / 'market_trends.csv'
+    write_minute_prices(path, size_mb * 1024 * 1024)
+
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', STREAMING_PROBE, str(path)], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout))
+
+    samples = [round(run['seconds'], 6) for run in runs]
+    median = statistics.median(samples)
+    return {
+        'items': runs[0]['rows'],
+        'repeat': repeat,
+        'min_s': min(samples),
+        'median_s': median,
+        'per_item_s': round(median / runs[0]['rows'], 9),
+        'samples': samples,
+        'file_mb': round(path.stat().st_size / (1024 * 1024), 1),
+        'import_rss_mb': round(max(run['import_rss_mb'] for run in runs), 1),
+        'peak_rss_mb': round(max(run['peak_rss_mb'] for run in runs), 1),
+    }
+
+
+def git_revision() -> str:
+    """Current commit of the repository, if it can be determined"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+    return result.stdout.strip()
+
+
+def run_benchmarks(page_counts: list[int], years: int, repeat: int,
+                   suites: tuple[str, ...] = DEFAULT_SUITES, workers: int | None = 1,
+                   stream_mb: int = 2048) -> dict[str, Any]:
+    """Run the selected suites on a synthetic site of each size"""
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix='aisafety-bench-') as temp:
+        # Site-size suites share one synthetic site per page count
+        site_suites = {'markdown', 'index', 'templates', 'build'} & set(suites)
+        for pages in page_counts if site_suites else []:
+            site = generate_site(Path(temp) / f'site-{pages}', pages, years)
+            print(f"📐 Synthetic site: {pages} pages, {years} years of daily prices")
+
+            if 'markdown' in suites:
+                results[f'markdown.convert/{pages}'] = bench_markdown(site, repeat)
+            if 'index' in suites:
+                for mode, result in bench_site_index(site, repeat).items():
+                    results[f'site_index.refresh/{mode}/{pages}'] = result
+            if 'templates' in suites:
+                results[f'template.render_page/{pages}'] = bench_templates(site, repeat)
+            if 'build' in suites:
+                results[f'site.build/{pages}'] = bench_build(site, repeat, workers)
+
+        # Loading templates does not depend on the site size either
+        if 'templates' in suites:
+            for mode, result in bench_template_load(Path(temp), repeat).items():
+                results[f'template.load/{mode}'] = result
+
+        # Plots only depend on the data, so they are timed once rather than per site size
+        if 'plots' in suites:
+            site = generate_site(Path(temp) / 'site-plots', 1, years)
+            for output, result in bench_plots(site, repeat).items():
+                results[f'plot.{Path(output).stem}/{years}y'] = result
+
+        if 'streaming' in suites:
+            print(f"🌊 Streaming a {stream_mb} MB minute-level price history")
+            results[f'streaming.daily_ohlc/{stream_mb}mb'] = bench_streaming(Path(temp), stream_mb, repeat)
+
+    for name, result in results.items():
+        print(f"   {name:<36} {result['median_s']:10.4f}s median {result['per_item_s'] * 1000:10.3f}ms/item")
+
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pages': page_counts,
+            'years': years,
+            'repeat': repeat,
+            'workers': workers,
+            'stream_mb': stream_mb if 'streaming' in suites else None,
+        },
+        'benchmarks': results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Print the change in median time per benchmark and return the names that regressed"""
+    regressions = []
+    print(f"{'benchmark':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name in sorted(baseline['benchmarks'].keys() | current['benchmarks'].keys()):
+        before = baseline['benchmarks'].get(name)
+        after = current['benchmarks'].get(name)
+        if before is None or after is None:
+            print(f"{name:<36} {'only in ' + ('current' if before is None else 'baseline'):>30}")
+            continue
+
+        change = after['median_s'] / before['median_s'] - 1 if before['median_s'] else 0.0
+        marker = ''
+        if change > threshold:
+            regressions.append(name)
+            marker = ' ❌'
+        print(f"{name:<36} {before['median_s']:10.4f} {after['median_s']:10.4f} {change:+8.1%}{marker}")
+    return regressions
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """Read a results file written by the run command"""
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point for running and comparing benchmarks"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the website build pipeline')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run benchmarks and write a results file')
+    run.add_argument('--pages', type=int, nargs='+', default=[10, 1000],
+                     help='Synthetic site sizes to benchmark (default: 10 1000)')
+    run.add_argument('--years', type=int, default=10, help='Years of daily prices in the synthetic data (default: 10)')
+    run.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (default: 3)')
+    run.add_argument('--suite', choices=SUITES, action='append',
+                     help=f"Suites to run (repeatable, default: {' '.join(DEFAULT_SUITES)})")
+    run.add_argument('--stream-mb', type=int, default=2048,
+                     help='Size of the synthetic file for the streaming suite (default: 2048)')
+    run.add_argument('--workers', type=int, default=1, help='Worker processes for full builds (default: 1)')
+    run.add_argument('--output', type=Path, default=DEFAULT_RESULTS, help='Results file to write')
+
+    diff = commands.add_parser('compare', help='Compare a results file against a baseline')
+    diff.add_argument('baseline', type=Path)
+    diff.add_argument('current', type=Path, nargs='?', default=DEFAULT_RESULTS)
+    diff.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                      help='Allowed relative slowdown before failing (default: 0.10)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_benchmarks(args.pages, args.years, args.repeat,
+                                 tuple(args.suite or DEFAULT_SUITES), args.workers, args.stream_mb)
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"📝 Results written to {args.output}")
+        return 0
+
+    regressions = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Synthetic site generators for AI Safety website benchmarks
+Builds throwaway project trees with many pages and long price histories
+"""
+
+import random
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PARAGRAPH = (
+    "AI adoption is reshaping **labour markets**, *capital allocation* and household "
+    "balance sheets. See the [references](references.html#{ref}) for sources on "
+    "productivity, displacement and policy responses in economy number {index}."
+)
+
+# The first pages of a synthetic site get navigation buttons, like the real site's five
+NAV_ICONS = ('home_icon.png', 'economy_icon.png', 'ai_icon.png', 'society_icon.png', 'privacy_icon.png')
+
+
+def synthetic_page(index: int, rng: random.Random) -> str:
+    """One markdown page with frontmatter, sections, a standalone image and tabs"""
+    sections = []
+    for section in range(rng.randint(3, 6)):
+        paragraphs = '\n\n'.join(
+            PARAGRAPH.format(ref=rng.randint(1, 20), index=index) for _ in range(rng.randint(2, 4))
+        )
+        sections.append(f"## Section {section + 1}\n\n{paragraphs}\n\n- Point one\n- Point two\n")
+
+    tabs = '\n'.join(
+        f'{{{{< tab "Scenario {tab}" "page{index}-tab{tab}" >}}}}\n'
+        f'![Scenario {tab}](images/person{"ABC"[tab % 3]}.png)\n'
+        f'*Projection for scenario {tab}.*\n'
+        f'{{{{< /tab >}}}}'
+        for tab in range(3)
+    )
+
+    nav = (
+        f'nav: "main"\nnav_order: {index}\nnav_icon: "{NAV_ICONS[index]}"\n' if index < len(NAV_ICONS) else ''
+    )
+    return (
+        f'---\ntitle: "Synthetic Page {index}"\ntagline: "Generated for benchmarking"\n'
+        f'description: "Synthetic benchmark page {index}"\n{nav}---\n\n'
+        f'# Synthetic Page {index}\n\n'
+        + '\n'.join(sections)
+        + '\n![Market Trends](images/market_trends.png)\n\n'
+        + f'{{{{< tabs >}}}}\n{tabs}\n{{{{< /tabs >}}}}\n'
+    )
+
+
+def synthetic_prices(years: int, seed: int = 0) -> str:
+    """Daily S&P 500 and Bitcoin closes as a random walk, in market_trends.csv format"""
+    rng = random.Random(seed)
+    sp500, bitcoin = 3200.0, 7200.0
+    start = date(2000, 1, 1)
+    lines = ['Date,SP500,Bitcoin']
+    for day in range(int(years * 365.25)):
+        sp500 *= 1 + rng.gauss(0.0003, 0.01)
+        bitcoin *= 1 + rng.gauss(0.001, 0.04)
+        lines.append(f"{start + timedelta(days=day)},{sp500:.2f},{bitcoin:.2f}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_minute_prices(path: Path, target_bytes: int, seed: int = 0, block_rows: int = 500_000) -> int:
+    """Write minute-level S&P 500 and Bitcoin prices until the file reaches target_bytes
+
+    Rows are generated and appended one block at a time, so multi-gigabyte files
+    can be written without holding them in memory. Returns the number of rows.
+    """
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2000-01-01T00:00', 'm')
+    last = np.array([3200.0, 7200.0])
+    rows = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Date,SP500,Bitcoin\n')
+        while f.tell() < target_bytes:
+            minutes = start + np.arange(rows, rows + block_rows)
+            steps = np.cumprod(1 + rng.normal([0.0, 0.0], [0.0005, 0.002], size=(block_rows, 2)), axis=0)
+            prices = last * steps
+            last = prices[-1]
+            pd.DataFrame({
+                'Date': np.datetime_as_string(minutes, unit='m'),
+                'SP500': prices[:, 0],
+                'Bitcoin': prices[:, 1],
+            }).to_csv(f, header=False, index=False, float_format='%.2f')
+            rows += block_rows
+    return rows
+
+
+def generate_site(root: Path, pages: int, years: int = 5, seed: int = 0) -> Path:
+    """Create a project tree with the real templates and static files and synthetic content"""
+    rng = random.Random(seed)
+    src = root / 'src'
+    shutil.copytree(REPO_ROOT / 'src' / 'templates', src / 'templates')
+    shutil.copytree(REPO_ROOT / 'src' / 'static', src / 'static')
+    shutil.copytree(REPO_ROOT / 'src' / 'data', src / 'data')
+    (src / 'data' / 'market_trends.csv').write_text(synthetic_prices(years, seed))
+
+    content = src / 'content'
+    content.mkdir(parents=True)
+    (content / 'index.md').write_text(synthetic_page(0, rng).replace('Synthetic Page 0', 'Home'))
+    for index in range(1, pages):
+        (content / f'page{index:05d}.md').write_text(synthetic_page(index, rng))
+    return root
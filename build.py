@@ -7,7 +7,12 @@ Main build script to generate the complete website
 import sys
 from pathlib import Path
 
-from src.builders.site_builder import SiteBuilder
+from src.builders.site_builder import (
+    SiteBuilder,
+    build_arg_parser,
+    builder_options,
+    run_builder,
+)
 
 
 def main() -> None:
@@ -15,14 +20,16 @@ def main() -> None:
     print("🚀 AI Safety Website Builder")
     print("=" * 40)
 
+    args = build_arg_parser().parse_args()
+
     # Get project root
     project_root = Path(__file__).parent
 
     # Create and run site builder
-    builder = SiteBuilder(str(project_root))
+    builder = SiteBuilder(str(project_root), **builder_options(args))
 
     try:
-        builder.build()
+        run_builder(builder, args)
         print("\nBuild completed successfully!")
         print(f"Website built in: {builder.output_dir}")
 
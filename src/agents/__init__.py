@@ -0,0 +1 @@
+# AI agents package
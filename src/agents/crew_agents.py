@@ -20,12 +20,30 @@ Agents defined:
 
 A helper function build_crew() constructs a Crew object with a default
 process flow.  You can adjust the order of tasks or add additional
-conditional logic as needed.
+conditional logic as needed.  run_crew() instead runs the tasks with the
+scheduler in scheduler.py, which starts each task as soon as the tasks it
+takes as context are done, so independent tasks run concurrently.  Its
+responses can be cached across runs, or replayed offline from a stub
+model, with llm_cache.py, and measured per task with instrumentation.py.
 """
 
 from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
 from typing import Any
 
+from .instrumentation import CrewInstrumentation
+from .llm_cache import CachedRunner, LLMCache, StubLLM, documents_fingerprint
+from .scheduler import (
+     DEFAULT_CONCURRENCY,
+     DagScheduler,
+     Listener,
+     ScheduleResult,
+     TaskRunner,
+     run_task,
+)
+
 # Import CrewAI classes.  If you haven't installed crewai yet, run
 # `pip install crewai` in your environment.  These imports are kept
 # inside a try/except so that the module can be imported without
@@ -34,20 +52,25 @@ from typing import Any
 try:
      from crewai import Agent, Crew, Task
 except ImportError:
-     # Define dummy classes for type checking and to prevent runtime errors
+     # Define dummy classes for type checking and to prevent runtime errors.
+     # Agents and tasks keep their fields so the scheduler can read them.
      class Agent:  # type: ignore
          def __init__(self, *args: Any, **kwargs: Any) -> None:
-             pass
+             self.__dict__.update(kwargs)
 
      class Task:  # type: ignore
          def __init__(self, *args: Any, **kwargs: Any) -> None:
-             pass
+             self.__dict__.update(kwargs)
 
      class Crew:  # type: ignore
          def __init__(self, *args: Any, **kwargs: Any) -> None:
              pass
 
 
+# Documents the summariser reads
+LOCAL_DATA_DIR = Path(__file__).parent / "local_data"
+
+
 def build_agents() -> list[Agent]:
      """Create and return the list of agents used in the crew.
 
@@ -244,6 +267,7 @@ def build_tasks(agents: list[Agent]) -> list[Task]:
 
      # Task 1: summarise uploaded documents
      summarise_task = Task(
+         name="summarise",
          description=(
              "Summarise all newly uploaded files, produce concise bullet points "
              "and cite the original sources.  Save raw text and summaries in the "
@@ -255,6 +279,7 @@ def build_tasks(agents: list[Agent]) -> list[Task]:
 
      # Task 2: research and verify the content
      research_task = Task(
+         name="research",
          description=(
              "Verify the information in the summaries using credible external sources. "
              "Gather any new context or updates relevant to the categories on the site."
@@ -266,6 +291,7 @@ def build_tasks(agents: list[Agent]) -> list[Task]:
 
      # Task 3: evaluate whether updates are needed
      evaluate_task = Task(
+         name="evaluate",
          description=(
              "Compare the verified information with the existing website content. "
              "For each category, decide whether an update is necessary and list the "
@@ -278,6 +304,7 @@ def build_tasks(agents: list[Agent]) -> list[Task]:
 
      # Task 4: develop the new content
      develop_task = Task(
+         name="develop",
          description=(
              "Draft the updated content in Markdown for the sections flagged by "
              "the evaluator.  Follow the site’s narrative style, include headings, "
@@ -290,6 +317,7 @@ def build_tasks(agents: list[Agent]) -> list[Task]:
 
      # Task 5: validate the updates
      validate_task = Task(
+         name="validate",
          description=(
              "Review the drafted updates to ensure they are unbiased, factually correct "
              "and aligned with the site’s mission.  Edit or reject content if necessary."
@@ -301,6 +329,7 @@ def build_tasks(agents: list[Agent]) -> list[Task]:
 
      # Task 6: deploy the updates
      deploy_task = Task(
+         name="deploy",
          description=(
              "Merge the validated updates into the main branch, run the build and deploy "
              "process, and generate a summary of changes."
@@ -313,6 +342,7 @@ def build_tasks(agents: list[Agent]) -> list[Task]:
      # Task: fetch market price data (if the data_fetcher agent exists)
      if data_fetcher:
          data_fetch_task = Task(
+             name="data_fetch",
              description=(
                  "Retrieve historical price data for a list of tickers between 2020 and 2025. "
                  "Produce a table of dates and closing prices for each ticker.  Use yfinance or "
@@ -329,6 +359,7 @@ def build_tasks(agents: list[Agent]) -> list[Task]:
      # Task: forecast future prices using historical data and macro context
      if forecast_agent:
          forecast_task = Task(
+             name="forecast",
              description=(
                  "Using the historical price data and macro context from the research task, "
                  "build forecasting models (e.g., ARIMA or regression).  Predict price trajectories "
@@ -367,3 +398,45 @@ def build_crew() -> Crew:
         verbose=True
     )
     return crew
+
+
+def run_crew(runner: TaskRunner = run_task,
+             max_concurrency: int = DEFAULT_CONCURRENCY,
+             listeners: Iterable[Listener] = (),
+             cache: LLMCache | None = None,
+             replay: bool = False,
+             instrumentation: CrewInstrumentation | None = None) -> ScheduleResult:
+    """Run the crew's tasks concurrently in dependency order.
+
+    Each task starts once the tasks in its `context` are done, so data
+    fetching and evaluation both start right after research, and the
+    forecast overlaps the content drafting.  Pass a stub `runner` to exercise
+    the flow without calling any model.
+
+    With a `cache`, a task whose agent, description, upstream outputs and
+    local documents are unchanged reuses its stored response instead of
+    asking the model again.  With `replay`, the model is never called:
+    responses missing from the cache come from a local stub model.
+
+    With `instrumentation`, each task's wall time, queue wait, tokens,
+    retries and estimated cost are logged as JSON lines and summarised in
+    a table at the end.  Tokens are counted for calls that reach the model
+    or, in replay, the stub model, but not for cached responses.
+    """
+    agents = build_agents()
+    tasks = build_tasks(agents)
+    listeners = list(listeners)
+    stub: TaskRunner = StubLLM()
+    if instrumentation is not None:
+        runner = instrumentation.wrap(runner)
+        stub = instrumentation.wrap(stub)
+        listeners.append(instrumentation)
+    if cache is not None or replay:
+        runner = CachedRunner(runner, cache, fingerprint=documents_fingerprint(LOCAL_DATA_DIR),
+                              replay=replay, stub=stub)
+    scheduler = DagScheduler(runner, max_concurrency=max_concurrency, listeners=listeners)
+    result = scheduler.run(tasks)
+    if instrumentation is not None:
+        instrumentation.finalize()
+        instrumentation.print_summary()
+    return result
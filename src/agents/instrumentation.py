@@ -0,0 +1,207 @@
+"""
+Crew instrumentation for AI Safety website
+Records wall time, queue wait, tokens, retries and estimated cost for each crew task as JSON lines
+"""
+
+import json
+import math
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .scheduler import TaskRun, TaskRunner, agent_name, task_name
+
+# Rough characters per token for English prose, used when the model reports no usage
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class TokenPrices:
+    """US dollars per million prompt and completion tokens; set these to the model's rates"""
+
+    prompt_per_million: float = 3.0
+    completion_per_million: float = 15.0
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.prompt_per_million + completion_tokens * self.completion_per_million) / 1e6
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a piece of text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def task_prompt(task: Any, context: list[str]) -> str:
+    """The text an agent is given for a task: its role, goal and backstory, the task and its context"""
+    agent = getattr(task, 'agent', None)
+    parts = [
+        getattr(agent, 'role', None),
+        getattr(agent, 'goal', None),
+        getattr(agent, 'backstory', None),
+        getattr(task, 'description', None),
+        getattr(task, 'expected_output', None),
+        *context,
+    ]
+    return '\n\n'.join(str(part) for part in parts if part)
+
+
+@dataclass
+class TaskMetrics:
+    """Measurements of one crew task"""
+
+    task: str
+    agent: str | None = None
+    status: str = 'pending'
+    queue_wait_s: float = 0.0
+    wall_s: float = 0.0
+    model_calls: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    error: str | None = None
+
+
+# Metrics of the task whose model call is running in this thread, for the hooks below
+_current: ContextVar[tuple[TaskMetrics, dict[str, int]] | None] = ContextVar('crew_task_metrics', default=None)
+
+
+def record_retry() -> None:
+    """Hook for the layer that retries model calls: count one retry of the running task
+
+    Call it from the model client's or CrewAI's retry callback. A retry is also
+    counted as a model call. Outside an instrumented task it does nothing.
+    """
+    current = _current.get()
+    if current is not None:
+        metrics, usage = current
+        metrics.retries += 1
+        metrics.model_calls += 1
+        usage['retries'] += 1
+
+
+def record_usage(prompt_tokens: int, completion_tokens: int) -> None:
+    """Hook for a model client that reports usage: exact token counts for the running task's call
+
+    Reported counts replace the estimate from the prompt and response text.
+    Outside an instrumented task it does nothing.
+    """
+    current = _current.get()
+    if current is not None:
+        _, usage = current
+        usage['prompt_tokens'] += prompt_tokens
+        usage['completion_tokens'] += completion_tokens
+        usage['reported'] = 1
+
+
+class CrewInstrumentation:
+    """Per-task metrics for a crew run, written as one JSON line per finished task
+
+    Use the instance as a scheduler listener for timings and status, and wrap the
+    runner that calls the model with wrap() for calls, tokens and cost. Wrapping
+    only observes: retries stay with the model client, which reports them through
+    record_retry(). Calls answered from the response cache never reach the
+    wrapped runner, so they show no tokens and no model calls.
+    """
+
+    def __init__(self, log_path: Path | None = None, prices: TokenPrices | None = None):
+        self.log_path = Path(log_path) if log_path is not None else None
+        self.prices = prices or TokenPrices()
+        self.metrics: dict[str, TaskMetrics] = {}
+        self._lock = threading.Lock()
+        self._started: float | None = None
+        if self.log_path is not None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self.log_path.write_text('', encoding='utf-8')
+
+    def _metrics(self, task: str, agent: str | None) -> TaskMetrics:
+        with self._lock:
+            if task not in self.metrics:
+                self.metrics[task] = TaskMetrics(task, agent)
+            return self.metrics[task]
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self.log_path is None:
+            return
+        with self._lock, self.log_path.open('a', encoding='utf-8') as log:
+            log.write(json.dumps(record) + '\n')
+
+    def __call__(self, event: str, run: TaskRun) -> None:
+        """Scheduler listener: record timings and status when a task finishes"""
+        if event == 'ready' and self._started is None:
+            self._started = run.ready_at
+        if event != 'finished':
+            return
+        metrics = self._metrics(run.name, run.agent)
+        metrics.status = run.status
+        metrics.queue_wait_s = round(run.queue_wait_s, 6)
+        metrics.wall_s = round(run.duration_s, 6)
+        metrics.cost_usd = round(self.prices.cost(metrics.prompt_tokens, metrics.completion_tokens), 6)
+        if run.error is not None:
+            metrics.error = f'{type(run.error).__name__}: {run.error}'
+        self._write({'event': 'task', **asdict(metrics)})
+
+    def wrap(self, runner: TaskRunner) -> TaskRunner:
+        """A runner that calls the wrapped runner once and counts its call and tokens
+
+        Tokens are those reported through record_usage() during the call, or
+        estimated from the prompt and response text when none are reported, with
+        the prompt counted once per attempt.
+        """
+
+        def instrumented(task: Any, context: list[str]) -> str:
+            metrics = self._metrics(task_name(task), agent_name(task))
+            metrics.model_calls += 1
+            usage = {'prompt_tokens': 0, 'completion_tokens': 0, 'reported': 0, 'retries': 0}
+            output = None
+            token = _current.set((metrics, usage))
+            try:
+                output = runner(task, context)
+                return output
+            finally:
+                _current.reset(token)
+                if usage['reported']:
+                    metrics.prompt_tokens += usage['prompt_tokens']
+                    metrics.completion_tokens += usage['completion_tokens']
+                else:
+                    metrics.prompt_tokens += estimate_tokens(task_prompt(task, context)) * (1 + usage['retries'])
+                    metrics.completion_tokens += estimate_tokens(output) if output is not None else 0
+
+        return instrumented
+
+    def finalize(self) -> None:
+        """Write the totals as the last JSON line"""
+        self._write({'event': 'summary', **self.summary()})
+
+    def summary(self) -> dict[str, Any]:
+        """Totals across every task"""
+        metrics = list(self.metrics.values())
+        return {
+            'tasks': len(metrics),
+            'failed': sum(item.status == 'failed' for item in metrics),
+            'wall_s': round(time.perf_counter() - self._started, 6) if self._started is not None else 0.0,
+            'task_wall_s': round(sum(item.wall_s for item in metrics), 6),
+            'queue_wait_s': round(sum(item.queue_wait_s for item in metrics), 6),
+            'model_calls': sum(item.model_calls for item in metrics),
+            'retries': sum(item.retries for item in metrics),
+            'prompt_tokens': sum(item.prompt_tokens for item in metrics),
+            'completion_tokens': sum(item.completion_tokens for item in metrics),
+            'cost_usd': round(sum(item.cost_usd for item in metrics), 6),
+        }
+
+    def print_summary(self) -> None:
+        """Print one line per task, slowest first, and the totals"""
+        print("\n📊 Crew task metrics:")
+        print(f"   {'task':<12} {'agent':<18} {'status':<8} {'wall':>8} {'queue':>8} "
+              f"{'calls':>5} {'retry':>5} {'prompt':>8} {'compl':>8} {'cost $':>9}")
+        for item in sorted(self.metrics.values(), key=lambda metrics: metrics.wall_s, reverse=True):
+            print(f"   {item.task:<12} {item.agent or '-':<18} {item.status:<8} {item.wall_s:7.2f}s "
+                  f"{item.queue_wait_s:7.2f}s {item.model_calls:5d} {item.retries:5d} "
+                  f"{item.prompt_tokens:8d} {item.completion_tokens:8d} {item.cost_usd:9.4f}")
+        total = self.summary()
+        print(f"   {'total':<12} {'':<18} {'':<8} {total['task_wall_s']:7.2f}s {total['queue_wait_s']:7.2f}s "
+              f"{total['model_calls']:5d} {total['retries']:5d} {total['prompt_tokens']:8d} "
+              f"{total['completion_tokens']:8d} {total['cost_usd']:9.4f}")
@@ -0,0 +1,206 @@
+"""
+Agent response cache for AI Safety website
+Stores crew task outputs in SQLite keyed by agent, task and upstream context, with a stub model for offline replay
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .scheduler import TaskRunner, task_name
+
+# Bump when the key or stored format changes so old responses are ignored
+CACHE_VERSION = 1
+
+# Responses older than this are asked for again; news and prices move weekly
+DEFAULT_TTL_S = 7 * 24 * 3600
+
+# Where responses are kept unless another path is given, next to the build caches
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / '.build_cache' / 'llm-responses.sqlite3'
+
+# Least recently used responses are evicted once the stored text exceeds this
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def context_hash(context: list[str]) -> str:
+    """Hash of a task's upstream outputs, in context order"""
+    return _sha256(json.dumps(context))
+
+
+def documents_fingerprint(directory: Path) -> str:
+    """Hash of the names and contents of every file under a directory, e.g. the agents' local data"""
+    digest = hashlib.sha256()
+    if directory.is_dir():
+        for path in sorted(p for p in directory.rglob('*') if p.is_file()):
+            digest.update(path.relative_to(directory).as_posix().encode('utf-8') + b'\0')
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def cache_key(task: Any, context: list[str], fingerprint: str = '') -> str:
+    """Key of a task's response: its agent's role and goal, its description and its upstream context
+
+    fingerprint folds in inputs the task reads that are not in its context, such as source documents.
+    """
+    agent = getattr(task, 'agent', None)
+    return _sha256(json.dumps({
+        'version': CACHE_VERSION,
+        'role': getattr(agent, 'role', None),
+        'goal': getattr(agent, 'goal', None),
+        'description': getattr(task, 'description', None),
+        'expected_output': getattr(task, 'expected_output', None),
+        'context': context_hash(context),
+        'fingerprint': fingerprint,
+    }, sort_keys=True))
+
+
+@dataclass
+class CacheStats:
+    """Lookups answered from the cache and responses evicted from it"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class LLMCache:
+    """Agent responses in a SQLite file, expiring after ttl_s and evicted least recently used past max_bytes
+
+    One connection is shared by the scheduler's worker threads behind a lock.
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_CACHE_PATH,
+                 ttl_s: float = DEFAULT_TTL_S,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        if str(path) != ':memory:':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> 'LLMCache':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0])
+
+    @property
+    def size(self) -> int:
+        """Bytes of response text stored"""
+        with self._lock:
+            return int(self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0])
+
+    def get(self, key: str) -> str | None:
+        """The stored response, or None when it is missing or expired"""
+        now = self.clock()
+        with self._lock:
+            row = self._connection.execute('SELECT response, created FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_s:
+                self._connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                row = None
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._connection.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            self.stats.hits += 1
+            return str(row[0])
+
+    def put(self, key: str, response: str, task: str = '') -> None:
+        """Store a response, then evict expired and least recently used ones to stay within max_bytes"""
+        now = self.clock()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses (key, task, response, size, created, accessed) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, task, response, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        expired = self._connection.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl_s,))
+        self.stats.evictions += expired.rowcount
+        total = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._connection.execute('SELECT key, size FROM responses ORDER BY accessed, created'):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._connection.executemany('DELETE FROM responses WHERE key = ?', doomed)
+        self.stats.evictions += len(doomed)
+
+
+class StubLLM:
+    """Offline stand-in for the model: a deterministic response built from the task and its context"""
+
+    def __call__(self, task: Any, context: list[str]) -> str:
+        expected = getattr(task, 'expected_output', None) or 'Output'
+        return f'[{task_name(task)}] {expected} (context {context_hash(context)[:12]})'
+
+
+class CachedRunner:
+    """Task runner that answers from the cache when it can and stores what the wrapped runner returns
+
+    In replay mode nothing is sent to the wrapped runner: responses missing from
+    the cache come from the stub runner (a StubLLM unless given) instead and are
+    not stored, so a whole crew run is deterministic and offline.
+    """
+
+    def __init__(self, runner: TaskRunner, cache: LLMCache | None = None,
+                 fingerprint: str = '', replay: bool = False, stub: TaskRunner | None = None):
+        self.runner = runner
+        self.cache = cache
+        self.fingerprint = fingerprint
+        self.replay = replay
+        self.stub = stub if stub is not None else StubLLM()
+
+    def __call__(self, task: Any, context: list[str]) -> str:
+        key = cache_key(task, context, self.fingerprint)
+        if self.cache is not None:
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+        if self.replay:
+            return self.stub(task, context)
+        response = self.runner(task, context)
+        if self.cache is not None:
+            self.cache.put(key, response, task_name(task))
+        return response
@@ -0,0 +1,275 @@
+"""
+Crew task scheduler for AI Safety website
+Runs crew tasks concurrently in the order their context dependencies allow, and records the critical path
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+# Tasks run at once by default; agent calls wait on the network, not the CPU
+DEFAULT_CONCURRENCY = 4
+
+# A runner produces a task's output from the outputs of its context tasks, in context order
+TaskRunner = Callable[[Any, list[str]], str]
+
+# Listeners are called with an event name ('ready', 'started' or 'finished') and the task's run
+Listener = Callable[[str, 'TaskRun'], None]
+
+
+def task_name(task: Any) -> str:
+    """Name of a task, falling back to its agent's name"""
+    name = getattr(task, 'name', None) or agent_name(task)
+    if name:
+        return str(name)
+    raise ValueError(f'task has neither a name nor a named agent: {task!r}')
+
+
+def agent_name(task: Any) -> str | None:
+    """Name of the agent assigned to a task, if any"""
+    agent = getattr(task, 'agent', None)
+    name = getattr(agent, 'name', None) or getattr(agent, 'role', None)
+    return str(name) if name else None
+
+
+def task_context(task: Any) -> list[Any]:
+    """Tasks a task takes as context
+
+    Anything other than a list or tuple means none: recent CrewAI versions default
+    context to a NOT_SPECIFIED sentinel rather than None.
+    """
+    context = getattr(task, 'context', None)
+    return list(context) if isinstance(context, (list, tuple)) else []
+
+
+def task_dependencies(tasks: list[Any]) -> dict[str, list[str]]:
+    """Names of the tasks each task takes as context, keyed by task name in task order
+
+    Raises ValueError for duplicate names, context tasks missing from the list and cycles.
+    """
+    names = {id(task): task_name(task) for task in tasks}
+    if len(set(names.values())) != len(tasks):
+        raise ValueError('task names must be unique')
+
+    graph = {}
+    for task in tasks:
+        dependencies = []
+        for upstream in task_context(task):
+            if id(upstream) not in names:
+                raise ValueError(f'{names[id(task)]} takes context from a task that is not scheduled')
+            dependencies.append(names[id(upstream)])
+        graph[names[id(task)]] = dependencies
+    topological_order(graph)
+    return graph
+
+
+def topological_order(graph: dict[str, list[str]]) -> list[str]:
+    """Every task after its dependencies, otherwise keeping the given order"""
+    order: list[str] = []
+    state: dict[str, str] = {}
+
+    def visit(name: str, path: tuple[str, ...]) -> None:
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError('task context forms a cycle: ' + ' -> '.join((*path, name)))
+        state[name] = 'visiting'
+        for dependency in graph[name]:
+            visit(dependency, (*path, name))
+        state[name] = 'done'
+        order.append(name)
+
+    for name in graph:
+        visit(name, ())
+    return order
+
+
+def agent_usage(task: Any) -> tuple[int, int] | None:
+    """Prompt and completion tokens CrewAI has counted for a task's agent so far, if it counts them"""
+    agent = getattr(task, 'agent', None)
+    process = getattr(agent, '_token_process', None)
+    summary = process.get_summary() if process is not None else None
+    if summary is None:
+        get_summary = getattr(getattr(agent, 'llm', None), 'get_token_usage_summary', None)
+        summary = get_summary() if callable(get_summary) else None
+    if summary is None:
+        return None
+    return int(getattr(summary, 'prompt_tokens', 0)), int(getattr(summary, 'completion_tokens', 0))
+
+
+def run_task(task: Any, context: list[str]) -> str:
+    """Default runner: execute a CrewAI task with its upstream outputs as context
+
+    The task's guardrail retries and its agent's token usage during the call are
+    reported to the instrumentation hooks. Usage is the difference in the agent's
+    running totals, which holds because each crew agent has one task.
+    """
+    # Imported here: instrumentation builds on this module
+    from .instrumentation import record_retry, record_usage
+
+    retries_before = int(getattr(task, 'retry_count', 0) or 0)
+    usage_before = agent_usage(task)
+    output = task.execute_sync(context='\n\n'.join(context))
+    for _ in range(int(getattr(task, 'retry_count', 0) or 0) - retries_before):
+        record_retry()
+    usage_after = agent_usage(task)
+    if usage_before is not None and usage_after is not None:
+        record_usage(usage_after[0] - usage_before[0], usage_after[1] - usage_before[1])
+    return str(getattr(output, 'raw', output))
+
+
+@dataclass
+class TaskRun:
+    """What happened to one task during a schedule"""
+
+    name: str
+    dependencies: list[str]
+    agent: str | None = None
+    status: str = 'pending'
+    output: str | None = None
+    error: BaseException | None = None
+    ready_at: float | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def queue_wait_s(self) -> float:
+        """Time spent ready but waiting for a free worker"""
+        if self.ready_at is None or self.started_at is None:
+            return 0.0
+        return self.started_at - self.ready_at
+
+    @property
+    def duration_s(self) -> float:
+        """Time spent running"""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class ScheduleResult:
+    """Runs of every task in task order, with the chain of tasks that bounded the total time"""
+
+    runs: dict[str, TaskRun]
+    wall_s: float
+    critical_path: list[str] = field(default_factory=list)
+
+    @property
+    def critical_path_s(self) -> float:
+        return sum(self.runs[name].duration_s for name in self.critical_path)
+
+    @property
+    def outputs(self) -> dict[str, str]:
+        return {name: run.output for name, run in self.runs.items() if run.status == 'done' and run.output is not None}
+
+    @property
+    def failed(self) -> list[str]:
+        return [name for name, run in self.runs.items() if run.status == 'failed']
+
+    @property
+    def ok(self) -> bool:
+        return all(run.status == 'done' for run in self.runs.values())
+
+
+def critical_path(runs: dict[str, TaskRun]) -> list[str]:
+    """Longest chain of dependent tasks by run time, from first to last"""
+    longest: dict[str, float] = {}
+    previous: dict[str, str | None] = {}
+    for name in topological_order({name: run.dependencies for name, run in runs.items()}):
+        upstream = max(runs[name].dependencies, key=lambda dependency: longest[dependency], default=None)
+        longest[name] = runs[name].duration_s + (longest[upstream] if upstream is not None else 0.0)
+        previous[name] = upstream
+    path: list[str] = []
+    step: str | None = max(longest, key=lambda task: longest[task], default=None)
+    while step is not None:
+        path.append(step)
+        step = previous[step]
+    return path[::-1]
+
+
+class DagScheduler:
+    """Run crew tasks on a thread pool as soon as the tasks they take as context are done
+
+    The dependency graph comes from each task's context, so tasks that only share
+    an upstream task run side by side. A failed task's dependents are skipped
+    while unrelated tasks carry on; the result records which.
+    """
+
+    def __init__(self, runner: TaskRunner = run_task,
+                 max_concurrency: int = DEFAULT_CONCURRENCY,
+                 listeners: Iterable[Listener] = ()):
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        self.runner = runner
+        self.max_concurrency = max_concurrency
+        self.listeners = list(listeners)
+        self._lock = threading.Lock()
+
+    def _notify(self, event: str, run: TaskRun) -> None:
+        # 'started' is sent from worker threads, so listeners never run concurrently
+        with self._lock:
+            for listener in self.listeners:
+                listener(event, run)
+
+    def _execute(self, task: Any, run: TaskRun, context: list[str]) -> str:
+        run.started_at = time.perf_counter()
+        run.status = 'running'
+        self._notify('started', run)
+        try:
+            return self.runner(task, context)
+        finally:
+            run.finished_at = time.perf_counter()
+
+    def run(self, tasks: list[Any]) -> ScheduleResult:
+        """Run every task once its context is done, at most max_concurrency at a time"""
+        graph = task_dependencies(tasks)
+        by_name = {task_name(task): task for task in tasks}
+        runs = {name: TaskRun(name, dependencies, agent_name(by_name[name])) for name, dependencies in graph.items()}
+        dependents: dict[str, list[str]] = {name: [] for name in graph}
+        for name, dependencies in graph.items():
+            for dependency in dependencies:
+                dependents[dependency].append(name)
+
+        started = time.perf_counter()
+        running: dict[Future[str], str] = {}
+
+        def skip(name: str) -> None:
+            for dependent in dependents[name]:
+                if runs[dependent].status == 'pending':
+                    runs[dependent].status = 'skipped'
+                    self._notify('finished', runs[dependent])
+                    skip(dependent)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='crew-task') as pool:
+
+            def submit_ready() -> None:
+                for name, run in runs.items():
+                    if run.status == 'pending' and all(runs[dep].status == 'done' for dep in run.dependencies):
+                        run.status = 'queued'
+                        run.ready_at = time.perf_counter()
+                        self._notify('ready', run)
+                        context = [runs[dep].output or '' for dep in run.dependencies]
+                        running[pool.submit(self._execute, by_name[name], run, context)] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                # Handle completions in task order so listeners see a stable sequence
+                for future in sorted(done, key=lambda item: list(runs).index(running[item])):
+                    run = runs[running.pop(future)]
+                    try:
+                        run.output = future.result()
+                        run.status = 'done'
+                    except Exception as exc:
+                        run.error = exc
+                        run.status = 'failed'
+                    self._notify('finished', run)
+                    if run.status == 'failed':
+                        skip(run.name)
+                submit_ready()
+
+        return ScheduleResult(runs, round(time.perf_counter() - started, 6), critical_path(runs))
@@ -0,0 +1,134 @@
+"""
+Asset fingerprinting for AI Safety website
+Copies static files and figures to content-hashed names and maps references to the originals onto them
+"""
+
+import json
+import os
+import posixpath
+import re
+from pathlib import Path, PurePosixPath
+
+from .build_manifest import hash_bytes
+
+# Outputs that get a fingerprinted copy; pages, search shards and other data keep fixed names
+ASSET_SUFFIXES = frozenset({'.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.woff', '.woff2'})
+
+# Hex digits of the content hash in a fingerprinted name, e.g. style.0123456789.css
+HASH_LENGTH = 10
+
+# url(...) in a stylesheet, with or without quotes
+CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+
+# URLs that point outside the site or nowhere
+EXTERNAL_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', re.IGNORECASE)
+
+
+def fingerprinted_name(output: str, digest: str) -> str:
+    """Output path with the start of its content hash before the suffix"""
+    path = PurePosixPath(output)
+    return str(path.with_name(f'{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}'))
+
+
+class AssetManifest:
+    """Fingerprinted copy of each asset, keyed by its path relative to the site root"""
+
+    def __init__(self, assets: dict[str, str] | None = None):
+        self.assets = assets or {}
+
+    def __contains__(self, url: str) -> bool:
+        return self._split(url)[0] in self.assets
+
+    def __bool__(self) -> bool:
+        return bool(self.assets)
+
+    @staticmethod
+    def _split(url: str) -> tuple[str, str]:
+        """A URL's path, and its query string or fragment"""
+        cut = min((i for i in (url.find('?'), url.find('#')) if i >= 0), default=len(url))
+        return url[:cut], url[cut:]
+
+    def url(self, url: str) -> str:
+        """The fingerprinted URL of an asset, or the URL unchanged if it is not one"""
+        path, rest = self._split(url)
+        return self.assets.get(path, path) + rest
+
+    def rewrite_css(self, css: str, css_output: str) -> str:
+        """A stylesheet with its url(...) references to assets fingerprinted
+
+        References are relative to the stylesheet, so they are resolved against its
+        directory, mapped, and made relative again.
+        """
+        base = posixpath.dirname(css_output)
+
+        def rewrite(match: re.Match[str]) -> str:
+            quote, url = match.group(1), match.group(2).strip()
+            if EXTERNAL_RE.match(url) or url.startswith('/'):
+                return match.group(0)
+            path, rest = self._split(url)
+            resolved = posixpath.normpath(posixpath.join(base, path))
+            if resolved not in self.assets:
+                return match.group(0)
+            relative = posixpath.relpath(self.assets[resolved], base or '.')
+            return f'url({quote}{relative}{rest}{quote})'
+
+        return CSS_URL_RE.sub(rewrite, css)
+
+
+class AssetPipeline:
+    """Write fingerprinted copies of a build's assets and keep the manifest of them current
+
+    An asset whose bytes are unchanged keeps its name, and its copy is only written
+    when missing, so CDN caches stay warm across builds. Copies from earlier builds
+    that no asset maps to any more are deleted.
+    """
+
+    def __init__(self, output_dir: Path, state_path: Path):
+        self.output_dir = Path(output_dir)
+        # The previous build's manifest; pages depend on it, so it is only rewritten when it changes
+        self.state_path = Path(state_path)
+        self.written: list[str] = []
+
+    def _load_state(self) -> dict[str, str]:
+        try:
+            return dict(json.loads(self.state_path.read_text(encoding='utf-8')))
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Write a new file in one step, never modifying an existing one in place"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def run(self, outputs: list[str]) -> tuple[AssetManifest, bool]:
+        """Fingerprint every asset among the outputs, returning the manifest and whether it changed"""
+        previous = self._load_state()
+        manifest = AssetManifest({})
+
+        # Stylesheets last, so the images they reference already have their names
+        assets = sorted((o for o in outputs if PurePosixPath(o).suffix in ASSET_SUFFIXES),
+                        key=lambda output: (output.endswith('.css'), output))
+        for output in assets:
+            data = (self.output_dir / output).read_bytes()
+            if output.endswith('.css'):
+                data = manifest.rewrite_css(data.decode('utf-8'), output).encode('utf-8')
+            name = fingerprinted_name(output, hash_bytes(data))
+            target = self.output_dir / name
+            if not target.exists():
+                self._write(target, data)
+                self.written.append(name)
+            manifest.assets[output] = name
+
+        for stale in set(previous.values()) - set(manifest.assets.values()):
+            (self.output_dir / stale).unlink(missing_ok=True)
+
+        text = json.dumps(dict(sorted(manifest.assets.items())), indent=2)
+        public = self.output_dir / 'asset-manifest.json'
+        if not public.exists() or public.read_text(encoding='utf-8') != text:
+            self._write(public, text.encode('utf-8'))
+        changed = manifest.assets != previous
+        if changed or not self.state_path.exists():
+            self._write(self.state_path, text.encode('utf-8'))
+        return manifest, changed
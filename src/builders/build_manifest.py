@@ -0,0 +1,104 @@
+"""
+Build manifest for AI Safety website
+Records a content hash of every output's inputs so unchanged outputs can be skipped
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 digest of data"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class BuildTarget:
+    """An output file and the source files it is generated from"""
+
+    output: str
+    kind: str
+    inputs: tuple[Path, ...]
+
+
+class BuildManifest:
+    """Persisted map of output path to the fingerprint of the inputs it was built from"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict[str, str] = {}
+        self._file_hashes: dict[Path, str] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> 'BuildManifest':
+        """Load a manifest from disk, starting empty if it is missing or outdated"""
+        manifest = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return manifest
+
+        if data.get('version') == MANIFEST_VERSION:
+            manifest.entries = dict(data.get('outputs', {}))
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest to disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': MANIFEST_VERSION, 'outputs': dict(sorted(self.entries.items()))}
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        tmp_path.replace(self.path)
+
+    def _hash_input(self, path: Path) -> str:
+        """Hash an input file once per build, shared across all targets that read it"""
+        if path not in self._file_hashes:
+            self._file_hashes[path] = hash_file(path) if path.is_file() else 'missing'
+        return self._file_hashes[path]
+
+    def fingerprint(self, target: BuildTarget) -> str:
+        """Combine the hashes of all of a target's inputs into one fingerprint"""
+        digest = hashlib.sha256(target.kind.encode('utf-8'))
+        for path in target.inputs:
+            digest.update(f'\0{path}\0{self._hash_input(path)}'.encode())
+        return digest.hexdigest()
+
+    def is_fresh(self, target: BuildTarget, output_dir: Path) -> bool:
+        """Check whether a target's output exists and was built from the current inputs"""
+        if not (output_dir / target.output).exists():
+            return False
+        return self.entries.get(target.output) == self.fingerprint(target)
+
+    def record(self, target: BuildTarget) -> None:
+        """Remember the fingerprint a target was just built from"""
+        self.entries[target.output] = self.fingerprint(target)
+
+    def orphans(self, targets: list[BuildTarget]) -> list[str]:
+        """Outputs from a previous build that no current target produces"""
+        current = {target.output for target in targets}
+        return sorted(output for output in self.entries if output not in current)
+
+    def invalidate(self, path: Path) -> None:
+        """Rehash an input the next time it is read, e.g. after the build itself rewrote it"""
+        self._file_hashes.pop(path, None)
+
+    def forget(self, output: str) -> None:
+        """Drop an output from the manifest"""
+        self.entries.pop(output, None)
+
+    def clear(self) -> None:
+        """Forget every output, e.g. after the output directory was wiped"""
+        self.entries.clear()
@@ -0,0 +1,195 @@
+"""
+Data catalog for AI Safety website
+Parses each dataset in src/data once against a declared schema and caches the parsed columns
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .build_manifest import hash_file
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .streaming import PriceAggregates
+
+# Bump when the binary cache layout changes so stale entries are ignored
+CATALOG_VERSION = 1
+
+# Datasets larger than this are aggregated chunk by chunk instead of loaded whole
+STREAMING_MIN_BYTES = 64 * 1024 * 1024
+
+
+class SchemaError(ValueError):
+    """A dataset does not match its declared schema"""
+
+
+@dataclass(frozen=True)
+class Schema:
+    """Columns of a dataset, in order, mapped to the dtype each one is parsed as"""
+
+    columns: dict[str, str]
+
+    @property
+    def date_columns(self) -> list[str]:
+        """Columns parsed as dates"""
+        return [name for name, dtype in self.columns.items() if dtype.startswith('datetime64')]
+
+    def fingerprint(self) -> str:
+        """Stable text form of the schema, part of the binary cache key"""
+        return json.dumps([CATALOG_VERSION, self.columns])
+
+
+def _portfolio_schema(person: str, assets: list[str]) -> Schema:
+    """Yearly projection of one person's holdings, total and uncertainty band"""
+    columns = {'Year': 'int64'}
+    for column in assets + ['Total', 'Lower', 'Upper']:
+        columns[f'Person{person}_{column}'] = 'int64'
+    return Schema(columns)
+
+
+# Every dataset in src/data, keyed by file stem
+SCHEMAS = {
+    'market_trends': Schema({'Date': 'datetime64[ns]', 'SP500': 'float64', 'Bitcoin': 'float64'}),
+    'personA_portfolio': _portfolio_schema('A', ['Savings', '401k']),
+    'personB_portfolio': _portfolio_schema('B', ['Savings', '401k', 'TechStocks', 'RealEstate']),
+    'personC_portfolio': _portfolio_schema('C', ['Savings', '401k', 'Crypto', 'TechStocks', 'House']),
+    'comparative_wealth': Schema({
+        'Person': 'str',
+        'Portfolio_2030': 'int64',
+        'Lower_Bound': 'int64',
+        'Upper_Bound': 'int64',
+        'Strategy': 'str',
+    }),
+}
+
+# Parsed frames shared by every catalog in this process, keyed by resolved
+# path and invalidated when the file's modification time or size changes
+_FRAMES: dict[Path, tuple[tuple[int, int], 'pd.DataFrame']] = {}
+
+
+def dataset_inputs(data_dir: str | Path, *names: str) -> tuple[Path, ...]:
+    """Files a figure that reads these datasets depends on, including their schemas"""
+    return tuple(Path(data_dir) / f'{name}.csv' for name in names) + (Path(__file__),)
+
+
+def parse_csv(path: Path, schema: Schema) -> 'pd.DataFrame':
+    """Parse a CSV file, checking its header and converting every column to its declared dtype"""
+    import pandas as pd
+
+    try:
+        frame = pd.read_csv(path, dtype={
+            name: dtype for name, dtype in schema.columns.items() if name not in schema.date_columns
+        })
+    except ValueError as e:
+        raise SchemaError(f"{path.name}: {e}") from e
+
+    if list(frame.columns) != list(schema.columns):
+        raise SchemaError(f"{path.name}: expected columns {list(schema.columns)}, found {list(frame.columns)}")
+
+    for name in schema.date_columns:
+        try:
+            frame[name] = pd.to_datetime(frame[name], format='ISO8601').astype(schema.columns[name])
+        except (TypeError, ValueError) as e:
+            raise SchemaError(f"{path.name}: column {name} is not a date column: {e}") from e
+    return frame
+
+
+class DataCatalog:
+    """Read-only access to the datasets in a data directory, with an optional binary cache
+
+    Frames are handed out as deep copies, so a plot can add, overwrite or modify
+    columns in place without affecting other plots or later reads, whether or
+    not pandas copy-on-write is enabled. The datasets are small enough that
+    copying costs far less than parsing.
+    """
+
+    def __init__(self, data_dir: str | Path, cache_dir: str | Path | None = None):
+        self.data_dir = Path(data_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+    def path(self, name: str) -> Path:
+        """CSV file of a dataset"""
+        return self.data_dir / f'{name}.csv'
+
+    def schema(self, name: str) -> Schema:
+        """Declared schema of a dataset"""
+        try:
+            return SCHEMAS[name]
+        except KeyError:
+            raise SchemaError(f"No schema declared for dataset {name!r}") from None
+
+    def frame(self, name: str) -> 'pd.DataFrame':
+        """Parsed dataset, reusing this process's copy or the binary cache when unchanged"""
+        path = self.path(name).resolve()
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        memo = _FRAMES.get(path)
+        if memo is None or memo[0] != signature:
+            memo = (signature, self._load(name, path))
+            _FRAMES[path] = memo
+        return memo[1].copy()
+
+    def price_history(self, name: str, freq: str = 'D') -> 'PriceAggregates':
+        """Open, high, low and close per period of a dated dataset, as compact arrays
+
+        Small files are aggregated from the parsed frame. Files over
+        STREAMING_MIN_BYTES are streamed, so they never have to fit in memory.
+        """
+        from .streaming import aggregate, stream_price_history
+
+        path = self.path(name)
+        if path.stat().st_size > STREAMING_MIN_BYTES:
+            return stream_price_history(path, self.schema(name), freq)
+        return aggregate([self.frame(name)], self.schema(name), freq)
+
+    def _cache_path(self, name: str, path: Path, schema: Schema) -> Path | None:
+        """Binary cache entry for the current contents of a dataset"""
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(f'{schema.fingerprint()}\0{hash_file(path)}'.encode())
+        return self.cache_dir / f'{name}-{digest.hexdigest()[:16]}.npz'
+
+    def _load(self, name: str, path: Path) -> 'pd.DataFrame':
+        """Read the binary cache entry for a dataset, parsing the CSV on a miss"""
+        import numpy as np
+        import pandas as pd
+
+        schema = self.schema(name)
+        cache_path = self._cache_path(name, path, schema)
+        if cache_path is not None and cache_path.exists():
+            with np.load(cache_path, allow_pickle=False) as arrays:
+                return pd.DataFrame({
+                    column: pd.Series(arrays[column]).astype(dtype)
+                    for column, dtype in schema.columns.items()
+                })
+
+        frame = parse_csv(path, schema)
+        if cache_path is not None:
+            self._store(cache_path, name, frame, schema)
+        return frame
+
+    def _store(self, cache_path: Path, name: str, frame: 'pd.DataFrame', schema: Schema) -> None:
+        """Write a parsed dataset as plain NumPy arrays, replacing older entries for it"""
+        import numpy as np
+
+        arrays = {
+            column: frame[column].to_numpy(dtype=str if dtype == 'str' else dtype)
+            for column, dtype in schema.columns.items()
+        }
+
+        # Write to a private file and rename so readers never see half an entry
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, cache_path)
+
+        for stale in cache_path.parent.glob(f'{name}-*.npz'):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
@@ -0,0 +1,109 @@
+"""
+Development server for AI Safety website
+Polls the source tree, rebuilds only the affected outputs and serves docs/ locally
+"""
+
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .site_builder import SiteBuilder
+
+# Seconds between polls of the source tree
+POLL_INTERVAL = 0.2
+
+
+class FileWatcher:
+    """Detect added, modified and deleted files under a set of directories by polling"""
+
+    def __init__(self, roots: list[Path]):
+        self.roots = roots
+        self._state = self.snapshot()
+
+    def snapshot(self) -> dict[Path, tuple[int, int]]:
+        """Modification time and size of every file under the watched roots"""
+        state = {}
+        for root in self.roots:
+            if not root.exists():
+                continue
+            for path in root.rglob("*"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue  # Deleted between listing and stat
+                if path.is_file():
+                    state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def poll(self) -> set[Path]:
+        """Files that changed since the previous poll"""
+        state = self.snapshot()
+        changed = {
+            path for path in state.keys() | self._state.keys()
+            if state.get(path) != self._state.get(path)
+        }
+        self._state = state
+        return changed
+
+
+class _DocsRequestHandler(SimpleHTTPRequestHandler):
+    """Serve docs/ without browser caching and without per-request log lines"""
+
+    def end_headers(self) -> None:
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def serve(directory: Path, port: int = 8000) -> ThreadingHTTPServer:
+    """Serve a directory over HTTP from a background thread"""
+    handler = functools.partial(_DocsRequestHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def watch(builder: 'SiteBuilder', port: int = 8000, interval: float = POLL_INTERVAL) -> None:
+    """Build once, then serve docs/ and rebuild affected outputs until interrupted"""
+    builder.incremental = True
+    builder.build()
+
+    watcher = FileWatcher([
+        builder.content_dir,
+        builder.templates_dir,
+        builder.static_dir,
+        builder.data_dir,
+    ])
+    server = serve(builder.output_dir, port)
+    print(f"\n👀 Watching {builder.src_dir} for changes")
+    print(f"🌐 Serving {builder.output_dir} at http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            changed = watcher.poll()
+            if not changed:
+                continue
+
+            started = time.perf_counter()
+            for path in sorted(changed):
+                print(f"\n✏️  {path.relative_to(builder.project_root)}")
+            try:
+                rebuilt = builder.rebuild(changed)
+            except Exception as e:
+                # Keep watching so the next save can fix the error
+                print(f"❌ Rebuild failed: {e}")
+                continue
+            elapsed = time.perf_counter() - started
+            print(f"🔁 Rebuilt {len(rebuilt)} output(s) in {elapsed:.2f}s")
+    except KeyboardInterrupt:
+        print("\n👋 Stopping development server")
+    finally:
+        server.shutdown()
+        server.server_close()
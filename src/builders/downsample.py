@@ -0,0 +1,98 @@
+"""
+Downsampling for AI Safety website plots
+Reduces long series to about one point per output pixel so plot cost stays flat as data grows
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+METHODS = ('lttb', 'minmax')
+
+
+def pixel_budget(ax: 'Axes', dpi: float) -> int:
+    """Horizontal resolution of an axes, in pixels, when its figure is saved at dpi"""
+    figure = ax.get_figure(root=True)
+    if figure is None:
+        raise ValueError('axes is not on a figure')
+    width_inches = ax.get_position().width * figure.get_figwidth()
+    return max(3, int(width_inches * dpi))
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    """Numeric view of x values, with dates as integer ticks since the epoch"""
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('int64').astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the points Largest-Triangle-Three-Buckets keeps out of len(y)
+
+    The first and last points are always kept. The rest are split into n_out - 2
+    buckets and each bucket keeps the point forming the largest triangle with the
+    point kept from the previous bucket and the average of the next bucket.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket i covers [edges[i], edges[i + 1]); every bucket is non-empty since n_out < n
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # The bucket after the last one is the final point
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        px, py = x[previous], y[previous]
+        # Twice the triangle area, for every candidate in the bucket at once
+        areas = np.abs((px - next_x[i]) * (y[lo:hi] - py) - (px - x[lo:hi]) * (next_y[i] - py))
+        previous = lo + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Indices of the lowest and highest point in each of n_buckets equal-width buckets
+
+    Keeps every peak and trough, so spikes survive at the cost of up to two points
+    per bucket. The first and last points are always kept.
+    """
+    n = len(y)
+    if 2 * n_buckets >= n or n_buckets < 1:
+        return np.arange(n)
+
+    buckets = np.arange(n) * n_buckets // n
+    # Sort by bucket, then by value: each bucket's first entry is its minimum, its last the maximum
+    order = np.lexsort((np.asarray(y), buckets))
+    starts = np.searchsorted(buckets[order], np.arange(n_buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate(([0], order[starts], order[ends], [n - 1])))
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int,
+               method: str = 'lttb') -> tuple[np.ndarray, np.ndarray]:
+    """Reduce a series to at most max_points points, keeping it unchanged when already short"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if method == 'lttb':
+        indices = lttb_indices(x, y, max_points)
+    elif method == 'minmax':
+        # Two points per bucket, plus the first and last point
+        indices = minmax_indices(y, max(1, (max_points - 2) // 2))
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r}, expected one of {METHODS}")
+    return x[indices], y[indices]
@@ -0,0 +1,163 @@
+"""
+Figure jobs for AI Safety website
+Describes each generated image as an independent, self-contained render job
+"""
+
+import inspect
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from .image_formats import PRIMARY_ONLY, ImageFormats, write_raster_variants
+from .parallel import imap_ordered
+from .profiling import Stopwatch, Timing
+from .reproducible import RENDER_PARAMS, normalize_png, save_metadata, seed_random
+
+if TYPE_CHECKING:
+    from .render_cache import RenderCache
+
+
+@dataclass(frozen=True)
+class FigureJob:
+    """A single figure: the function that draws it, its arguments and the files it reads"""
+
+    output: str
+    func: Callable[..., None]
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    inputs: tuple[Path, ...] = ()
+    label: str = ''
+    style: Callable[[], None] | None = None
+    style_key: str = ''
+
+    @property
+    def save_path(self) -> Path:
+        """File the job writes"""
+        return Path(self.kwargs['save_path'])
+
+    @property
+    def formats(self) -> ImageFormats:
+        """Extra formats and widths the job writes besides its primary PNG"""
+        return cast(ImageFormats, self.kwargs.get('formats', PRIMARY_ONLY))
+
+    @property
+    def paths(self) -> list[Path]:
+        """Every file the job writes, primary PNG first"""
+        return [self.save_path] + self.formats.variant_paths(self.save_path)
+
+    @property
+    def source_file(self) -> Path:
+        """Module that defines the drawing function, i.e. the code version of the figure"""
+        return Path(inspect.getfile(self.func))
+
+    def run(self) -> None:
+        """Render the figure to its save path"""
+        self.func(**self.kwargs)
+
+
+@dataclass(frozen=True)
+class FigureResult:
+    """How a figure was produced and what it cost"""
+
+    output: str
+    timing: Timing
+    cached: bool = False
+
+
+def pyplot() -> Any:
+    """matplotlib.pyplot on the non-interactive backend, imported on first use
+
+    matplotlib, pandas, numpy and seaborn are only imported inside the functions
+    that draw, so commands that never render a figure do not pay for them.
+    """
+    import matplotlib
+
+    matplotlib.use('Agg')  # Use non-interactive backend to prevent popups
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def save_figure(save_path: str, save_kwargs: dict[str, Any], formats: ImageFormats = PRIMARY_ONLY) -> None:
+    """Save the current figure in every requested format, then close it
+
+    Version strings, timestamps and other non-essential PNG chunks are left out, so
+    an unchanged figure is byte-identical across builds and machines.
+    """
+    plt = pyplot()
+    kwargs = {key: value for key, value in save_kwargs.items() if key != 'metadata'}
+    plt.savefig(save_path, metadata=save_metadata('png', save_kwargs.get('metadata')), **kwargs)
+
+    if formats.svg:
+        vector_kwargs = {key: value for key, value in kwargs.items() if key not in ('dpi', 'format')}
+        # Keep text as text so the SVG is small and searchable
+        with plt.rc_context({'svg.fonttype': 'none', **RENDER_PARAMS}):
+            plt.savefig(formats.svg_path(Path(save_path)), format='svg',
+                        metadata=save_metadata('svg', save_kwargs.get('metadata')), **vector_kwargs)
+    plt.close()
+
+    write_raster_variants(Path(save_path), formats)
+    for path in [Path(save_path)] + formats.variant_paths(Path(save_path)):
+        if path.suffix == '.png':
+            normalize_png(path)
+
+
+def render_job(job: FigureJob) -> Timing:
+    """Render one job in this process with its own copy of the global matplotlib style
+
+    This is what each render_figures worker runs. It bypasses the render cache,
+    so benchmarks can time a single figure.
+    """
+    plt = pyplot()
+
+    # Outputs may be hard links into the render cache; never write through them
+    for path in job.paths:
+        path.unlink(missing_ok=True)
+
+    # rc_context restores rcParams afterwards, so one job's style never
+    # leaks into the next job that happens to run in the same worker
+    with Stopwatch() as stopwatch, plt.rc_context():
+        if job.style is not None:
+            job.style()
+        plt.rcParams.update(RENDER_PARAMS)
+        seed_random()
+        job.run()
+    return stopwatch.timing
+
+
+def render_figures(jobs: list[FigureJob],
+                   workers: int | None = 1,
+                   cache: 'RenderCache | None' = None) -> list[FigureResult]:
+    """Render figure jobs across a process pool, printing progress in job order
+
+    With a render cache, jobs whose inputs, style and code are unchanged are
+    restored from the cache and only the remaining jobs are rendered.
+    """
+    keys = {job.output: cache.key(job) for job in jobs} if cache is not None else {}
+    cached = {}
+    for job in jobs:
+        with Stopwatch() as stopwatch:
+            hit = cache is not None and cache.fetch(keys[job.output], job.paths)
+        if hit:
+            cached[job.output] = stopwatch.timing
+
+    pending = [job for job in jobs if job.output not in cached]
+    rendered = imap_ordered(render_job, pending, workers)
+
+    results = []
+    for job in jobs:
+        if job.output in cached:
+            if job.label:
+                print(f"{job.label} (cached)")
+            results.append(FigureResult(job.output, cached[job.output], cached=True))
+            continue
+
+        timing = next(rendered)
+        if cache is not None:
+            cache.store(keys[job.output], job.paths)
+        if job.label:
+            print(job.label)
+        results.append(FigureResult(job.output, timing))
+
+    # Finish the generator so the worker pool shuts down now rather than at GC
+    rendered.close()
+    return results
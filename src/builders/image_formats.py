@@ -0,0 +1,150 @@
+"""
+Image output formats for AI Safety website figures
+Vector and multi-resolution variants of each figure, and the responsive markup that serves them
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from .assets import AssetManifest
+
+# Widths in pixels of the downscaled copies of a raster chart. Content is at most
+# 1000px wide, so these cover phones, tablets and high-density desktop screens.
+RESPONSIVE_WIDTHS = (480, 960, 1600)
+
+# Encodings of each downscaled copy, most compact first
+RASTER_FORMATS = ('webp', 'png')
+
+# Rendered width of chart images, telling the browser which srcset width to fetch
+CHART_SIZES = '(max-width: 1000px) 100vw, 1000px'
+
+MIME_TYPES = {'svg': 'image/svg+xml', 'webp': 'image/webp', 'png': 'image/png'}
+
+# WebP quality for downscaled copies; high enough that chart text stays crisp
+WEBP_QUALITY = 90
+
+# A <picture> element, left as is, or a bare <img> tag that may need upgrading
+IMG_TAG_RE = re.compile(r'<picture>.*?</picture>|<img\s[^>]*?/?>', re.DOTALL)
+ATTR_RE = re.compile(r'([\w-]+)="([^"]*)"')
+
+
+@dataclass(frozen=True)
+class ImageFormats:
+    """Extra files written next to a figure's primary PNG"""
+
+    svg: bool = False
+    widths: tuple[int, ...] = ()
+    raster_formats: tuple[str, ...] = RASTER_FORMATS
+    sizes: str = CHART_SIZES
+
+    def svg_path(self, save_path: Path) -> Path:
+        """Vector copy of the figure"""
+        return save_path.with_suffix('.svg')
+
+    def width_path(self, save_path: Path, width: int, fmt: str) -> Path:
+        """Downscaled copy of the figure at width pixels"""
+        return save_path.with_name(f"{save_path.stem}-{width}w.{fmt}")
+
+    def variant_paths(self, save_path: Path) -> list[Path]:
+        """Every file written besides the primary PNG"""
+        paths = [self.svg_path(save_path)] if self.svg else []
+        paths.extend(
+            self.width_path(save_path, width, fmt)
+            for fmt in self.raster_formats
+            for width in self.widths
+        )
+        return paths
+
+
+# Only the primary PNG
+PRIMARY_ONLY = ImageFormats()
+
+# Line and bar charts are mostly strokes and text, which SVG stores far more compactly
+VECTOR_CHART = ImageFormats(svg=True)
+
+# Charts with large filled areas stay raster, at several widths
+RASTER_CHART = ImageFormats(widths=RESPONSIVE_WIDTHS)
+
+# Navigation icons are shown at 72px, so 1x, 2x and 3x densities are enough
+NAV_ICON = ImageFormats(widths=(72, 144, 216), sizes='72px')
+
+
+def write_raster_variants(save_path: Path, formats: ImageFormats) -> None:
+    """Write the downscaled copies of a rendered PNG"""
+    if not formats.widths:
+        return
+
+    from PIL import Image
+
+    with Image.open(save_path) as source:
+        source.load()
+        for width in formats.widths:
+            height = max(1, round(source.height * width / source.width))
+            resized = source.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt in formats.raster_formats:
+                path = formats.width_path(save_path, width, fmt)
+                if fmt == 'webp':
+                    resized.save(path, 'WEBP', quality=WEBP_QUALITY, method=6)
+                else:
+                    resized.save(path, 'PNG', optimize=True)
+
+
+class ResponsiveImages:
+    """Markup for images that have vector or multi-resolution variants, keyed by src
+
+    Every URL written is mapped through the asset manifest, so pages reference the
+    fingerprinted copy of each image when there is one.
+    """
+
+    def __init__(self, formats: dict[str, ImageFormats] | None = None, assets: dict[str, str] | None = None):
+        self.formats = formats or {}
+        self.assets = AssetManifest(assets)
+
+    def img_tag(self, src: str, alt: str, **attrs: str) -> str:
+        """An <img> for src, wrapped in a <picture> with its variants when it has any
+
+        Attribute values are written as given, like the markdown they come from.
+        """
+        extra = ''.join(f' {name.rstrip("_")}="{value}"' for name, value in attrs.items())
+        formats = self.formats.get(src)
+        if formats is None or formats == PRIMARY_ONLY:
+            return f'<img src="{self.assets.url(src)}" alt="{alt}"{extra} />'
+
+        save_path = Path(src)
+        sources = []
+        img_srcset = ''
+        if formats.svg:
+            svg = self.assets.url(formats.svg_path(save_path).as_posix())
+            sources.append(f'<source srcset="{svg}" type="image/svg+xml" />')
+        for fmt in formats.raster_formats:
+            srcset = ', '.join(
+                f"{self.assets.url(formats.width_path(save_path, width, fmt).as_posix())} {width}w"
+                for width in formats.widths
+            )
+            if not srcset:
+                continue
+            if fmt == save_path.suffix.lstrip('.'):
+                # The primary format goes on the <img> itself as the fallback
+                img_srcset = f' srcset="{srcset}" sizes="{formats.sizes}"'
+            else:
+                sources.append(f'<source srcset="{srcset}" sizes="{formats.sizes}" type="{MIME_TYPES[fmt]}" />')
+
+        return f'<picture>{"".join(sources)}<img src="{self.assets.url(src)}"{img_srcset} alt="{alt}"{extra} /></picture>'
+
+    def rewrite(self, html_content: str) -> str:
+        """Upgrade every plain <img> tag whose src has variants or a fingerprinted copy"""
+        if not self.formats and not self.assets:
+            return html_content
+
+        def upgrade(match: re.Match[str]) -> str:
+            tag = match.group(0)
+            if tag.startswith('<picture>'):
+                return tag
+            attrs = dict(ATTR_RE.findall(tag))
+            src = attrs.pop('src', '')
+            if (src not in self.formats and src not in self.assets) or 'srcset' in attrs:
+                return tag
+            return self.img_tag(src, attrs.pop('alt', ''), **attrs)
+
+        return IMG_TAG_RE.sub(upgrade, html_content)
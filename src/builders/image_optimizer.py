@@ -0,0 +1,328 @@
+"""
+Image optimization for AI Safety website
+Re-encodes generated PNGs at maximum compression, with an indexed palette wherever that is visually lossless
+"""
+
+import io
+import json
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .build_manifest import hash_bytes
+from .parallel import imap_ordered
+from .profiling import Stopwatch, Timing
+from .reproducible import PNG_SIGNATURE, png_chunk
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Bump when candidates or encoding change so cached results are redone
+OPTIMIZER_VERSION = 1
+
+# Default upper bound on the total size of cached optimized images, as for the render cache
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# A palette image is kept only if it is at least this close to the original; around
+# 40 dB differences stop being visible, and flat-colour charts land well above it
+MIN_PSNR = 42.0
+
+# PNG row filters tried for each candidate: none, which suits palette images, and
+# libpng's adaptive choice of the filter with the smallest sum of absolute values per row
+FILTER_NONE = 0
+FILTER_ADAPTIVE = -1
+FILTER_STRATEGIES = (FILTER_NONE, FILTER_ADAPTIVE)
+
+# IHDR colour types
+COLOR_PALETTE = 3
+COLOR_RGB = 2
+COLOR_RGBA = 6
+CHANNELS = {COLOR_PALETTE: 1, COLOR_RGB: 3, COLOR_RGBA: 4}
+
+
+def filter_rows(raw: 'np.ndarray', bpp: int, filter_type: int) -> 'np.ndarray':
+    """Apply one PNG filter to every row of an image's bytes at once
+
+    Filters predict each byte from the unfiltered bytes to its left, above and
+    above-left, so every row can be computed in one vectorized step.
+    """
+    import numpy as np
+
+    left = np.zeros_like(raw)
+    left[:, bpp:] = raw[:, :-bpp]
+    if filter_type == 1:
+        return np.asarray(raw - left)
+    up = np.zeros_like(raw)
+    up[1:] = raw[:-1]
+    if filter_type == 2:
+        return np.asarray(raw - up)
+    if filter_type == 3:
+        return np.asarray(raw - ((left.astype(np.uint16) + up) >> 1).astype(np.uint8))
+    if filter_type == 4:
+        up_left = np.zeros_like(raw)
+        up_left[1:, bpp:] = raw[:-1, :-bpp]
+        a, b, c = left.astype(np.int16), up.astype(np.int16), up_left.astype(np.int16)
+        p = a + b - c
+        pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+        return np.asarray(raw - np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left)))
+    return raw
+
+
+def filtered_scanlines(raw: 'np.ndarray', bpp: int, strategy: int) -> bytes:
+    """Image bytes with a filter type byte before each row, ready to deflate"""
+    import numpy as np
+
+    height = raw.shape[0]
+    if strategy == FILTER_ADAPTIVE:
+        # Keep the best filter per row so far, rather than all five filtered copies
+        rows = raw.copy()
+        types = np.zeros(height, dtype=np.uint8)
+        best = None
+        for filter_type in range(5):
+            filtered = filter_rows(raw, bpp, filter_type)
+            # Bytes read as signed, so small negative residuals count as small
+            costs = np.abs(filtered.view(np.int8), dtype=np.int16).sum(axis=1, dtype=np.int64)
+            if best is None:
+                best = costs
+                continue
+            better = costs < best
+            rows[better] = filtered[better]
+            types[better] = filter_type
+            best = np.minimum(best, costs)
+    else:
+        types = np.full(height, strategy)
+        rows = filter_rows(raw, bpp, strategy)
+    return np.concatenate([types.astype(np.uint8)[:, None], rows], axis=1).tobytes()
+
+
+def encode_png(pixels: 'np.ndarray', color_type: int, palette: bytes = b'', transparency: bytes = b'') -> bytes:
+    """Smallest PNG of 8-bit pixels across the filter strategies, at maximum zlib effort
+
+    Only the chunks needed to display the image are written.
+    """
+    height, width = pixels.shape[:2]
+    bpp = CHANNELS[color_type]
+    raw = pixels.reshape(height, width * bpp)
+    idat = min(
+        (zlib.compress(filtered_scanlines(raw, bpp, strategy), 9) for strategy in FILTER_STRATEGIES),
+        key=len,
+    )
+    header = struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)
+    chunks = [png_chunk(b'IHDR', header)]
+    if palette:
+        chunks.append(png_chunk(b'PLTE', palette))
+    if transparency:
+        chunks.append(png_chunk(b'tRNS', transparency))
+    chunks += [png_chunk(b'IDAT', idat), png_chunk(b'IEND', b'')]
+    return PNG_SIGNATURE + b''.join(chunks)
+
+
+def psnr(original: 'np.ndarray', candidate: 'np.ndarray') -> float:
+    """Peak signal-to-noise ratio in dB between two RGBA images; infinite when identical"""
+    import numpy as np
+
+    # A block of rows at a time, so a large chart never needs a full-size copy in wide integers
+    squared = 0
+    for start in range(0, original.shape[0], 256):
+        diff = np.subtract(original[start:start + 256], candidate[start:start + 256], dtype=np.int32)
+        squared += int(np.square(diff).sum(dtype=np.int64))
+    if squared == 0:
+        return float('inf')
+    return float(10 * np.log10(255 ** 2 * original.size / squared))
+
+
+def _palette_png(indices: 'np.ndarray', entries: 'np.ndarray', opaque: bool) -> bytes:
+    """Encode palette indices and their RGBA entries, with a tRNS chunk only when some entry is translucent"""
+    import numpy as np
+
+    transparency = b''
+    if not opaque:
+        translucent = np.nonzero(entries[:, 3] < 255)[0]
+        if len(translucent):
+            transparency = entries[:translucent[-1] + 1, 3].tobytes()
+    return encode_png(indices.astype(np.uint8), COLOR_PALETTE, entries[:, :3].tobytes(), transparency)
+
+
+def optimize_png(data: bytes) -> tuple[bytes, str]:
+    """The smallest of a PNG's candidate encodings, with the name of the one chosen
+
+    With at most 256 colours the image is stored losslessly as an exact palette.
+    Otherwise it is quantized to 256 colours, kept if that passes MIN_PSNR, and
+    re-encoded losslessly (without alpha when every pixel is opaque) if not. The
+    original bytes win whenever nothing is smaller.
+    """
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        rgba = np.ascontiguousarray(image.convert('RGBA'))
+    opaque = bool((rgba[..., 3] == 255).all())
+    candidates = {'original': data}
+
+    pixels = rgba.reshape(-1, 4).view(np.uint32).reshape(rgba.shape[:2])
+    colors = np.unique(pixels)
+    if len(colors) <= 256:
+        entries = colors.view(np.uint8).reshape(-1, 4)
+        candidates['lossless'] = _palette_png(np.searchsorted(colors, pixels), entries, opaque)
+    else:
+        source = Image.fromarray(rgba[..., :3] if opaque else rgba)
+        indexed = source.quantize(256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+        quantized = np.asarray(indexed)
+        entries = np.array(indexed.getpalette('RGBA'), dtype=np.uint8).reshape(-1, 4)[:int(quantized.max()) + 1]
+        if psnr(rgba, entries[quantized]) >= MIN_PSNR:
+            # A byte per pixel instead of three or four; full colour would never be smaller
+            candidates['palette'] = _palette_png(quantized, entries, opaque)
+        else:
+            candidates['lossless'] = encode_png(rgba[..., :3], COLOR_RGB) if opaque else encode_png(rgba, COLOR_RGBA)
+
+    method = min(candidates, key=lambda name: len(candidates[name]))
+    return candidates[method], method
+
+
+def _optimize_file(path: Path) -> tuple[bytes, str, Timing]:
+    """Worker entry point: optimize one file without writing it"""
+    with Stopwatch() as stopwatch:
+        data, method = optimize_png(path.read_bytes())
+    return data, method, stopwatch.timing
+
+
+def _replace(path: Path, data: bytes) -> None:
+    """Replace a file in one step; outputs may be hard links into the render cache"""
+    temp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+@dataclass(frozen=True)
+class OptimizationResult:
+    """What optimizing one image saved"""
+
+    output: str
+    before: int
+    after: int
+    method: str
+    cached: bool = False
+    timing: Timing | None = None
+
+    @property
+    def saved(self) -> int:
+        return self.before - self.after
+
+
+class ImageOptimizer:
+    """Optimize PNGs across a process pool, caching each result by the hash of its input
+
+    A rendered figure restored from the render cache has the same bytes as last
+    time, so its optimized copy is restored from this cache instead of being
+    encoded again. Files that are already the output of an earlier run are skipped.
+    Least recently used results are dropped once the cache exceeds max_bytes, and
+    cached images no result refers to are deleted.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, workers: int | None = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.workers = workers
+        self.max_bytes = max_bytes
+
+    @property
+    def index_path(self) -> Path | None:
+        return self.cache_dir / 'index.json' if self.cache_dir is not None else None
+
+    def _load_cache(self) -> dict[str, Any]:
+        """Cached results keyed by input hash, or nothing if the cache is missing or outdated"""
+        if self.index_path is None:
+            return {}
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != OPTIMIZER_VERSION:
+            return {}
+        return {
+            digest: entry for digest, entry in data.get('images', {}).items()
+            if self._blob(entry['digest']).is_file()
+        }
+
+    def _save_cache(self, entries: dict[str, Any]) -> None:
+        """Evict down to max_bytes, write the cache index atomically and delete unreferenced images"""
+        if self.index_path is None or self.cache_dir is None:
+            return
+        entries = self._evict(entries)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'version': OPTIMIZER_VERSION, 'images': entries}, indent=2), encoding='utf-8')
+        tmp_path.replace(self.index_path)
+
+        referenced = {entry['digest'] for entry in entries.values()}
+        for blob in self.cache_dir.glob('*.png'):
+            if blob.stem not in referenced:
+                blob.unlink(missing_ok=True)
+
+    def _evict(self, entries: dict[str, Any]) -> dict[str, Any]:
+        """Entries left after dropping the least recently used until their images fit in max_bytes"""
+        sizes = {entry['digest']: entry['size'] for entry in entries.values()}
+        users: dict[str, int] = {}
+        for entry in entries.values():
+            users[entry['digest']] = users.get(entry['digest'], 0) + 1
+        total = sum(sizes.values())
+        kept = dict(entries)
+        for digest, entry in sorted(entries.items(), key=lambda item: (item[1].get('used', 0), item[0])):
+            if total <= self.max_bytes:
+                break
+            del kept[digest]
+            users[entry['digest']] -= 1
+            if users[entry['digest']] == 0:
+                total -= sizes[entry['digest']]
+        return kept
+
+    def _blob(self, digest: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / f'{digest}.png'
+
+    def run(self, images: list[tuple[str, Path]]) -> list[OptimizationResult]:
+        """Optimize each (output name, path) in place, returning a result per image in order"""
+        entries = self._load_cache()
+        optimized = {entry['digest']: entry for entry in entries.values()}
+        now = time.time()
+
+        results: dict[str, OptimizationResult] = {}
+        pending = []
+        for output, path in images:
+            data = path.read_bytes()
+            digest = hash_bytes(data)
+            entry = entries.get(digest)
+            if entry is not None:
+                if entry['digest'] != digest:
+                    _replace(path, self._blob(entry['digest']).read_bytes())
+                results[output] = OptimizationResult(output, len(data), entry['size'], entry['method'], cached=True)
+                entry['used'] = now
+            elif digest in optimized:
+                entry = optimized[digest]
+                results[output] = OptimizationResult(output, entry['before'], len(data), entry['method'], cached=True)
+                entry['used'] = now
+            else:
+                pending.append((output, path, digest, len(data)))
+
+        for (output, path, digest, before), (data, method, timing) in zip(
+            pending, imap_ordered(_optimize_file, [path for _, path, _, _ in pending], self.workers), strict=True
+        ):
+            if method != 'original':
+                _replace(path, data)
+            results[output] = OptimizationResult(output, before, len(data), method, timing=timing)
+            if self.cache_dir is not None:
+                after_digest = hash_bytes(data)
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                if not self._blob(after_digest).exists():
+                    _replace(self._blob(after_digest), data)
+                entries[digest] = {
+                    'digest': after_digest, 'before': before, 'size': len(data), 'method': method, 'used': now,
+                }
+
+        if images:
+            self._save_cache(entries)
+        return [results[output] for output, _ in images]
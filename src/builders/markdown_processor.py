@@ -9,11 +9,19 @@ from typing import Any
 import markdown
 import yaml
 
+from .image_formats import ResponsiveImages
+from .shortcodes import ShortcodeRenderer
+
+# Standalone image on its own line: ![alt](src)
+IMAGE_LINE_RE = re.compile(r'^!\[([^\]]*)\]\(([^)]+)\)$')
+
 
 class MarkdownProcessor:
     """Process markdown files with frontmatter and custom extensions"""
 
-    def __init__(self) -> None:
+    def __init__(self, images: ResponsiveImages | None = None) -> None:
+        # Figures with SVG or multi-width variants get <picture> markup with srcset/sizes
+        self.images = images or ResponsiveImages()
         self.md = markdown.Markdown(
             extensions=[
                 'markdown.extensions.extra',
@@ -33,6 +41,7 @@ class MarkdownProcessor:
                 },
             }
         )
+        self.shortcodes = ShortcodeRenderer(self.md.convert)
 
     def parse_frontmatter(self, content: str) -> tuple[dict[str, Any], str]:
         """Extract YAML frontmatter from markdown content"""
@@ -53,66 +62,24 @@ class MarkdownProcessor:
             return {}, content
 
     def process_custom_shortcodes(self, content: str) -> str:
-        """Process custom shortcodes like {{< tabs >}}"""
-
-        # Process tabs shortcode
-        tab_pattern = r'{{< tabs >}}(.*?){{< /tabs >}}'
-        content = re.sub(tab_pattern, self._process_tabs, content, flags=re.DOTALL)
-
-        return content
-
-    def _process_tabs(self, match: re.Match[str]) -> str:
-        """Convert tabs shortcode to HTML"""
-        tabs_content = match.group(1)
-
-        # Extract individual tabs
-        tab_pattern = r'{{< tab "([^"]*)" "([^"]*)" >}}(.*?){{< /tab >}}'
-        tabs = re.findall(tab_pattern, tabs_content, re.DOTALL)
-
-        if not tabs:
-            return match.group(0)  # Return original if no tabs found
-
-        # Generate tab container HTML
-        html = ['<div class="tab-container">']
-
-        # Tab buttons
-        for i, (title, tab_id, _) in enumerate(tabs):
-            active_class = ' active' if i == 0 else ''
-            html.append(f'<button class="tab-button{active_class}" data-tab="{tab_id}">{title}</button>')
-
-        html.append('</div>')
-
-        # Tab content
-        for i, (_, tab_id, content) in enumerate(tabs):
-            display_style = 'block' if i == 0 else 'none'
-            processed_content = self.md.convert(content.strip())
-            html.append(f'<div class="tab-content" id="{tab_id}" style="display: {display_style};">')
-            html.append(processed_content)
-            html.append('</div>')
-
-        return '\n'.join(html)
+        """Process custom shortcodes like {{< tabs >}}, {{< callout >}} and {{< figure >}}"""
+        return self.shortcodes.render(content)
 
     def process_images(self, content: str) -> str:
         """Process image markdown and wrap in chart-wrapper if needed"""
 
-        # Pattern for standalone images (not in tabs)
-        img_pattern = r'^!\[([^\]]*)\]\(([^)]+)\)$'
-
         def wrap_image(match: re.Match[str]) -> str:
             alt_text = match.group(1)
             src = match.group(2)
-            return f'<div class="chart-wrapper"><img src="{src}" alt="{alt_text}" loading="lazy" /></div>'
+            return f'<div class="chart-wrapper">{self.images.img_tag(src, alt_text, loading="lazy")}</div>'
 
-        # Process line by line to only wrap standalone images
-        lines = content.split('\n')
+        # Process line by line to only wrap standalone images (not in tabs)
         processed_lines = []
 
-        for line in lines:
+        for line in content.split('\n'):
             line = line.strip()
-            if re.match(img_pattern, line):
-                processed_lines.append(re.sub(img_pattern, wrap_image, line))
-            else:
-                processed_lines.append(line)
+            match = IMAGE_LINE_RE.match(line)
+            processed_lines.append(wrap_image(match) if match else line)
 
         return '\n'.join(processed_lines)
 
@@ -128,8 +95,8 @@ class MarkdownProcessor:
         # Process images
         markdown_content = self.process_images(markdown_content)
 
-        # Convert to HTML
-        html_content = self.md.convert(markdown_content)
+        # Convert to HTML, then add variants to images inside tabs, figures and paragraphs
+        html_content = self.images.rewrite(self.md.convert(markdown_content))
 
         # Reset markdown processor for next use
         self.md.reset()
@@ -0,0 +1,108 @@
+"""
+Page renderer for AI Safety website
+Turns markdown sources into finished HTML pages, serially or across a process pool
+"""
+
+from collections.abc import Generator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .image_formats import ImageFormats, ResponsiveImages
+from .markdown_processor import MarkdownProcessor
+from .parallel import imap_ordered
+from .profiling import Stopwatch, Timing
+from .template_engine import TemplateEngine
+
+
+@dataclass(frozen=True)
+class PageResult:
+    """Rendered HTML for one markdown source, or the error that stopped it"""
+
+    source: Path
+    html: str | None = None
+    error: str | None = None
+    timing: Timing | None = None
+    template_cache_hits: int = 0
+    template_cache_misses: int = 0
+
+    @property
+    def output(self) -> str:
+        """Output filename relative to the site root"""
+        return f"{self.source.stem}.html"
+
+
+class PageBuildError(Exception):
+    """One or more pages failed to render"""
+
+    def __init__(self, failures: list[PageResult]):
+        self.failures = failures
+        details = '\n'.join(f"  {result.source.name}: {result.error}" for result in failures)
+        super().__init__(f"{len(failures)} page(s) failed to render:\n{details}")
+
+
+def render_page(md_file: Path, processor: MarkdownProcessor, engine: TemplateEngine) -> str:
+    """Convert one markdown file and render it through the matching template"""
+    # Read and process markdown
+    with open(md_file, encoding='utf-8') as f:
+        content = f.read()
+
+    frontmatter, html_content = processor.convert(content)
+
+    # Render appropriate template
+    page_name = md_file.stem
+    if page_name == 'index':
+        return engine.render_index(html_content, frontmatter)
+    return engine.render_content_page(html_content, frontmatter, page_name)
+
+
+# Each worker process owns its own processor and engine, since
+# markdown.Markdown instances are stateful and cannot be shared
+_processor: MarkdownProcessor | None = None
+_engine: TemplateEngine | None = None
+
+
+def _init_worker(templates_dir: str, image_formats: dict[str, ImageFormats] | None = None,
+                 cache_dir: str | None = None, navigation: dict[str, Any] | None = None,
+                 assets: dict[str, str] | None = None, icon_sprite: str | None = None) -> None:
+    """Create this worker's markdown processor and template engine"""
+    global _processor, _engine
+    images = ResponsiveImages(image_formats, assets)
+    _processor = MarkdownProcessor(images)
+    _engine = TemplateEngine(templates_dir, images, cache_dir, navigation, icon_sprite)
+
+
+def _render_in_worker(md_file: Path) -> PageResult:
+    """Render one page, capturing any error instead of raising it"""
+    assert _processor is not None and _engine is not None
+    cache = _engine.bytecode_cache
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    try:
+        with Stopwatch() as stopwatch:
+            html = render_page(md_file, _processor, _engine)
+    except Exception as e:
+        return PageResult(md_file, error=f"{type(e).__name__}: {e}")
+    if cache is not None:
+        # Templates are compiled at most once per worker, on its first page that uses them
+        hits, misses = cache.hits - hits, cache.misses - misses
+    return PageResult(md_file, html=html, timing=stopwatch.timing,
+                      template_cache_hits=hits, template_cache_misses=misses)
+
+
+def render_pages(md_files: list[Path], templates_dir: str, workers: int | None = 1,
+                 image_formats: dict[str, ImageFormats] | None = None,
+                 cache_dir: str | None = None,
+                 navigation: dict[str, Any] | None = None,
+                 assets: dict[str, str] | None = None,
+                 icon_sprite: str | None = None) -> Generator[PageResult, None, None]:
+    """Render pages across a process pool, yielding results in input order
+
+    image_formats maps an image src such as images/personA.png to the variants
+    written for it, so pages can reference them with responsive markup.
+    cache_dir holds compiled templates shared by every worker and later builds.
+    navigation is the site index's nav, so workers do not rescan the content.
+    assets maps asset paths to their fingerprinted copies, which pages link to instead.
+    icon_sprite is the SVG sprite of navigation icons, or None to use one PNG per icon.
+    """
+    return imap_ordered(_render_in_worker, md_files, workers, _init_worker,
+                        (templates_dir, image_formats, cache_dir, navigation, assets, icon_sprite))
@@ -0,0 +1,50 @@
+"""
+Parallel execution helpers for AI Safety website builders
+Runs independent build jobs across a process pool while keeping results in input order
+"""
+
+import multiprocessing
+import os
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def resolve_workers(workers: int | None, job_count: int) -> int:
+    """Number of worker processes to use: all CPUs by default, never more than there are jobs"""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, job_count))
+
+
+def imap_ordered(func: Callable[[T], R],
+                 items: Iterable[T],
+                 workers: int | None = None,
+                 initializer: Callable[..., None] | None = None,
+                 initargs: tuple[Any, ...] = ()) -> Generator[R, None, None]:
+    """Apply func to every item, in a process pool when there is more than one worker
+
+    Results are yielded in the same order as items regardless of which worker
+    finishes first, so output and progress logs stay deterministic. The serial
+    path runs the initializer in-process so func sees the same worker state.
+    """
+    items = list(items)
+    worker_count = resolve_workers(workers, len(items))
+
+    if worker_count <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield func(item)
+        return
+
+    # Spawned workers import modules fresh, so no parent state leaks into them
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=worker_count,
+                             mp_context=context,
+                             initializer=initializer,
+                             initargs=initargs) as pool:
+        yield from pool.map(func, items)
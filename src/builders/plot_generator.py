@@ -3,17 +3,13 @@ AI Safety Website Plot Generator
 Professional plotting functions that match the website's design theme
 """
 
-import matplotlib
-
-matplotlib.use('Agg')  # Use non-interactive backend to prevent popups
+import json
 import os
+from pathlib import Path
 
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
-import numpy as np
-import pandas as pd
-import seaborn as sns
+from .data_catalog import DataCatalog, dataset_inputs
+from .figures import FigureJob, pyplot, render_figures, save_figure
+from .image_formats import PRIMARY_ONLY, RASTER_CHART, VECTOR_CHART, ImageFormats
 
 # Website color scheme - cohesive blue theme with complementary accents
 COLORS = {
@@ -34,54 +30,80 @@ COLORS = {
     'light_gray': '#e2e8f0'
 }
 
-# Set the seaborn palette with cohesive theme colors
-sns.set_palette([COLORS['primary_blue'], COLORS['accent_blue'], COLORS['light_blue'],
-                COLORS['bright_blue'], COLORS['soft_cyan'], COLORS['mint_green'],
-                COLORS['warm_amber'], COLORS['soft_purple'], COLORS['coral_pink']])
+# Seaborn palette with cohesive theme colors
+PALETTE = [COLORS['primary_blue'], COLORS['accent_blue'], COLORS['light_blue'],
+           COLORS['bright_blue'], COLORS['soft_cyan'], COLORS['mint_green'],
+           COLORS['warm_amber'], COLORS['soft_purple'], COLORS['coral_pink']]
+
+# rcParams applied by setup_plot_style
+PLOT_STYLE = {
+    'figure.facecolor': 'white',
+    'axes.facecolor': 'white',
+    'axes.spines.top': False,
+    'axes.spines.right': False,
+    'axes.spines.left': True,
+    'axes.spines.bottom': True,
+    'axes.edgecolor': COLORS['text_light'],
+    'axes.linewidth': 1.2,
+    'grid.color': '#e8f2fe',
+    'grid.linestyle': '-',
+    'grid.linewidth': 0.8,
+    'grid.alpha': 0.7,
+    'font.family': ['Arial', 'Helvetica', 'sans-serif'],
+    'font.size': 12,
+    'axes.titlesize': 16,
+    'axes.labelsize': 13,
+    'xtick.labelsize': 11,
+    'ytick.labelsize': 11,
+    'legend.fontsize': 11,
+    'text.color': COLORS['text_dark'],
+    'axes.labelcolor': COLORS['text_dark'],
+    'xtick.color': COLORS['text_light'],
+    'ytick.color': COLORS['text_light']
+}
+
+# Resolution every plot is saved at, also used to size downsampling
+DPI: float = 300
+
+# savefig parameters shared by every plot
+SAVE_KWARGS = {'dpi': DPI, 'bbox_inches': 'tight', 'facecolor': 'white'}
+
+# Everything besides data and code that changes how a plot looks, used as a render cache key
+STYLE_KEY = json.dumps([PLOT_STYLE, COLORS, PALETTE, SAVE_KWARGS], sort_keys=True)
 
 def setup_plot_style() -> None:
     """Configure matplotlib for professional styling matching website theme"""
-    plt.rcParams.update({
-        'figure.facecolor': 'white',
-        'axes.facecolor': 'white',
-        'axes.spines.top': False,
-        'axes.spines.right': False,
-        'axes.spines.left': True,
-        'axes.spines.bottom': True,
-        'axes.edgecolor': COLORS['text_light'],
-        'axes.linewidth': 1.2,
-        'grid.color': '#e8f2fe',
-        'grid.linestyle': '-',
-        'grid.linewidth': 0.8,
-        'grid.alpha': 0.7,
-        'font.family': ['Arial', 'Helvetica', 'sans-serif'],
-        'font.size': 12,
-        'axes.titlesize': 16,
-        'axes.labelsize': 13,
-        'xtick.labelsize': 11,
-        'ytick.labelsize': 11,
-        'legend.fontsize': 11,
-        'text.color': COLORS['text_dark'],
-        'axes.labelcolor': COLORS['text_dark'],
-        'xtick.color': COLORS['text_light'],
-        'ytick.color': COLORS['text_light']
-    })
-
-def create_market_trends_plot(csv_path: str = 'data/market_trends.csv', save_path: str = 'website/images/market_trends_new.png') -> None:
+    import seaborn as sns
+
+    # Set the seaborn palette with cohesive theme colors
+    sns.set_palette(PALETTE)
+    pyplot().rcParams.update(PLOT_STYLE)
+
+def create_market_trends_plot(csv_path: str = 'data/market_trends.csv', save_path: str = 'website/images/market_trends_new.png',
+                              formats: ImageFormats = PRIMARY_ONLY, cache_dir: str | None = None) -> None:
     """Create S&P 500 and Bitcoin market trends plot"""
+    import matplotlib.dates as mdates
+
+    from .downsample import downsample, pixel_budget
+
+    plt = pyplot()
     setup_plot_style()
 
-    # Load data
-    df = pd.read_csv(csv_path)
-    df['Date'] = pd.to_datetime(df['Date'])
+    # Daily closes; histories too large for memory are aggregated while streaming
+    history = DataCatalog(Path(csv_path).parent, cache_dir).price_history(Path(csv_path).stem, freq='D')
 
     # Create figure with dual y-axes
     fig, ax1 = plt.subplots(figsize=(12, 8))
     fig.patch.set_facecolor('white')
 
+    # Long daily histories are reduced to about one point per output pixel
+    budget = pixel_budget(ax1, DPI)
+    sp500_dates, sp500 = downsample(history.periods, history.close('SP500'), budget)
+    bitcoin_dates, bitcoin = downsample(history.periods, history.close('Bitcoin'), budget)
+
     # Plot S&P 500
     color1 = COLORS['primary_blue']
-    ax1.plot(df['Date'], df['SP500'], color=color1, linewidth=3, label='S&P 500', marker='o', markersize=6)
+    ax1.plot(sp500_dates, sp500, color=color1, linewidth=3, label='S&P 500', marker='o', markersize=6)
     ax1.set_xlabel('Year', fontweight='bold', color=COLORS['text_dark'])
     ax1.set_ylabel('S&P 500 Index', fontweight='bold', color=color1)
     ax1.tick_params(axis='y', labelcolor=color1)
@@ -90,7 +112,7 @@ def create_market_trends_plot(csv_path: str = 'data/market_trends.csv', save_pat
     # Create second y-axis for Bitcoin
     ax2 = ax1.twinx()
     color2 = COLORS['warm_amber']
-    ax2.plot(df['Date'], df['Bitcoin'], color=color2, linewidth=3, label='Bitcoin', marker='s', markersize=6)
+    ax2.plot(bitcoin_dates, bitcoin, color=color2, linewidth=3, label='Bitcoin', marker='s', markersize=6)
     ax2.set_ylabel('Bitcoin Price (USD)', fontweight='bold', color=color2)
     ax2.tick_params(axis='y', labelcolor=color2)
 
@@ -110,11 +132,15 @@ def create_market_trends_plot(csv_path: str = 'data/market_trends.csv', save_pat
                frameon=True, fancybox=True, shadow=True, framealpha=0.9)
 
     plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()  # Close the figure to free memory
+    save_figure(save_path, SAVE_KWARGS, formats)  # Also closes the figure to free memory
 
-def create_portfolio_projection_plot(person: str = 'A', csv_path: str | None = None, save_path: str | None = None) -> None:
+def create_portfolio_projection_plot(person: str = 'A', csv_path: str | None = None, save_path: str | None = None,
+                                     formats: ImageFormats = PRIMARY_ONLY, cache_dir: str | None = None) -> None:
     """Create individual portfolio projection plot"""
+    import matplotlib.ticker as ticker
+    import numpy as np
+
+    plt = pyplot()
     setup_plot_style()
 
     if csv_path is None:
@@ -123,7 +149,7 @@ def create_portfolio_projection_plot(person: str = 'A', csv_path: str | None = N
         save_path = f'website/images/person{person}_new.png'
 
     # Load data
-    df = pd.read_csv(csv_path)
+    df = DataCatalog(Path(csv_path).parent, cache_dir).frame(Path(csv_path).stem)
 
     # Create figure
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -181,17 +207,23 @@ def create_portfolio_projection_plot(person: str = 'A', csv_path: str | None = N
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()  # Close the figure to free memory
+    save_figure(save_path, SAVE_KWARGS, formats)  # Also closes the figure to free memory
 
-def create_comparative_wealth_plot(data_dir: str = 'data', save_path: str = 'website/images/comparative_wealth.png') -> None:
+def create_comparative_wealth_plot(data_dir: str = 'data', save_path: str = 'website/images/comparative_wealth.png',
+                                   formats: ImageFormats = PRIMARY_ONLY, cache_dir: str | None = None) -> None:
     """Create comparative wealth outcomes bar chart using actual portfolio data"""
+    import matplotlib.ticker as ticker
+    import numpy as np
+
+    plt = pyplot()
     setup_plot_style()
 
-    # Load individual portfolio data
-    person_a_df = pd.read_csv(f'{data_dir}/personA_portfolio.csv')
-    person_b_df = pd.read_csv(f'{data_dir}/personB_portfolio.csv')
-    person_c_df = pd.read_csv(f'{data_dir}/personC_portfolio.csv')
+    # Load individual portfolio data, already parsed if the portfolio plots ran first
+    catalog = DataCatalog(data_dir, cache_dir)
+    person_a_df = catalog.frame('personA_portfolio')
+    person_b_df = catalog.frame('personB_portfolio')
+    person_c_df = catalog.frame('personC_portfolio')
+    strategy_labels = catalog.frame('comparative_wealth').set_index('Person')['Strategy']
 
     # Extract 2030 data for each person
     a_2030 = person_a_df[person_a_df['Year'] == 2030].iloc[0]
@@ -240,11 +272,7 @@ def create_comparative_wealth_plot(data_dir: str = 'data', save_path: str = 'web
                f'${value:,.0f}', ha='center', va='bottom', fontweight='bold')
 
     # Add strategy descriptions as subtitle text
-    strategies = [
-        'Conservative (Savings + 401k)',
-        'Balanced (Tech + Real Estate + Savings + 401k)',
-        'Aggressive (Crypto + Tech + Savings + House + 401k)'
-    ]
+    strategies = [strategy_labels[person] for person in persons]
 
     for _, (bar, strategy) in enumerate(zip(bars, strategies, strict=False)):
         ax.text(bar.get_x() + bar.get_width()/2, -15000,
@@ -257,37 +285,72 @@ def create_comparative_wealth_plot(data_dir: str = 'data', save_path: str = 'web
     # Adjust layout to make room for strategy labels
     plt.subplots_adjust(bottom=0.15)
     plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()  # Close the figure to free memory
+    save_figure(save_path, SAVE_KWARGS, formats)  # Also closes the figure to free memory
+
+def plot_jobs(data_dir: str = 'data', output_dir: str = 'images', cache_dir: str | None = None) -> list[FigureJob]:
+    """List every plot as a figure job with the data files it reads
+
+    With a cache_dir, parsed datasets are kept there so later builds skip CSV parsing.
+    """
+    jobs = [
+        FigureJob(
+            output='market_trends.png',
+            func=create_market_trends_plot,
+            kwargs={
+                'csv_path': f'{data_dir}/market_trends.csv',
+                'save_path': f'{output_dir}/market_trends.png',
+                'formats': VECTOR_CHART,
+                'cache_dir': cache_dir
+            },
+            inputs=dataset_inputs(data_dir, 'market_trends'),
+            label="📈 Creating market trends plot...",
+            style=setup_plot_style,
+            style_key=STYLE_KEY
+        )
+    ]
 
-def generate_all_plots(data_dir: str = 'data', output_dir: str = 'images') -> None:
-    """Generate all plots and save them"""
+    for person in ['A', 'B', 'C']:
+        jobs.append(FigureJob(
+            output=f'person{person}.png',
+            func=create_portfolio_projection_plot,
+            kwargs={
+                'person': person,
+                'csv_path': f'{data_dir}/person{person}_portfolio.csv',
+                'save_path': f'{output_dir}/person{person}.png',
+                'formats': RASTER_CHART,
+                'cache_dir': cache_dir
+            },
+            inputs=dataset_inputs(data_dir, f'person{person}_portfolio'),
+            label=f"💰 Creating Person {person} portfolio projection...",
+            style=setup_plot_style,
+            style_key=STYLE_KEY
+        ))
+
+    jobs.append(FigureJob(
+        output='comparative_wealth.png',
+        func=create_comparative_wealth_plot,
+        kwargs={
+            'data_dir': data_dir,
+            'save_path': f'{output_dir}/comparative_wealth.png',
+            'formats': VECTOR_CHART,
+            'cache_dir': cache_dir
+        },
+        inputs=dataset_inputs(data_dir, 'personA_portfolio', 'personB_portfolio', 'personC_portfolio',
+                              'comparative_wealth'),
+        label="📊 Creating comparative wealth analysis...",
+        style=setup_plot_style,
+        style_key=STYLE_KEY
+    ))
+
+    return jobs
+
+def generate_all_plots(data_dir: str = 'data', output_dir: str = 'images', workers: int | None = 1) -> None:
+    """Generate all plots and save them, optionally across a pool of worker processes"""
 
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
 
-    # Generate market trends plot
-    print("📈 Creating market trends plot...")
-    create_market_trends_plot(
-        csv_path=f'{data_dir}/market_trends.csv',
-        save_path=f'{output_dir}/market_trends.png'
-    )
-
-    # Generate individual portfolio plots
-    for person in ['A', 'B', 'C']:
-        print(f"💰 Creating Person {person} portfolio projection...")
-        create_portfolio_projection_plot(
-            person=person,
-            csv_path=f'{data_dir}/person{person}_portfolio.csv',
-            save_path=f'{output_dir}/person{person}.png'
-        )
-
-    # Generate comparative wealth plot
-    print("📊 Creating comparative wealth analysis...")
-    create_comparative_wealth_plot(
-        data_dir=data_dir,
-        save_path=f'{output_dir}/comparative_wealth.png'
-    )
+    render_figures(plot_jobs(data_dir, output_dir), workers)
 
     print("✅ All plots generated successfully!")
 
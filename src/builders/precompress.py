@@ -0,0 +1,189 @@
+"""
+Precompression for AI Safety website
+Writes .gz and .zst siblings of text assets so the edge can serve them without compressing on the fly
+"""
+
+import gzip
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+from .build_manifest import hash_bytes
+from .parallel import resolve_workers
+
+try:  # Python 3.14+
+    from compression import zstd  # type: ignore[import-not-found]
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # Without either, only gzip variants are written
+    zstandard = None
+
+# Bump when levels or encoders change so every variant is rewritten
+PRECOMPRESS_VERSION = 1
+
+GZIP_LEVEL = 9
+ZSTD_LEVEL = 22
+
+# Every variant suffix this module writes, whether or not its encoder is available here
+VARIANT_SUFFIXES = ('.gz', '.zst')
+
+# Files worth compressing; images other than SVG are already compressed
+TEXT_SUFFIXES = frozenset({'.html', '.css', '.js', '.json', '.svg', '.xml', '.txt'})
+
+
+def _gzip_compress(data: bytes) -> bytes:
+    # A fixed timestamp keeps the output identical across builds
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    if zstd is not None:
+        return cast(bytes, zstd.compress(data, level=ZSTD_LEVEL))
+    return cast(bytes, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data))
+
+
+def encoders() -> dict[str, Callable[[bytes], bytes]]:
+    """Suffix and compressor of every variant this environment can write"""
+    available: dict[str, Callable[[bytes], bytes]] = {'.gz': _gzip_compress}
+    if zstd is not None or zstandard is not None:
+        available['.zst'] = _zstd_compress
+    return available
+
+
+def variant_path(path: Path, suffix: str) -> Path:
+    """Compressed sibling of a file, e.g. style.css.gz"""
+    return path.with_name(path.name + suffix)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace a file in one step so the dev server never serves half a variant"""
+    temp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+@dataclass
+class CompressionResult:
+    """What one file's variants came to"""
+
+    output: str
+    digest: str
+    size: int
+    variants: dict[str, int] = field(default_factory=dict)
+    skipped: bool = False
+
+
+def compress_file(path: Path, output: str, digest: str, data: bytes,
+                  codecs: dict[str, Callable[[bytes], bytes]]) -> CompressionResult:
+    """Write each variant that is smaller than the original, removing any that is not
+
+    Variants this environment cannot encode are removed too, so a stale one is
+    never served in place of the new original.
+    """
+    result = CompressionResult(output, digest, len(data))
+    for suffix in VARIANT_SUFFIXES:
+        target = variant_path(path, suffix)
+        compressed = codecs[suffix](data) if suffix in codecs else None
+        if compressed is not None and len(compressed) < len(data):
+            _write_atomic(target, compressed)
+            result.variants[suffix] = len(compressed)
+        else:
+            target.unlink(missing_ok=True)
+    return result
+
+
+class Precompressor:
+    """Keep compressed siblings of every text file in an output directory up to date
+
+    Content hashes of the files compressed by the last build are kept in a JSON
+    cache, so unchanged files are skipped as long as their variants still exist.
+    """
+
+    def __init__(self, output_dir: Path, cache_path: Path | None = None, workers: int | None = None):
+        self.output_dir = Path(output_dir)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.workers = workers
+        self.codecs = encoders()
+
+    def _load_cache(self) -> dict[str, Any]:
+        """Cached results keyed by output path, or nothing if the cache is missing or outdated"""
+        if self.cache_path is None:
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != PRECOMPRESS_VERSION or data.get('codecs') != sorted(self.codecs):
+            return {}
+        return cast(dict[str, Any], data.get('files', {}))
+
+    def _save_cache(self, results: list[CompressionResult]) -> None:
+        """Write the cache atomically"""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        files = {
+            result.output: {'digest': result.digest, 'size': result.size, 'variants': result.variants}
+            for result in results
+        }
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(
+            {'version': PRECOMPRESS_VERSION, 'codecs': sorted(self.codecs), 'files': files}, indent=2
+        ), encoding='utf-8')
+        tmp_path.replace(self.cache_path)
+
+    def text_files(self) -> list[Path]:
+        """Every file in the output directory that gets compressed variants"""
+        return sorted(
+            path for path in self.output_dir.rglob('*')
+            if path.suffix in TEXT_SUFFIXES and path.is_file()
+        )
+
+    def _is_current(self, path: Path, digest: str, entry: dict[str, Any] | None) -> bool:
+        """Whether a file's variants were written from these exact bytes and are all still there"""
+        if entry is None or entry['digest'] != digest:
+            return False
+        return all(
+            variant_path(path, suffix).exists() == (suffix in entry['variants']) for suffix in VARIANT_SUFFIXES
+        )
+
+    def remove_stale_variants(self) -> int:
+        """Delete variants whose original no longer exists"""
+        removed = 0
+        for suffix in VARIANT_SUFFIXES:
+            for variant in self.output_dir.rglob(f'*{suffix}'):
+                original = variant.with_name(variant.name[:-len(suffix)])
+                if original.suffix in TEXT_SUFFIXES and not original.exists():
+                    variant.unlink()
+                    removed += 1
+        return removed
+
+    def run(self) -> list[CompressionResult]:
+        """Compress every changed text file across a thread pool, returning a result per file"""
+        cached = self._load_cache()
+        self.remove_stale_variants()
+
+        def process(path: Path) -> CompressionResult:
+            output = path.relative_to(self.output_dir).as_posix()
+            data = path.read_bytes()
+            digest = hash_bytes(data)
+            entry = cached.get(output)
+            if self._is_current(path, digest, entry):
+                assert entry is not None
+                return CompressionResult(output, digest, entry['size'], dict(entry['variants']), skipped=True)
+            return compress_file(path, output, digest, data, self.codecs)
+
+        paths = self.text_files()
+        # zlib and zstd release the GIL while compressing, so threads run in parallel
+        with ThreadPoolExecutor(max_workers=resolve_workers(self.workers, len(paths))) as pool:
+            results = list(pool.map(process, paths))
+
+        self._save_cache(results)
+        return results
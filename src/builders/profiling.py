@@ -0,0 +1,141 @@
+"""
+Build profiling for AI Safety website
+Records wall time, CPU time and memory growth for each build stage and each output, and the build's peak memory
+"""
+
+import cProfile
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType, TracebackType
+from typing import Any
+
+resource: ModuleType | None
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_mb(children: bool = False) -> float:
+    """Peak resident set size of this process (or its finished children) in MB"""
+    if resource is None:
+        return 0.0
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = int(resource.getrusage(who).ru_maxrss)
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def high_water_mb() -> float:
+    """Largest peak RSS of this process and its finished children so far, in MB"""
+    return max(peak_rss_mb(), peak_rss_mb(children=True))
+
+
+def _cpu_seconds() -> float:
+    """CPU time used by this process and its finished children"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+@dataclass(frozen=True)
+class Timing:
+    """Resources used to produce one stage or output
+
+    Peak RSS is a lifetime high-water mark, so the memory figure is how far a
+    stage or output raised it: zero unless it needed more than anything before.
+    """
+
+    wall_s: float
+    cpu_s: float
+    rss_growth_mb: float
+
+
+class Stopwatch:
+    """Context manager that measures the code it wraps"""
+
+    def __enter__(self) -> 'Stopwatch':
+        self._wall = time.perf_counter()
+        self._cpu = _cpu_seconds()
+        self._high_water = high_water_mb()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.timing = Timing(
+            wall_s=round(time.perf_counter() - self._wall, 6),
+            cpu_s=round(_cpu_seconds() - self._cpu, 6),
+            rss_growth_mb=round(max(0.0, high_water_mb() - self._high_water), 1),
+        )
+
+
+class BuildProfiler:
+    """Collect per-stage and per-output measurements and write them as a JSON report"""
+
+    def __init__(self, profile_dir: Path | None = None):
+        # When set, each stage is also run under cProfile and dumped here
+        self.profile_dir = profile_dir
+        self.started = datetime.now(timezone.utc)
+        self.stages: list[dict[str, Any]] = []
+        self.outputs: list[dict[str, Any]] = []
+        self.sections: dict[str, Any] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure a build stage, optionally capturing a cProfile dump for it"""
+        profiler = cProfile.Profile() if self.profile_dir is not None else None
+        with Stopwatch() as stopwatch:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                yield
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+
+        self.stages.append({'stage': name, **asdict(stopwatch.timing)})
+        if profiler is not None and self.profile_dir is not None:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(self.profile_dir / f"{name}.prof"))
+
+    def record_output(self, stage: str, output: str, timing: Timing, **details: Any) -> None:
+        """Measurement for a single output file produced by a stage"""
+        self.outputs.append({'stage': stage, 'output': output, **asdict(timing), **details})
+
+    def add_section(self, name: str, data: Any) -> None:
+        """Extra named data to include in the report, e.g. cache statistics"""
+        self.sections[name] = data
+
+    def report(self) -> dict[str, Any]:
+        """The full report as a JSON-serialisable dictionary"""
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'total': {
+                'wall_s': round(sum(stage['wall_s'] for stage in self.stages), 6),
+                'cpu_s': round(sum(stage['cpu_s'] for stage in self.stages), 6),
+                'peak_rss_mb': round(high_water_mb(), 1),
+            },
+            'stages': self.stages,
+            'outputs': self.outputs,
+            **self.sections,
+        }
+
+    def write_report(self, path: Path) -> None:
+        """Write the report to path"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding='utf-8')
+
+    def print_summary(self) -> None:
+        """Print a one-line timing per stage, then the build's peak memory"""
+        print("\n⏱️  Build timings:")
+        for stage in self.stages:
+            print(f"   {stage['stage']:<10} {stage['wall_s']:8.2f}s wall {stage['cpu_s']:8.2f}s cpu "
+                  f"{stage['rss_growth_mb']:+8.1f} MB RSS")
+        print(f"   {'peak':<10} {high_water_mb():8.1f} MB RSS")
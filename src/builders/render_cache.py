@@ -0,0 +1,112 @@
+"""
+Render cache for AI Safety website figures
+Content-addressed on-disk store of rendered images keyed on data, style and code version
+"""
+
+import hashlib
+import inspect
+import os
+import shutil
+from importlib import metadata
+from pathlib import Path
+
+from .figures import FigureJob
+from .reproducible import OUTPUT_VERSION
+
+# Default upper bound on the total size of cached renders
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _package_version(name: str) -> str:
+    """Installed version of a package, read without importing it"""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+class RenderCache:
+    """Cache rendered figures on disk with least-recently-used eviction"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, job: FigureJob) -> str:
+        """Hash everything that determines a figure's pixels"""
+        digest = hashlib.sha256()
+        digest.update(job.output.encode('utf-8'))
+        digest.update(inspect.getsource(job.func).encode('utf-8'))
+        digest.update(job.style_key.encode('utf-8'))
+        digest.update(repr(job.formats).encode('utf-8'))
+        digest.update(f'output-v{OUTPUT_VERSION}'.encode())
+        for package in ('matplotlib', 'pillow'):
+            digest.update(_package_version(package).encode('utf-8'))
+        for path in job.inputs:
+            digest.update(f'\0{path.name}\0'.encode())
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def fetch(self, key: str, destinations: list[Path]) -> bool:
+        """Place cached files at their destinations, returning False on a miss"""
+        entry = self._entry(key)
+        sources = [entry / destination.name for destination in destinations]
+        if not all(source.is_file() for source in sources):
+            self.misses += 1
+            return False
+
+        for source, destination in zip(sources, destinations, strict=True):
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            destination.unlink(missing_ok=True)
+            try:
+                os.link(source, destination)
+            except OSError:
+                # Hard links fail across filesystems; fall back to a plain copy
+                shutil.copy2(source, destination)
+
+        # Touch the entry so eviction treats it as recently used
+        os.utime(entry)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, sources: list[Path]) -> None:
+        """Add freshly rendered files to the cache, then evict down to the size limit"""
+        entry = self._entry(key)
+        if entry.exists():
+            return
+
+        # Copy into a private directory and rename so readers never see half an entry
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_entry = self.cache_dir / f'.tmp-{key}-{os.getpid()}'
+        tmp_entry.mkdir(exist_ok=True)
+        for source in sources:
+            shutil.copy2(source, tmp_entry / source.name)
+        try:
+            tmp_entry.rename(entry)
+        except OSError:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            if entry.is_dir() and not entry.name.startswith('.'):
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: (e[0], e[2].name)):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
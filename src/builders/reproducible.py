@@ -0,0 +1,91 @@
+"""
+Reproducible figure output for AI Safety website
+Pins the metadata and rendering inputs that would otherwise make identical figures differ between builds
+"""
+
+import os
+import random
+import struct
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+# Bump when saved figures are post-processed differently so cached renders are redone
+OUTPUT_VERSION = 1
+
+# savefig metadata per format; None drops a key matplotlib would otherwise fill in
+# with its version or the current time
+SAVE_METADATA: dict[str, dict[str, Any]] = {
+    'png': {'Software': None},
+    'svg': {'Date': None, 'Creator': None},
+}
+
+# rcParams applied while a figure renders: SVG element ids are hashed with a fixed
+# salt instead of a random one
+RENDER_PARAMS = {'svg.hashsalt': 'aisafety'}
+
+# Seed for any random jitter a drawing function uses
+RANDOM_SEED = 0
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Chunks that decide how a PNG looks; text, timestamps and physical size do not
+ESSENTIAL_CHUNKS = frozenset({b'IHDR', b'PLTE', b'tRNS', b'IDAT', b'IEND', b'gAMA', b'cHRM', b'sRGB', b'iCCP', b'sBIT'})
+
+
+def seed_random() -> None:
+    """Seed the random number generators a drawing function might use"""
+    random.seed(RANDOM_SEED)
+    import numpy as np  # Only loaded in render workers, which have matplotlib and numpy already
+
+    np.random.seed(RANDOM_SEED)
+
+
+def save_metadata(fmt: str, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
+    """savefig metadata for a format, with the pinned keys overridden by any given ones"""
+    return {**SAVE_METADATA.get(fmt, {}), **(metadata or {})}
+
+
+def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """One encoded PNG chunk: length, type, data and CRC"""
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+
+def iter_png_chunks(data: bytes) -> Iterator[tuple[bytes, bytes]]:
+    """Type and full encoded bytes of every chunk in a PNG, in order"""
+    position = len(PNG_SIGNATURE)
+    while position < len(data):
+        length, chunk_type = struct.unpack('>I4s', data[position:position + 8])
+        end = position + 12 + length
+        yield chunk_type, data[position:end]
+        position = end
+
+
+def strip_png_chunks(data: bytes) -> bytes:
+    """A PNG with every non-essential chunk removed, leaving the pixels untouched"""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError('not a PNG file')
+    chunks = [chunk for chunk_type, chunk in iter_png_chunks(data) if chunk_type in ESSENTIAL_CHUNKS]
+    return PNG_SIGNATURE + b''.join(chunks)
+
+
+def png_chunk_types(data: bytes) -> list[bytes]:
+    """Type of every chunk in a PNG, in order"""
+    return [chunk_type for chunk_type, _ in iter_png_chunks(data)]
+
+
+def normalize_png(path: Path) -> bool:
+    """Strip a saved PNG down to its essential chunks, returning whether it changed
+
+    The file is replaced rather than written in place, since it may be a hard link
+    into the render cache.
+    """
+    data = path.read_bytes()
+    stripped = strip_png_chunks(data)
+    if stripped == data:
+        return False
+    temp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    temp_path.write_bytes(stripped)
+    os.replace(temp_path, path)
+    return True
@@ -0,0 +1,210 @@
+"""
+Search index for AI Safety website
+Builds a compact inverted index of rendered page text, sharded by term prefix for client-side search
+"""
+
+import html
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .build_manifest import hash_bytes
+
+# Bump when tokenizing or the shard format changes so cached terms and shards are rebuilt
+SEARCH_INDEX_VERSION = 1
+
+# Leading characters of a term that pick its shard. Two characters split a large
+# vocabulary into a few hundred small files while a query still fetches one per word.
+SHARD_PREFIX = 2
+
+# Text between <main> and </main>; the nav and footer repeat on every page and are not indexed
+MAIN_RE = re.compile(r'<main[^>]*>(.*?)</main>', re.DOTALL | re.IGNORECASE)
+SKIP_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Runs of letters and digits; search.js splits queries with the equivalent /[\p{L}\p{N}]+/u
+TOKEN_RE = re.compile(r'[^\W_]+')
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 32
+
+# Words too common to narrow a search, left out of the index and ignored in queries
+STOPWORDS = frozenset("""
+    an and are as at be but by for from has have in into is it its of on or that the their
+    this to was were which will with
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase index terms of a piece of text, in order"""
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH and token not in STOPWORDS
+    ]
+
+
+def page_text(page_html: str) -> str:
+    """Visible text of a page's main content"""
+    match = MAIN_RE.search(page_html)
+    body = match.group(1) if match else page_html
+    return html.unescape(TAG_RE.sub(' ', SKIP_RE.sub(' ', body)))
+
+
+def shard_key(term: str) -> str:
+    """Shard holding a term: its first characters when they are ASCII letters or digits, else '_'"""
+    prefix = term[:SHARD_PREFIX]
+    return prefix if prefix.isascii() and prefix.isalnum() else '_'
+
+
+def encode_postings(postings: list[tuple[int, int]]) -> list[int]:
+    """Flatten (document, term count) pairs sorted by document into [gap, count, gap, count, ...]
+
+    Each document id is stored as the gap from the previous one, so a term that
+    appears on most pages is a run of 1s rather than ever longer numbers.
+    """
+    encoded: list[int] = []
+    previous = 0
+    for doc, count in postings:
+        encoded.extend((doc - previous, count))
+        previous = doc
+    return encoded
+
+
+def decode_postings(encoded: list[int]) -> list[tuple[int, int]]:
+    """Inverse of encode_postings"""
+    postings = []
+    doc = 0
+    for i in range(0, len(encoded), 2):
+        doc += encoded[i]
+        postings.append((doc, encoded[i + 1]))
+    return postings
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """A page to index: its URL, display title and rendered HTML file"""
+
+    url: str
+    title: str
+    path: Path
+
+
+class SearchIndex:
+    """Inverted index of every page, written as one JSON file per term prefix
+
+    Term counts of each page are cached by file signature and content hash, so a
+    build only tokenizes pages whose HTML changed, and only shards whose content
+    changed are rewritten.
+    """
+
+    def __init__(self, output_dir: Path, cache_path: Path | None = None):
+        # Shards and the document table are served from output_dir/search/
+        self.output_dir = Path(output_dir)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.tokenized = 0
+        self.reused = 0
+        self.written: list[str] = []
+
+    @property
+    def index_dir(self) -> Path:
+        return self.output_dir / 'search'
+
+    def _load_cache(self) -> dict[str, Any]:
+        """Cached term counts keyed by URL, or nothing if the cache is missing or outdated"""
+        if self.cache_path is None:
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        return data.get('pages', {}) if data.get('version') == SEARCH_INDEX_VERSION else {}
+
+    def _save_cache(self, entries: dict[str, Any]) -> None:
+        """Write the cache atomically"""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'version': SEARCH_INDEX_VERSION, 'pages': entries}), encoding='utf-8')
+        tmp_path.replace(self.cache_path)
+
+    def term_counts(self, documents: list[SearchDocument]) -> list[dict[str, int]]:
+        """Term counts of each document, tokenizing only documents whose HTML changed"""
+        cached = self._load_cache()
+        entries: dict[str, Any] = {}
+        counts = []
+        for document in documents:
+            stat = document.path.stat()
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(document.url)
+            if entry is None or entry['signature'] != signature:
+                # A rewritten but identical page keeps its terms; only new content is tokenized
+                data = document.path.read_bytes()
+                digest = hash_bytes(data)
+                if entry is None or entry['digest'] != digest:
+                    entry = {'digest': digest, 'terms': dict(Counter(tokenize(page_text(data.decode('utf-8')))))}
+                    self.tokenized += 1
+                else:
+                    self.reused += 1
+                entry = {**entry, 'signature': signature}
+            else:
+                self.reused += 1
+            entries[document.url] = entry
+            counts.append(entry['terms'])
+
+        if entries != cached:
+            self._save_cache(entries)
+        return counts
+
+    def shards(self, documents: list[SearchDocument]) -> dict[str, dict[str, list[int]]]:
+        """Encoded postings of every term, grouped into shards by term prefix"""
+        postings: dict[str, list[tuple[int, int]]] = {}
+        for doc, terms in enumerate(self.term_counts(documents)):
+            for term, count in terms.items():
+                postings.setdefault(term, []).append((doc, count))
+
+        shards: dict[str, dict[str, list[int]]] = {}
+        for term in sorted(postings):
+            shards.setdefault(shard_key(term), {})[term] = encode_postings(postings[term])
+        return shards
+
+    def _write(self, name: str, data: Any) -> None:
+        """Write one index file, leaving it untouched when its content is unchanged"""
+        path = self.index_dir / name
+        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        try:
+            if path.read_text(encoding='utf-8') == text:
+                return
+        except OSError:
+            pass
+        path.write_text(text, encoding='utf-8')
+        self.written.append(name)
+
+    def build(self, documents: list[SearchDocument]) -> dict[str, int]:
+        """Write the document table and every shard, removing shards no term uses any more"""
+        documents = sorted(documents, key=lambda document: document.url)
+        shards = self.shards(documents)
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._write('documents.json', {
+            'version': SEARCH_INDEX_VERSION,
+            'prefix': SHARD_PREFIX,
+            'shards': sorted(shards),
+            'documents': [[document.url, document.title] for document in documents],
+        })
+        for key, terms in shards.items():
+            self._write(f'{key}.json', terms)
+
+        names = {f'{key}.json' for key in shards} | {'documents.json'}
+        for stale in self.index_dir.glob('*.json'):
+            if stale.name not in names:
+                stale.unlink()
+
+        return {
+            'documents': len(documents),
+            'terms': sum(len(terms) for terms in shards.values()),
+            'shards': len(shards),
+            'bytes': sum(path.stat().st_size for path in self.index_dir.glob('*.json')),
+        }
@@ -0,0 +1,198 @@
+"""
+Shortcode engine for AI Safety website
+Single-pass tokenizer and handler registry for {{< name "arg" >}} shortcodes in markdown
+"""
+
+import html
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+# One token per shortcode tag: optional closing slash, name and quoted arguments.
+# No part of the pattern can match across another tag, so scanning is linear.
+SHORTCODE_RE = re.compile(r'{{<\s*(/?)([A-Za-z][\w-]*)((?:\s+"[^"]*")*)\s*>}}')
+ARG_RE = re.compile(r'"([^"]*)"')
+
+
+@dataclass
+class Shortcode:
+    """A parsed shortcode with its arguments and, for paired shortcodes, its children"""
+
+    name: str
+    args: list[str]
+    opening: str
+    closing: str = ''
+    children: list['Node'] = field(default_factory=list)
+
+
+Node = str | Shortcode
+Handler = Callable[[Shortcode, 'ShortcodeRenderer'], str]
+
+
+@dataclass(frozen=True)
+class ShortcodeSpec:
+    """How a registered shortcode is rendered and whether it needs a closing tag"""
+
+    handler: Handler
+    paired: bool = True
+
+
+SHORTCODES: dict[str, ShortcodeSpec] = {}
+
+
+def register(name: str, paired: bool = True) -> Callable[[Handler], Handler]:
+    """Register a shortcode handler under name"""
+    def decorator(handler: Handler) -> Handler:
+        SHORTCODES[name] = ShortcodeSpec(handler, paired)
+        return handler
+    return decorator
+
+
+def source(node: Node) -> str:
+    """Original markdown text of a node"""
+    if isinstance(node, str):
+        return node
+    return node.opening + ''.join(source(child) for child in node.children) + node.closing
+
+
+def parse(text: str, registry: dict[str, ShortcodeSpec] = SHORTCODES) -> list[Node]:
+    """Tokenize text into plain strings and nested shortcode nodes in a single pass
+
+    Unknown shortcodes, stray closing tags and blocks that are never closed are
+    kept as plain text, so malformed input renders as written instead of failing.
+    """
+    root = Shortcode('', [], '')
+    stack = [root]
+    open_counts: dict[str, int] = {}
+    position = 0
+
+    for match in SHORTCODE_RE.finditer(text):
+        if match.start() > position:
+            stack[-1].children.append(text[position:match.start()])
+        position = match.end()
+
+        is_closing, name, raw_args = match.group(1), match.group(2), match.group(3)
+        spec = registry.get(name)
+        if spec is None or (is_closing and not open_counts.get(name)):
+            # Unknown shortcode or a closing tag with nothing open to close
+            stack[-1].children.append(match.group(0))
+        elif is_closing:
+            depth = next(i for i in range(len(stack) - 1, 0, -1) if stack[i].name == name)
+            # Any blocks opened inside this one but never closed fall back to text
+            _unwind(stack, depth + 1, open_counts)
+            node = stack.pop()
+            open_counts[name] -= 1
+            node.closing = match.group(0)
+            stack[-1].children.append(node)
+        else:
+            node = Shortcode(name, ARG_RE.findall(raw_args), match.group(0))
+            if spec.paired:
+                stack.append(node)
+                open_counts[name] = open_counts.get(name, 0) + 1
+            else:
+                stack[-1].children.append(node)
+
+    if position < len(text):
+        stack[-1].children.append(text[position:])
+    _unwind(stack, 1, open_counts)
+    return root.children
+
+
+def _unwind(stack: list[Shortcode], depth: int, open_counts: dict[str, int]) -> None:
+    """Turn every unterminated block from depth upwards back into text, in one pass"""
+    if depth >= len(stack):
+        return
+    parent = stack[depth - 1]
+    for node in stack[depth:]:
+        parent.children.append(node.opening)
+        parent.children.extend(node.children)
+        open_counts[node.name] -= 1
+    del stack[depth:]
+
+
+class ShortcodeRenderer:
+    """Render parsed shortcodes, converting nested markdown with the given function"""
+
+    def __init__(self, convert_markdown: Callable[[str], str],
+                 registry: dict[str, ShortcodeSpec] = SHORTCODES):
+        self.convert_markdown = convert_markdown
+        self.registry = registry
+
+    def render(self, text: str) -> str:
+        """Replace every shortcode in text with its HTML"""
+        return self.render_nodes(parse(text, self.registry))
+
+    def render_nodes(self, nodes: list[Node]) -> str:
+        """Render a list of nodes, leaving plain text untouched"""
+        parts = []
+        for node in nodes:
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                parts.append(self.registry[node.name].handler(node, self))
+        return ''.join(parts)
+
+    def render_markdown(self, nodes: list[Node]) -> str:
+        """Render nested shortcodes, then convert the surrounding markdown to HTML"""
+        return self.convert_markdown(self.render_nodes(nodes).strip())
+
+
+@register('tabs')
+def render_tabs(node: Shortcode, renderer: ShortcodeRenderer) -> str:
+    """Convert a tabs block with {{< tab "Title" "id" >}} children to tab HTML"""
+    tabs = [child for child in node.children if isinstance(child, Shortcode) and child.name == 'tab']
+    if not tabs:
+        return source(node)  # Return original if no tabs found
+
+    # Generate tab container HTML
+    html_parts = ['<div class="tab-container">']
+
+    # Tab buttons
+    for i, tab in enumerate(tabs):
+        title, tab_id = (tab.args + ['', ''])[:2]
+        active_class = ' active' if i == 0 else ''
+        html_parts.append(f'<button class="tab-button{active_class}" data-tab="{html.escape(tab_id)}">{html.escape(title)}</button>')
+
+    html_parts.append('</div>')
+
+    # Tab content
+    for i, tab in enumerate(tabs):
+        tab_id = (tab.args + ['', ''])[1]
+        display_style = 'block' if i == 0 else 'none'
+        html_parts.append(f'<div class="tab-content" id="{html.escape(tab_id)}" style="display: {display_style};">')
+        html_parts.append(renderer.render_markdown(tab.children))
+        html_parts.append('</div>')
+
+    return '\n'.join(html_parts)
+
+
+@register('tab')
+def render_tab(node: Shortcode, renderer: ShortcodeRenderer) -> str:
+    """A tab outside of a tabs block has nothing to attach to, so keep it as written"""
+    return source(node)
+
+
+@register('callout')
+def render_callout(node: Shortcode, renderer: ShortcodeRenderer) -> str:
+    """Convert {{< callout "kind" "Optional title" >}} blocks to a styled callout box"""
+    kind = node.args[0] if node.args else 'note'
+    html_parts = [f'<div class="callout callout-{html.escape(kind)}">']
+    if len(node.args) > 1:
+        html_parts.append(f'<p class="callout-title">{html.escape(node.args[1])}</p>')
+    html_parts.append(renderer.render_markdown(node.children))
+    html_parts.append('</div>')
+    return '\n'.join(html_parts)
+
+
+@register('figure', paired=False)
+def render_figure(node: Shortcode, renderer: ShortcodeRenderer) -> str:
+    """Convert {{< figure "src" "alt" "Optional caption" >}} to a captioned chart figure"""
+    src, alt, caption = (node.args + ['', '', ''])[:3]
+    html_parts = [
+        '<figure class="chart-wrapper">',
+        f'<img src="{html.escape(src)}" alt="{html.escape(alt)}" loading="lazy" />',
+    ]
+    if caption:
+        html_parts.append(f'<figcaption>{html.escape(caption)}</figcaption>')
+    html_parts.append('</figure>')
+    return '\n'.join(html_parts)
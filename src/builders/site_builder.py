@@ -4,20 +4,51 @@ Main site builder for AI Safety website
 Handles markdown processing, plot generation, and HTML output
 """
 
-import os
+import argparse
 import shutil
 from pathlib import Path
-
-from .icon_generator import generate_all_icons
+from typing import Any
+
+from . import (
+    assets,
+    icon_generator,
+    image_formats,
+    markdown_processor,
+    svg_icons,
+    template_engine,
+)
+from .assets import AssetPipeline
+from .build_manifest import BuildManifest, BuildTarget
+from .figures import FigureJob, render_figures
+from .icon_generator import icon_jobs
+from .image_formats import ImageFormats
+from .image_optimizer import ImageOptimizer
 from .markdown_processor import MarkdownProcessor
-from .plot_generator import generate_all_plots
+from .page_renderer import PageBuildError, render_pages
+from .plot_generator import plot_jobs
+from .precompress import Precompressor
+from .profiling import BuildProfiler, Stopwatch
+from .render_cache import RenderCache
+from .search_index import SearchDocument, SearchIndex
+from .site_index import SiteIndex
+from .svg_icons import SPRITE_NAME, write_sprite
 from .template_engine import TemplateEngine
 
+# Navigation icons as one hand-written SVG sprite, or as matplotlib PNGs
+ICON_BACKENDS = ('svg', 'png')
+
 
 class SiteBuilder:
     """Build the complete website from markdown sources"""
 
-    def __init__(self, project_root: str = "."):
+    def __init__(self,
+                 project_root: str = ".",
+                 incremental: bool = False,
+                 workers: int | None = None,
+                 use_cache: bool = True,
+                 profile: bool = False,
+                 precompile_templates: bool = False,
+                 icon_backend: str = 'svg'):
         self.project_root = Path(project_root)
         self.src_dir = self.project_root / "src"
         self.content_dir = self.src_dir / "content"
@@ -25,10 +56,55 @@ class SiteBuilder:
         self.static_dir = self.src_dir / "static"
         self.data_dir = self.src_dir / "data"
         self.output_dir = self.project_root / "docs"
+        self.cache_dir = self.project_root / ".build_cache"
+        self.report_path = self.project_root / "build-report.json"
+        self.profile_dir = self.project_root / "build-profiles" if profile else None
+
+        # Incremental builds keep docs/ and only regenerate outputs whose inputs changed
+        self.incremental = incremental
+        self.manifest = BuildManifest(self.cache_dir / "manifest.json")
+
+        # Worker processes for CPU-bound stages; None uses every available CPU
+        self.workers = workers
+
+        # Rendered figures are reused across builds when data, style and code are unchanged
+        self.render_cache = RenderCache(self.cache_dir / "renders") if use_cache else None
+
+        # Optimized PNGs keyed by the hash of the rendered file, so restored renders skip re-encoding
+        self.optimized_images_dir = self.cache_dir / "optimized-images" if use_cache else None
+
+        # Compiled templates are kept on disk so pages skip lexing and compiling Jinja2 source
+        self.template_cache_dir = self.cache_dir / "templates" if use_cache else None
+        self.precompile_templates = precompile_templates
+        self.template_cache_hits = 0
+        self.template_cache_misses = 0
+
+        # The SVG backend draws every navigation icon into one sprite without matplotlib
+        if icon_backend not in ICON_BACKENDS:
+            raise ValueError(f"Unknown icon backend {icon_backend!r}, expected one of {ICON_BACKENDS}")
+        self.icon_backend = icon_backend
+        self.icon_sprite = f"images/{SPRITE_NAME}" if icon_backend == 'svg' else None
+
+        # Page titles and navigation read from frontmatter alone, cached between builds
+        self.site_index = SiteIndex(self.content_dir, self.cache_dir / "site-index.json")
+        self.navigation_path = self.cache_dir / "navigation.json"
+
+        # Content-hashed copies of CSS, JS and images; pages depend on the map of them
+        self.assets_path = self.cache_dir / "assets.json"
+        self.assets: dict[str, str] = {}
+
+        # Client-side search index, re-tokenizing only pages whose HTML changed
+        self.search_cache_path = self.cache_dir / "search-terms.json"
+
+        # Compressed siblings of text outputs, recompressed only when a file's content changes
+        self.precompress_cache_path = self.cache_dir / "precompress.json"
+
+        # Per-stage and per-output timings, written next to docs/ after every build
+        self.profiler = BuildProfiler(self.profile_dir)
 
         # Initialize processors
         self.markdown_processor = MarkdownProcessor()
-        self.template_engine = TemplateEngine(str(self.templates_dir))
+        self.template_engine = TemplateEngine(str(self.templates_dir), cache_dir=self.template_cache_dir)
 
     def clean_output(self) -> None:
         """Clean the output directory"""
@@ -36,72 +112,245 @@ class SiteBuilder:
             shutil.rmtree(self.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def copy_static_assets(self) -> None:
+    def index_pages(self) -> bool:
+        """Rescan page frontmatter and record the navigation, returning whether the navigation changed"""
+        self.site_index.refresh()
+        return self.site_index.write_navigation(self.navigation_path)
+
+    def figure_jobs(self) -> list[tuple[str, FigureJob]]:
+        """All icon and plot jobs, rendering straight into the output images directory"""
+        images_dir = str(self.output_dir / "images")
+        return (
+            [('icon', job) for job in icon_jobs(images_dir) if self.icon_backend == 'png']
+            + [('plot', job) for job in plot_jobs(str(self.data_dir), images_dir, str(self.cache_dir / "data"))]
+        )
+
+    def image_formats(self) -> dict[str, ImageFormats]:
+        """Variants written for each generated figure, keyed by the src pages use for it"""
+        return {f"images/{job.output}": job.formats for _, job in self.figure_jobs()}
+
+    def collect_targets(self) -> list[BuildTarget]:
+        """List every output of the build together with the files it depends on"""
+        figure_jobs = self.figure_jobs()
+        targets = [
+            BuildTarget(f"images/{path.name}", kind, job.inputs + (job.source_file, Path(image_formats.__file__)))
+            for kind, job in figure_jobs
+            for path in job.paths
+        ]
+        if self.icon_sprite is not None:
+            targets.append(BuildTarget(
+                self.icon_sprite, 'icon', (Path(svg_icons.__file__), Path(icon_generator.__file__))
+            ))
+        generated = {target.output for target in targets}
+
+        # Static files that a generated figure would overwrite are owned by the figure
+        if self.static_dir.exists():
+            for item in sorted(self.static_dir.rglob("*")):
+                output = item.relative_to(self.static_dir).as_posix()
+                if item.is_file() and output not in generated:
+                    targets.append(BuildTarget(output, 'static', (item,)))
+
+        # Every page depends on its own source, all templates, the navigation, the asset
+        # map, the page builders and the figure modules that decide which image variants
+        # pages can use
+        page_inputs = tuple(sorted(self.templates_dir.rglob("*.html"))) + (
+            self.navigation_path,
+            self.assets_path,
+            Path(assets.__file__),
+            Path(markdown_processor.__file__),
+            Path(template_engine.__file__),
+            Path(image_formats.__file__),
+        ) + tuple(sorted({job.source_file for _, job in figure_jobs}))
+        for md_file in sorted(self.content_dir.glob("*.md")):
+            targets.append(BuildTarget(f"{md_file.stem}.html", 'page', (md_file,) + page_inputs))
+
+        return targets
+
+    def remove_orphans(self, targets: list[BuildTarget]) -> None:
+        """Delete outputs of a previous build that no current source produces"""
+        for output in self.manifest.orphans(targets):
+            print(f"🗑️  Removing orphaned {output}")
+            (self.output_dir / output).unlink(missing_ok=True)
+            self.manifest.forget(output)
+
+    def copy_static_assets(self, targets: list[BuildTarget] | None = None) -> None:
         """Copy static files (CSS, JS, images) to output"""
+        if targets is None:
+            targets = [t for t in self.collect_targets() if t.kind == 'static']
+        if not targets:
+            return
+
         print("📁 Copying static assets...")
 
-        # Copy all files from static directory
-        if self.static_dir.exists():
-            for item in self.static_dir.iterdir():
-                if item.is_file():
-                    shutil.copy2(item, self.output_dir)
-                elif item.is_dir():
-                    shutil.copytree(item, self.output_dir / item.name, dirs_exist_ok=True)
+        for target in targets:
+            with Stopwatch() as stopwatch:
+                destination = self.output_dir / target.output
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                # Never write through an existing file, which may be hard-linked elsewhere
+                destination.unlink(missing_ok=True)
+                shutil.copy2(target.inputs[0], destination)
+            self.profiler.record_output('static', target.output, stopwatch.timing)
 
-    def generate_plots(self) -> None:
+    def generate_plots(self, targets: list[BuildTarget] | None = None) -> None:
         """Generate all plots and icons"""
-        print("🎨 Generating navigation icons...")
-
-        # Store current directory and change to project root for consistent paths
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(str(self.project_root))
-
-            # Ensure output images directory exists
-            images_dir = self.output_dir / "images"
-            images_dir.mkdir(exist_ok=True)
-
-            # Generate icons and plots
-            generate_all_icons()
-            print("📊 Generating plots...")
-            generate_all_plots(
-                data_dir=str(self.data_dir),
-                output_dir=str(images_dir)
+        jobs = self.figure_jobs()
+        if targets is not None:
+            outputs = {target.output for target in targets}
+            jobs = [
+                (kind, job) for kind, job in jobs
+                if any(f"images/{path.name}" in outputs for path in job.paths)
+            ]
+
+        # Ensure output images directory exists
+        images_dir = self.output_dir / "images"
+        images_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.icon_sprite is not None and (targets is None or self.icon_sprite in outputs):
+            print("🖌️  Drawing navigation icon sprite...")
+            with Stopwatch() as stopwatch:
+                write_sprite(self.output_dir / self.icon_sprite)
+            self.profiler.record_output('figures', self.icon_sprite, stopwatch.timing, kind='icon')
+
+        if not jobs:
+            return
+
+        # Icons and plots are independent, so they share a single worker pool
+        print(f"🎨 Generating {len(jobs)} navigation icons and plots...")
+        results = render_figures([job for _, job in jobs], self.workers, self.render_cache)
+        for (kind, _), result in zip(jobs, results, strict=True):
+            self.profiler.record_output(
+                'figures', f"images/{result.output}", result.timing, kind=kind, cached=result.cached
             )
-        finally:
-            os.chdir(original_cwd)
 
-    def process_markdown_files(self) -> None:
+    def optimize_images(self, targets: list[BuildTarget]) -> None:
+        """Re-encode freshly generated PNGs as small as they go without visible loss"""
+        images = [(t.output, self.output_dir / t.output) for t in targets if t.output.endswith('.png')]
+        if not images:
+            return
+
+        print(f"🪶 Optimizing {len(images)} generated PNGs...")
+        results = ImageOptimizer(self.optimized_images_dir, self.workers).run(images)
+        for result in results:
+            if result.timing is not None:
+                self.profiler.record_output('optimize', result.output, result.timing, method=result.method)
+        before = sum(result.before for result in results)
+        after = sum(result.after for result in results)
+        cached = sum(result.cached for result in results)
+        print(f"   {before / 1024:.0f} KB → {after / 1024:.0f} KB ({cached} cached)")
+        self.profiler.add_section('image_optimization', {
+            'bytes_before': before,
+            'bytes_after': after,
+            'bytes_saved': before - after,
+            'images': {
+                result.output: {
+                    'before': result.before,
+                    'after': result.after,
+                    'saved': result.saved,
+                    'method': result.method,
+                    'cached': result.cached,
+                }
+                for result in results
+            },
+        })
+
+    def process_markdown_files(self, targets: list[BuildTarget] | None = None) -> None:
         """Process all markdown files and generate HTML"""
-        print("📝 Processing markdown files...")
-
-        # Get all markdown files
-        md_files = list(self.content_dir.glob("*.md"))
-
-        for md_file in md_files:
-            print(f"   Processing {md_file.name}...")
-
-            # Read and process markdown
-            with open(md_file, encoding='utf-8') as f:
-                content = f.read()
+        if targets is None:
+            md_files = list(self.content_dir.glob("*.md"))
+        else:
+            md_files = [target.inputs[0] for target in targets]
+        if not md_files:
+            return
 
-            frontmatter, html_content = self.markdown_processor.convert(content)
-
-            # Determine output filename and template
-            page_name = md_file.stem
-            output_file = self.output_dir / f"{page_name}.html"
+        print("📝 Processing markdown files...")
 
-            # Render appropriate template
-            if page_name == 'index':
-                html_output = self.template_engine.render_index(html_content, frontmatter)
-            else:
-                html_output = self.template_engine.render_content_page(
-                    html_content, frontmatter, page_name
-                )
+        cache_dir = str(self.template_cache_dir) if self.template_cache_dir is not None else None
+        if self.precompile_templates and self.template_engine.bytecode_cache is not None:
+            # Compile once up front so no worker has to compile on its first page
+            cache = self.template_engine.bytecode_cache
+            hits, misses = cache.hits, cache.misses
+            count = self.template_engine.precompile()
+            self.template_cache_hits += cache.hits - hits
+            self.template_cache_misses += cache.misses - misses
+            print(f"   Precompiled {count} templates")
+
+        # Collect per-page failures so one bad page does not hide the others
+        failures = []
+        navigation = self.site_index.navigation()
+        for result in render_pages(md_files, str(self.templates_dir), self.workers,
+                                   self.image_formats(), cache_dir, navigation, self.assets,
+                                   self.icon_sprite):
+            self.template_cache_hits += result.template_cache_hits
+            self.template_cache_misses += result.template_cache_misses
+            if result.html is None:
+                print(f"   ❌ {result.source.name}: {result.error}")
+                failures.append(result)
+                continue
+
+            print(f"   Processing {result.source.name}...")
+            if result.timing is not None:
+                self.profiler.record_output('pages', result.output, result.timing)
 
             # Write output file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_output)
+            with open(self.output_dir / result.output, 'w', encoding='utf-8') as f:
+                f.write(result.html)
+
+        if self.template_cache_dir is not None:
+            print(f"   Template cache: {self.template_cache_hits} hits, {self.template_cache_misses} misses")
+
+        if failures:
+            raise PageBuildError(failures)
+
+    def fingerprint_assets(self, targets: list[BuildTarget]) -> bool:
+        """Copy every static file and figure to a content-hashed name, returning whether any name changed"""
+        pipeline = AssetPipeline(self.output_dir, self.assets_path)
+        manifest, changed = pipeline.run([t.output for t in targets if t.kind in ('static', 'icon', 'plot')])
+        self.assets = manifest.assets
+        self.manifest.invalidate(self.assets_path)
+        print(f"🔖 Fingerprinted {len(self.assets)} assets ({len(pipeline.written)} new)")
+        self.profiler.add_section('assets', {'assets': len(self.assets), 'written': len(pipeline.written)})
+        return changed
+
+    def build_search_index(self) -> None:
+        """Index the text of every rendered page for client-side search"""
+        documents = [
+            SearchDocument(page.url, page.title, self.output_dir / page.url)
+            for page in self.site_index.pages.values()
+            if (self.output_dir / page.url).is_file()
+        ]
+        if not documents:
+            return
+
+        index = SearchIndex(self.output_dir, self.search_cache_path)
+        stats = index.build(documents)
+        print(f"🔎 Search index: {stats['documents']} pages, {stats['terms']} terms in {stats['shards']} shards "
+              f"(tokenized {index.tokenized}, wrote {len(index.written)} files)")
+        self.profiler.add_section('search_index', {
+            **stats,
+            'tokenized': index.tokenized,
+            'reused': index.reused,
+            'written': len(index.written),
+        })
+
+    def precompress_outputs(self) -> None:
+        """Write .gz (and .zst when available) siblings of every text file in docs/"""
+        compressor = Precompressor(self.output_dir, self.precompress_cache_path, self.workers)
+        results = compressor.run()
+        compressed = [result for result in results if not result.skipped]
+        original = sum(result.size for result in results)
+        gzipped = sum(result.variants.get('.gz', result.size) for result in results)
+        print(f"🗜️  Precompressed {len(compressed)} of {len(results)} text files "
+              f"({', '.join(compressor.codecs)}): {original / 1024:.0f} KB → {gzipped / 1024:.0f} KB gzip")
+        self.profiler.add_section('precompress', {
+            'files': len(results),
+            'compressed': len(compressed),
+            'codecs': sorted(compressor.codecs),
+            'bytes': original,
+            **{
+                f'{suffix.lstrip(".")}_bytes': sum(result.variants.get(suffix, result.size) for result in results)
+                for suffix in compressor.codecs
+            },
+        })
 
     def create_page_sections(self, html_content: str) -> str:
         """Wrap content sections in proper HTML structure"""
@@ -136,37 +385,199 @@ class SiteBuilder:
 
         return '\n'.join(result)
 
+    def build_targets(self, stale: list[BuildTarget], targets: list[BuildTarget] | None = None) -> None:
+        """Run every build stage for the stale targets and record them in the manifest
+
+        targets is every output of the build, all of which are fingerprinted; it
+        defaults to the stale targets.
+        """
+        targets = stale if targets is None else targets
+        self.template_cache_hits = self.template_cache_misses = 0
+
+        # Copy static assets first
+        with self.profiler.stage('static'):
+            self.copy_static_assets([t for t in stale if t.kind == 'static'])
+
+        # Generate plots
+        with self.profiler.stage('figures'):
+            self.generate_plots([t for t in stale if t.kind in ('icon', 'plot')])
+
+        # Before fingerprinting, so hashed names are taken from the optimized bytes
+        with self.profiler.stage('optimize'):
+            self.optimize_images([t for t in stale if t.kind in ('icon', 'plot')])
+
+        # Pages link to the fingerprinted names, so a renamed asset makes every page stale
+        with self.profiler.stage('assets'):
+            if self.fingerprint_assets(targets):
+                stale = stale + [t for t in targets if t.kind == 'page' and t not in stale]
+
+        # Process markdown and generate HTML
+        with self.profiler.stage('pages'):
+            self.process_markdown_files([t for t in stale if t.kind == 'page'])
+
+        # Search covers every page, so it is refreshed on every build; unchanged pages cost a stat
+        with self.profiler.stage('search'):
+            self.build_search_index()
+
+        # Last, so every text file written above gets up-to-date compressed siblings
+        with self.profiler.stage('compress'):
+            self.precompress_outputs()
+
+        # Only remember outputs once they were all written successfully
+        for target in stale:
+            self.manifest.record(target)
+        self.manifest.save()
+
+    def write_report(self) -> None:
+        """Write the build report next to docs/"""
+        if self.render_cache is not None:
+            self.profiler.add_section('render_cache', {
+                'hits': self.render_cache.hits,
+                'misses': self.render_cache.misses,
+            })
+        if self.template_cache_dir is not None:
+            self.profiler.add_section('template_cache', {
+                'hits': self.template_cache_hits,
+                'misses': self.template_cache_misses,
+            })
+        self.profiler.write_report(self.report_path)
+
+    def affected_targets(self, targets: list[BuildTarget], changed: set[Path]) -> list[BuildTarget]:
+        """Targets that read any of the changed files, plus targets never built before"""
+        changed = {path.resolve() for path in changed}
+        return [
+            target for target in targets
+            if target.output not in self.manifest.entries
+            or any(path.resolve() in changed for path in target.inputs)
+        ]
+
+    def rebuild(self, changed: set[Path]) -> list[BuildTarget]:
+        """Regenerate only the outputs affected by a set of changed source files"""
+        self.profiler = BuildProfiler(self.profile_dir)
+        self.manifest = BuildManifest.load(self.cache_dir / "manifest.json")
+        with self.profiler.stage('plan'):
+            if self.index_pages():
+                # Every page shows the navigation, so a nav change touches them all
+                changed = changed | {self.navigation_path}
+            targets = self.collect_targets()
+            self.remove_orphans(targets)
+            affected = self.affected_targets(targets, changed)
+
+        self.build_targets(affected, targets)
+        self.write_report()
+        return affected
+
     def build(self) -> None:
         """Build the complete website"""
         print("🚀 Building AI Safety Website...")
         print("=" * 50)
 
-        # Clean and prepare output directory
-        self.clean_output()
+        self.profiler = BuildProfiler(self.profile_dir)
+        self.manifest = BuildManifest.load(self.cache_dir / "manifest.json")
 
-        # Copy static assets first
-        self.copy_static_assets()
+        with self.profiler.stage('plan'):
+            self.index_pages()
+            targets = self.collect_targets()
 
-        # Generate plots
-        self.generate_plots()
+            if self.incremental and self.output_dir.exists():
+                # Keep previous outputs and only rebuild what changed
+                self.remove_orphans(targets)
+                stale = [t for t in targets if not self.manifest.is_fresh(t, self.output_dir)]
+                print(f"♻️  Incremental build: {len(stale)} of {len(targets)} outputs changed")
+            else:
+                # Clean and prepare output directory
+                self.clean_output()
+                self.manifest.clear()
+                stale = targets
 
-        # Process markdown and generate HTML
-        self.process_markdown_files()
+        self.build_targets(stale, targets)
+        self.write_report()
+        self.profiler.print_summary()
 
         print("\n✅ Website build complete!")
         print(f"📁 Output directory: {self.output_dir}")
         print("🌐 Ready for deployment to GitHub Pages")
 
 
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line options shared by build.py and the build-website entry point"""
+    parser = argparse.ArgumentParser(description="Build the AI Safety website")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="keep docs/ and only regenerate outputs whose inputs changed",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="worker processes for rendering (default: one per CPU, 1 disables the pool)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always re-render figures and recompile templates instead of reusing caches",
+    )
+    parser.add_argument(
+        "--precompile-templates",
+        action="store_true",
+        help="compile every template into the bytecode cache before rendering pages",
+    )
+    parser.add_argument(
+        "--icon-backend",
+        choices=ICON_BACKENDS,
+        default='svg',
+        help="draw navigation icons as one SVG sprite, or as PNGs with matplotlib (default: svg)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="serve docs/ locally and rebuild affected outputs whenever sources change",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="port for the --watch development server (default: 8000)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="also write a cProfile dump per build stage to build-profiles/",
+    )
+    return parser
+
+
+def builder_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Translate parsed command line options into SiteBuilder keyword arguments"""
+    return {
+        'incremental': args.incremental,
+        'workers': args.workers,
+        'use_cache': not args.no_cache,
+        'profile': args.profile,
+        'precompile_templates': args.precompile_templates,
+        'icon_backend': args.icon_backend,
+    }
+
+
+def run_builder(builder: SiteBuilder, args: argparse.Namespace) -> None:
+    """Run a one-off build, or keep serving and rebuilding docs/ in watch mode"""
+    if args.watch:
+        from .dev_server import watch
+        watch(builder, port=args.port)
+    else:
+        builder.build()
+
+
 def main() -> None:
     """Main entry point for the build script"""
-    import sys
-
-    # Get project root from command line or use current directory
-    project_root = sys.argv[1] if len(sys.argv) > 1 else "."
+    parser = build_arg_parser()
+    parser.add_argument("project_root", nargs="?", default=".", help="project root directory")
+    args = parser.parse_args()
 
-    builder = SiteBuilder(project_root)
-    builder.build()
+    builder = SiteBuilder(args.project_root, **builder_options(args))
+    run_builder(builder, args)
 
 
 if __name__ == "__main__":
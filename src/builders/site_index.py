@@ -0,0 +1,176 @@
+"""
+Site index for AI Safety website
+Reads only the frontmatter of each page, so titles and navigation are known before any markdown is converted
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# libyaml's loader is several times faster; fall back to the pure Python one without it
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Bump when the cached page fields change so stale caches are ignored
+SITE_INDEX_VERSION = 1
+
+# Frontmatter values of `nav` that put a page in the navigation bar
+NAV_MAIN = 'main'
+NAV_ACTION = 'action'
+
+
+def read_frontmatter(path: Path) -> dict[str, Any]:
+    """YAML frontmatter of a markdown file, reading no further than its closing ---"""
+    # Work in bytes so only the header is decoded, however large or malformed the body is
+    lines = []
+    with open(path, 'rb') as f:
+        if f.readline().rstrip() != b'---':
+            return {}
+        for line in f:
+            if line.rstrip() == b'---':
+                break
+            lines.append(line)
+        else:
+            # Never closed, so there is no frontmatter
+            return {}
+
+    try:
+        frontmatter = yaml.load(b''.join(lines).decode('utf-8'), Loader=YamlLoader)
+    except yaml.YAMLError:
+        return {}
+    return frontmatter if isinstance(frontmatter, dict) else {}
+
+
+@dataclass(frozen=True)
+class PageInfo:
+    """What the rest of the build needs to know about a page without converting it"""
+
+    name: str
+    title: str
+    tagline: str = ''
+    description: str = ''
+    nav: str | None = None
+    nav_order: int = 0
+    nav_title: str | None = None
+    nav_icon: str | None = None
+
+    @classmethod
+    def from_frontmatter(cls, name: str, frontmatter: dict[str, Any]) -> 'PageInfo':
+        """Page info from a parsed frontmatter block, with missing fields left at their defaults"""
+
+        def text(key: str) -> str | None:
+            value = frontmatter.get(key)
+            return None if value is None else str(value)
+
+        nav_order = frontmatter.get('nav_order', 0)
+        try:
+            nav_order = int(nav_order)
+        except (TypeError, ValueError):
+            print(f"   ⚠️  {name}.md: nav_order {nav_order!r} is not a number, using 0")
+            nav_order = 0
+
+        return cls(
+            name=name,
+            title=text('title') or name,
+            tagline=text('tagline') or '',
+            description=text('description') or '',
+            nav=text('nav'),
+            nav_order=nav_order,
+            nav_title=text('nav_title'),
+            nav_icon=text('nav_icon'),
+        )
+
+    @property
+    def url(self) -> str:
+        """Output filename relative to the site root"""
+        return f'{self.name}.html'
+
+    def nav_entry(self) -> dict[str, Any]:
+        """The page as a navigation button"""
+        return {'name': self.name, 'url': self.url, 'title': self.nav_title or self.title, 'icon': self.nav_icon}
+
+
+class SiteIndex:
+    """Frontmatter of every page in a content directory, cached between builds
+
+    The cache records each file's modification time and size, so a build only
+    reads the headers of pages that changed since the last one.
+    """
+
+    def __init__(self, content_dir: str | Path, cache_path: str | Path | None = None):
+        self.content_dir = Path(content_dir)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.pages: dict[str, PageInfo] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load_cache(self) -> dict[str, Any]:
+        """Cached entries keyed by filename, or nothing if the cache is missing or outdated"""
+        if self.cache_path is None:
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        return data.get('pages', {}) if data.get('version') == SITE_INDEX_VERSION else {}
+
+    def _save_cache(self, entries: dict[str, Any]) -> None:
+        """Write the cache atomically"""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'version': SITE_INDEX_VERSION, 'pages': entries}, indent=2), encoding='utf-8')
+        tmp_path.replace(self.cache_path)
+
+    def refresh(self) -> dict[str, PageInfo]:
+        """Rescan the content directory, rereading only the frontmatter of changed pages"""
+        cached = self._load_cache()
+        entries: dict[str, Any] = {}
+        pages: dict[str, PageInfo] = {}
+        for path in sorted(self.content_dir.glob('*.md')):
+            stat = path.stat()
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(path.name)
+            if entry is not None and entry['signature'] == signature:
+                page = PageInfo(**entry['page'])
+                self.hits += 1
+            else:
+                page = PageInfo.from_frontmatter(path.stem, read_frontmatter(path))
+                self.misses += 1
+            entries[path.name] = {'signature': signature, 'page': asdict(page)}
+            pages[page.name] = page
+
+        if entries != cached:
+            self._save_cache(entries)
+        self.pages = pages
+        return pages
+
+    def navigation(self) -> dict[str, Any]:
+        """Navigation buttons in nav_order, and the call-to-action button if a page declares one"""
+        if not self.pages:
+            self.refresh()
+        ordered = sorted(self.pages.values(), key=lambda page: (page.nav_order, page.name))
+        actions = [page.nav_entry() for page in ordered if page.nav == NAV_ACTION]
+        return {
+            'pages': [page.nav_entry() for page in ordered if page.nav == NAV_MAIN],
+            'action_page': actions[0] if actions else None,
+        }
+
+    def write_navigation(self, path: Path) -> bool:
+        """Write the navigation as JSON for pages to depend on, returning whether it changed
+
+        The file is only rewritten when the navigation changes, so editing a page's
+        body or any frontmatter field outside the nav leaves other pages untouched.
+        """
+        text = json.dumps(self.navigation(), indent=2, sort_keys=True)
+        try:
+            if path.read_text(encoding='utf-8') == text:
+                return False
+        except OSError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+        return True
@@ -0,0 +1,100 @@
+"""
+Streaming ingestion for AI Safety website plots
+Reads large price histories in fixed-size chunks and keeps only per-period aggregates
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from .data_catalog import Schema, SchemaError
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Rows parsed per chunk. At ~50 bytes per row this keeps each chunk's
+# parsed columns and date strings to a few tens of megabytes.
+DEFAULT_CHUNK_ROWS = 200_000
+
+# How each per-period field is combined, first within a chunk and then across chunks
+OHLC_REDUCERS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'}
+
+
+@dataclass(frozen=True)
+class PriceAggregates:
+    """Compact per-period summary of a price history, as plain arrays ready to plot"""
+
+    periods: 'NDArray[np.datetime64]'
+    ohlc: dict[str, 'NDArray[np.float64]']
+    rows: int
+
+    def close(self, column: str) -> 'NDArray[np.float64]':
+        """Last price of each period"""
+        return self.ohlc[column][:, 3]
+
+    def rolling_bands(self, column: str, window: int = 20,
+                      num_std: float = 2.0) -> tuple['NDArray[np.float64]', ...]:
+        """Rolling mean of the closes with bands num_std standard deviations either side"""
+        closes = pd.Series(self.close(column))
+        rolling = closes.rolling(window, min_periods=1)
+        mean = rolling.mean()
+        spread = rolling.std(ddof=0) * num_std
+        return mean.to_numpy(), (mean - spread).to_numpy(), (mean + spread).to_numpy()
+
+
+def iter_csv_chunks(path: Path, schema: Schema, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Parse a CSV in chunks of at most chunk_rows rows, checked against its schema"""
+    dtypes = {name: dtype for name, dtype in schema.columns.items() if name not in schema.date_columns}
+    with pd.read_csv(path, dtype=dtypes, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            if list(chunk.columns) != list(schema.columns):
+                raise SchemaError(f"{path.name}: expected columns {list(schema.columns)}, found {list(chunk.columns)}")
+            for name in schema.date_columns:
+                chunk[name] = pd.to_datetime(chunk[name], format='ISO8601')
+            yield chunk
+
+
+def aggregate(chunks: Iterable[pd.DataFrame], schema: Schema, freq: str = 'D') -> PriceAggregates:
+    """Reduce time-ordered chunks of a price history to open, high, low and close per period
+
+    Only the per-period results of each chunk are kept, so memory grows with the
+    number of periods rather than the number of rows. A period split across two
+    chunks is merged when the partial results are combined at the end.
+    """
+    if len(schema.date_columns) != 1:
+        raise SchemaError("Price aggregation needs exactly one date column")
+    time_column = schema.date_columns[0]
+    value_columns = [name for name in schema.columns if name != time_column]
+
+    partials: dict[str, list[pd.DataFrame]] = {field: [] for field in OHLC_REDUCERS}
+    rows = 0
+    for chunk in chunks:
+        rows += len(chunk)
+        grouped = chunk[value_columns].groupby(chunk[time_column].dt.to_period(freq), sort=True)
+        for field, reducer in OHLC_REDUCERS.items():
+            partials[field].append(getattr(grouped, reducer)())
+
+    if rows == 0:
+        empty = np.empty((0, len(OHLC_REDUCERS)))
+        return PriceAggregates(np.array([], dtype='datetime64[ns]'), dict.fromkeys(value_columns, empty), 0)
+
+    combined = {
+        field: pd.concat(parts).groupby(level=0, sort=True).agg(reducer)
+        for (field, reducer), parts in zip(OHLC_REDUCERS.items(), partials.values(), strict=True)
+    }
+    periods = pd.PeriodIndex(combined['close'].index).start_time.to_numpy()
+    ohlc = {
+        column: np.column_stack([combined[field][column].to_numpy(dtype=np.float64) for field in OHLC_REDUCERS])
+        for column in value_columns
+    }
+    return PriceAggregates(periods, ohlc, rows)
+
+
+def stream_price_history(path: Path, schema: Schema, freq: str = 'D',
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS) -> PriceAggregates:
+    """Per-period aggregates of a CSV price history, read with bounded memory"""
+    return aggregate(iter_csv_chunks(path, schema, chunk_rows), schema, freq)
@@ -0,0 +1,196 @@
+"""
+Vector navigation icons for AI Safety website
+Draws the navigation icons directly as SVG shapes and combines them into one sprite, without matplotlib
+"""
+
+import html
+import math
+import os
+from pathlib import Path
+
+from .icon_generator import COLORS, ICONS
+
+# Sprite file, relative to the images directory
+SPRITE_NAME = 'icons.svg'
+
+# One matplotlib point in icon units. The PNG backend draws on an 8-inch figure
+# whose equal-aspect axes span about 6.16 inches for 10 units, so line widths and
+# marker sizes below match the PNG icons.
+POINT = 10 / (0.77 * 8 * 72)
+
+# Icons are drawn in a 10 x 10 box with y pointing up, as in the PNG backend
+SIZE = 10
+
+# The PNG icons show the whole box plus savefig's pad_inches=0.1, so the symbols do too
+PADDING = 7.2 * POINT
+VIEW_BOX = f'{-PADDING:.3f} {-PADDING:.3f} {SIZE + 2 * PADDING:.3f} {SIZE + 2 * PADDING:.3f}'
+
+
+def _num(value: float) -> str:
+    """Compact SVG number"""
+    return format(round(value, 3), 'g')
+
+
+def symbol_id(icon: str) -> str:
+    """Sprite symbol of an icon, e.g. home_icon.png -> icon-home"""
+    return 'icon-' + Path(icon).stem.removesuffix('_icon').replace('_', '-')
+
+
+class IconCanvas:
+    """SVG elements of one icon, in icon units with y pointing up"""
+
+    def __init__(self) -> None:
+        self.elements: list[str] = []
+
+    @staticmethod
+    def _points(points: list[tuple[float, float]]) -> str:
+        return ' '.join(f'{_num(x)},{_num(SIZE - y)}' for x, y in points)
+
+    def rect(self, x: float, y: float, width: float, height: float, color: str, alpha: float = 1.0) -> None:
+        """Filled rectangle with its lower left corner at (x, y)"""
+        self.elements.append(
+            f'<rect x="{_num(x)}" y="{_num(SIZE - y - height)}" width="{_num(width)}" height="{_num(height)}" '
+            f'fill="{color}" fill-opacity="{_num(alpha)}"/>'
+        )
+
+    def polygon(self, points: list[tuple[float, float]], color: str, alpha: float = 1.0,
+                edge: str | None = None, edge_width: float = 0.0) -> None:
+        """Filled polygon, optionally outlined with a stroke edge_width points wide"""
+        stroke = f' stroke="{edge}" stroke-width="{_num(edge_width * POINT)}"' if edge else ''
+        coords = self._points(points)
+        self.elements.append(f'<polygon points="{coords}" fill="{color}" fill-opacity="{_num(alpha)}"{stroke}/>')
+
+    def line(self, points: list[tuple[float, float]], color: str, width: float, alpha: float = 1.0) -> None:
+        """Open polyline width points wide"""
+        coords = self._points(points)
+        self.elements.append(
+            f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-width="{_num(width * POINT)}" '
+            f'stroke-opacity="{_num(alpha)}" stroke-linecap="butt" stroke-linejoin="round"/>'
+        )
+
+    def circle(self, x: float, y: float, radius: float, color: str, alpha: float = 1.0) -> None:
+        """Filled circle"""
+        self.elements.append(
+            f'<circle cx="{_num(x)}" cy="{_num(SIZE - y)}" r="{_num(radius)}" fill="{color}" '
+            f'fill-opacity="{_num(alpha)}"/>'
+        )
+
+    def ring(self, x: float, y: float, radius: float, color: str, width: float) -> None:
+        """Unfilled circle outline width points wide"""
+        self.elements.append(
+            f'<circle cx="{_num(x)}" cy="{_num(SIZE - y)}" r="{_num(radius)}" fill="none" stroke="{color}" '
+            f'stroke-width="{_num(width * POINT)}"/>'
+        )
+
+    def marker(self, x: float, y: float, size: float, color: str, alpha: float = 1.0,
+               edge: str | None = None, edge_width: float = 0.0) -> None:
+        """Round scatter marker whose area is size square points, as in plt.scatter"""
+        radius = math.sqrt(size) / 2 * POINT
+        stroke = ''
+        if edge:
+            stroke = f' stroke="{edge}" stroke-width="{_num(edge_width * POINT)}" stroke-opacity="{_num(alpha)}"'
+        self.elements.append(
+            f'<circle cx="{_num(x)}" cy="{_num(SIZE - y)}" r="{_num(radius)}" fill="{color}" '
+            f'fill-opacity="{_num(alpha)}"{stroke}/>'
+        )
+
+    def symbol(self, symbol: str, title: str) -> str:
+        """The icon as a <symbol>"""
+        body = ''.join(self.elements)
+        return f'<symbol id="{symbol}" viewBox="{VIEW_BOX}"><title>{html.escape(title)}</title>{body}</symbol>'
+
+
+def _home_house(canvas: IconCanvas, color: str) -> None:
+    canvas.rect(2.5, 2.5, 5, 4, color, 0.85)
+    canvas.polygon([(2, 6.5), (5, 8.5), (8, 6.5)], color, 0.9)
+    canvas.rect(4.2, 2.5, 1.6, 2.8, COLORS['white'], 0.95)
+    canvas.rect(3, 4.8, 1, 1, COLORS['white'], 0.95)
+    canvas.rect(6, 4.8, 1, 1, COLORS['white'], 0.95)
+    canvas.marker(5.4, 3.8, 80, color, 0.9)
+
+
+def _neural_network(canvas: IconCanvas, color: str) -> None:
+    nodes = [(2.5, 7.5), (7.5, 7.5), (2, 5), (8, 5), (5, 2.5)]
+    for start, end in [(0, 2), (1, 3), (2, 4), (3, 4), (0, 1), (2, 3), (0, 4), (1, 4)]:
+        canvas.line([nodes[start], nodes[end]], color, 4, 0.6)
+    for x, y in nodes:
+        canvas.marker(x, y, 500, color, 0.9, edge=COLORS['white'], edge_width=3)
+
+
+def _trend_chart(canvas: IconCanvas, color: str) -> None:
+    for x, height in zip([2.5, 4, 5.5, 7], [2.5, 4, 5.5, 7], strict=True):
+        canvas.rect(x - 0.5, 2, 1, height, color, 0.85)
+    # The PNG's '->' annotation: a shaft with an open head of 0.4 x 0.2 times the 10pt mutation scale
+    start, tip = (2, 2.5), (8.5, 8.5)
+    angle = math.atan2(tip[1] - start[1], tip[0] - start[0])
+    length, half_width = 4 * POINT, 2 * POINT
+    back = (tip[0] - length * math.cos(angle), tip[1] - length * math.sin(angle))
+    left = (back[0] - half_width * math.sin(angle), back[1] + half_width * math.cos(angle))
+    right = (back[0] + half_width * math.sin(angle), back[1] - half_width * math.cos(angle))
+    canvas.line([start, tip], color, 4, 0.8)
+    canvas.line([left, tip, right], color, 4, 0.8)
+
+
+def _people_group(canvas: IconCanvas, color: str) -> None:
+    for x, y in [(2.5, 5), (5, 5), (7.5, 5)]:
+        canvas.circle(x, y + 2, 0.6, color, 0.9)
+        canvas.rect(x - 0.5, y - 1.5, 1, 3, color, 0.9)
+    canvas.line([(3.5, 8), (5, 8.5), (6.5, 8)], color, 5, 0.8)
+    for joint_x, joint_y in [(3.5, 8), (5, 8.5), (6.5, 8)]:
+        canvas.marker(joint_x, joint_y, 120, color, 0.9)
+
+
+def _security_shield(canvas: IconCanvas, color: str) -> None:
+    shield = [(5, 8.5), (2.5, 7), (2.5, 3), (5, 1.5), (7.5, 3), (7.5, 7)]
+    canvas.polygon(shield, color, 0.9, edge=COLORS['white'], edge_width=3)
+    canvas.rect(3.8, 4, 2.4, 2, COLORS['white'], 0.95)
+    canvas.ring(5, 6.5, 0.5, COLORS['white'], 4)
+    canvas.marker(5, 4.8, 100, color, 0.9)
+
+
+def _action_arrow(canvas: IconCanvas, color: str) -> None:
+    canvas.rect(2.5, 4, 4, 2, color, 0.85)
+    canvas.polygon([(6.5, 6.5), (8.5, 5), (6.5, 3.5)], color, 0.85)
+    # Eight evenly spaced angles from 0 to 2*pi inclusive, as np.linspace draws them
+    for i in range(8):
+        angle = 2 * math.pi * i / 7
+        canvas.line([(5.5, 5), (5.5 + 2.5 * math.cos(angle), 5 + 2.5 * math.sin(angle))], color, 3, 0.6)
+
+
+DRAW = {
+    'home_house': _home_house,
+    'neural_network': _neural_network,
+    'trend_chart': _trend_chart,
+    'people_group': _people_group,
+    'security_shield': _security_shield,
+    'action_arrow': _action_arrow,
+}
+
+
+def icon_symbol(icon: str) -> str:
+    """One navigation icon as a sprite <symbol>"""
+    config = ICONS[icon]
+    canvas = IconCanvas()
+    DRAW[config['type']](canvas, config['color'])
+    return canvas.symbol(symbol_id(icon), config['title'])
+
+
+def sprite() -> str:
+    """Every navigation icon in one SVG sprite"""
+    symbols = '\n'.join(icon_symbol(icon) for icon in ICONS)
+    return f'<svg xmlns="http://www.w3.org/2000/svg">\n{symbols}\n</svg>\n'
+
+
+def write_sprite(path: Path) -> bool:
+    """Write the sprite, replacing the file in one step only when it changed"""
+    text = sprite()
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    temp_path.write_text(text, encoding='utf-8')
+    os.replace(temp_path, path)
+    return True
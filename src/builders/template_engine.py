@@ -7,20 +7,118 @@ from pathlib import Path
 from typing import Any
 
 import jinja2
+from jinja2.bccache import Bucket
+from markupsafe import Markup, escape
+
+from .image_formats import ResponsiveImages
+from .site_index import SiteIndex
+from .svg_icons import symbol_id
+
+
+class TemplateBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """Compiled templates on disk, shared across builds and worker processes
+
+    Entries are keyed on the template's name and path and are only used while a
+    checksum of the template source still matches, so an edited template is
+    recompiled. The Jinja2 version is part of every filename because compiled
+    code is not portable between releases.
+    """
+
+    def __init__(self, directory: str | Path):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        super().__init__(str(directory), f'{jinja2.__version__}-%s.cache')
+        self.hits = 0
+        self.misses = 0
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
 
 
 class TemplateEngine:
     """Render HTML templates with content and context"""
 
-    def __init__(self, template_dir: str):
+    def __init__(self, template_dir: str, images: ResponsiveImages | None = None,
+                 cache_dir: str | Path | None = None, navigation: dict[str, Any] | None = None,
+                 icon_sprite: str | None = None):
         self.template_dir = Path(template_dir)
+        self.images = images or ResponsiveImages()
+        # SVG sprite holding the navigation icons; without one, each icon is its own PNG
+        self.icon_sprite = icon_sprite
+        # Navigation from the site index; without one, the content next to the templates is indexed on first use
+        self._navigation = navigation
+        # Rendered fragments, keyed on template name and arguments, kept for this engine's build
+        self.fragments: dict[tuple[str, tuple[tuple[str, Any], ...]], Markup] = {}
+        self.fragment_hits = 0
+        self.fragment_misses = 0
+        self.bytecode_cache = TemplateBytecodeCache(cache_dir) if cache_dir is not None else None
         self.env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(template_dir),
-            autoescape=jinja2.select_autoescape(['html', 'xml'])
+            autoescape=jinja2.select_autoescape(['html', 'xml']),
+            bytecode_cache=self.bytecode_cache,
         )
 
         # Add custom filters
         self.env.filters['current_page'] = self._current_page_filter
+        self.env.filters['nav_page'] = self._nav_page_filter
+        self.env.globals['image'] = self._image
+        self.env.globals['fragment'] = self._fragment
+        self.env.globals['nav_icon'] = self._nav_icon
+        self.env.globals['asset_url'] = self.images.assets.url
+
+    @property
+    def navigation(self) -> dict[str, Any]:
+        """Navigation buttons and call-to-action button, as produced by SiteIndex.navigation"""
+        if self._navigation is None:
+            self._navigation = SiteIndex(self.template_dir.parent / 'content').navigation()
+        return self._navigation
+
+    def precompile(self) -> int:
+        """Compile every template ahead of rendering, filling the bytecode cache"""
+        names = self.env.list_templates(extensions=['html'])
+        for name in names:
+            self.env.get_template(name)
+        return len(names)
+
+    def _image(self, src: str, alt: str, class_: str = '') -> Markup:
+        """Responsive <img> or <picture> markup for an image referenced by a template"""
+        attrs = {'class_': str(escape(class_))} if class_ else {}
+        return Markup(self.images.img_tag(str(escape(src)), str(escape(alt)), **attrs))
+
+    def _nav_icon(self, icon: str, alt: str) -> Markup:
+        """A navigation icon: a <use> of its symbol in the sprite, or its PNG"""
+        if self.icon_sprite is None:
+            return self._image(f'images/{icon}', alt, 'nav-icon')
+        href = self.images.assets.url(f'{self.icon_sprite}#{symbol_id(icon)}')
+        return Markup(f'<svg class="nav-icon" role="img" aria-label="{escape(alt)}"><use href="{escape(href)}"/></svg>')
+
+    def _fragment(self, template_name: str, **key: Any) -> Markup:
+        """Render a partial template once per distinct set of arguments and reuse it
+
+        The partial sees only the engine's globals, the navigation context and the
+        keyword arguments, which must be hashable since they form the cache key.
+        """
+        cache_key = (template_name, tuple(sorted(key.items())))
+        fragment = self.fragments.get(cache_key)
+        if fragment is None:
+            self.fragment_misses += 1
+            context = {**self.get_navigation_context(), **key}
+            fragment = Markup(self.env.get_template(template_name).render(**context))
+            self.fragments[cache_key] = fragment
+        else:
+            self.fragment_hits += 1
+        return fragment
+
+    def _nav_page_filter(self, page_name: str) -> str:
+        """The page name if it has a navigation button, otherwise '' so all other pages share one nav"""
+        navigation = self.navigation
+        names = {page['name'] for page in navigation['pages']}
+        if navigation['action_page'] is not None:
+            names.add(navigation['action_page']['name'])
+        return page_name if page_name in names else ''
 
     def _current_page_filter(self, page_name: str, current: str) -> str:
         """Add current-page class if this is the current page"""
@@ -28,19 +126,9 @@ class TemplateEngine:
 
     def get_navigation_context(self, current_page: str = '') -> dict[str, Any]:
         """Get navigation context with page info"""
-        pages = [
-            {'name': 'index', 'url': 'index.html', 'title': 'Home', 'icon': 'home_icon.png'},
-            {'name': 'economy', 'url': 'economy.html', 'title': 'Economy & Policy', 'icon': 'economy_icon.png'},
-            {'name': 'technology', 'url': 'technology.html', 'title': 'AI & Technology', 'icon': 'ai_icon.png'},
-            {'name': 'society', 'url': 'society.html', 'title': 'Society & Mental Health', 'icon': 'society_icon.png'},
-            {'name': 'privacy', 'url': 'privacy.html', 'title': 'Privacy & Security', 'icon': 'privacy_icon.png'},
-        ]
-
-        action_page = {'name': 'action', 'url': 'action.html', 'title': 'What We Can Do Now', 'icon': 'action_icon.png'}
-
         return {
-            'pages': pages,
-            'action_page': action_page,
+            'pages': self.navigation['pages'],
+            'action_page': self.navigation['action_page'],
             'current_page': current_page
         }
 
@@ -0,0 +1,155 @@
+// Client-side full-text search over the index written by src/builders/search_index.py.
+// Only the document table and the shards for the words being typed are downloaded.
+
+const SiteSearch = (() => {
+  const STOPWORDS = new Set(
+    ('an and are as at be but by for from has have in into is it its of on or that the their ' +
+     'this to was were which will with').split(' ')
+  );
+  const MIN_TOKEN_LENGTH = 2;
+  const MAX_TOKEN_LENGTH = 32;
+  const MAX_RESULTS = 10;
+
+  let indexPromise = null;
+  const shardPromises = new Map();
+
+  // Same rules as tokenize() in search_index.py
+  function tokenize(text) {
+    return (text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || []).filter(token =>
+      token.length >= MIN_TOKEN_LENGTH && token.length <= MAX_TOKEN_LENGTH && !STOPWORDS.has(token)
+    );
+  }
+
+  function fetchJson(url) {
+    return fetch(url).then(response => {
+      if (!response.ok) throw new Error(`${url}: ${response.status}`);
+      return response.json();
+    });
+  }
+
+  function loadIndex() {
+    if (!indexPromise) {
+      indexPromise = fetchJson('search/documents.json').then(index => ({
+        ...index,
+        shardSet: new Set(index.shards),
+      }));
+    }
+    return indexPromise;
+  }
+
+  function shardKey(index, term) {
+    const prefix = term.slice(0, index.prefix);
+    return /^[a-z0-9]+$/.test(prefix) ? prefix : '_';
+  }
+
+  function loadShard(index, key) {
+    if (!index.shardSet.has(key)) return Promise.resolve({});
+    if (!shardPromises.has(key)) {
+      shardPromises.set(key, fetchJson(`search/${key}.json`));
+    }
+    return shardPromises.get(key);
+  }
+
+  // Postings are [gap, count, gap, count, ...]; returns a Map of document id to count
+  function decodePostings(encoded) {
+    const postings = new Map();
+    let doc = 0;
+    for (let i = 0; i < encoded.length; i += 2) {
+      doc += encoded[i];
+      postings.set(doc, encoded[i + 1]);
+    }
+    return postings;
+  }
+
+  // Every query word must match; the last one also matches as a prefix while it is being typed
+  async function search(query) {
+    const terms = tokenize(query);
+    if (terms.length === 0) return [];
+    const index = await loadIndex();
+    const total = index.documents.length;
+
+    let scores = null;
+    for (const [position, term] of terms.entries()) {
+      const shard = await loadShard(index, shardKey(index, term));
+      const isLast = position === terms.length - 1;
+      const matches = isLast
+        ? Object.keys(shard).filter(candidate => candidate.startsWith(term))
+        : (term in shard ? [term] : []);
+
+      const termScores = new Map();
+      for (const match of matches) {
+        const postings = decodePostings(shard[match]);
+        const idf = Math.log(1 + total / postings.size);
+        for (const [doc, count] of postings) {
+          termScores.set(doc, (termScores.get(doc) || 0) + count * idf);
+        }
+      }
+
+      if (scores === null) {
+        scores = termScores;
+      } else {
+        for (const doc of [...scores.keys()]) {
+          if (termScores.has(doc)) {
+            scores.set(doc, scores.get(doc) + termScores.get(doc));
+          } else {
+            scores.delete(doc);
+          }
+        }
+      }
+      if (scores.size === 0) return [];
+    }
+
+    return [...scores.entries()]
+      .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+      .slice(0, MAX_RESULTS)
+      .map(([doc, score]) => ({ url: index.documents[doc][0], title: index.documents[doc][1], score }));
+  }
+
+  function renderResults(list, results, query) {
+    list.replaceChildren();
+    for (const result of results) {
+      const item = document.createElement('li');
+      const link = document.createElement('a');
+      link.href = result.url;
+      link.textContent = result.title;
+      item.appendChild(link);
+      list.appendChild(item);
+    }
+    if (results.length === 0 && query.trim()) {
+      const item = document.createElement('li');
+      item.className = 'search-empty';
+      item.textContent = 'No matching pages';
+      list.appendChild(item);
+    }
+    list.hidden = !query.trim();
+  }
+
+  function attach(input, list) {
+    let latest = 0;
+    input.addEventListener('input', async () => {
+      const query = input.value;
+      const request = ++latest;
+      try {
+        const results = await search(query);
+        // Ignore answers to queries the visitor has already typed past
+        if (request === latest) renderResults(list, results, query);
+      } catch (error) {
+        console.error('Search failed:', error);
+      }
+    });
+    input.addEventListener('keydown', event => {
+      if (event.key === 'Escape') {
+        input.value = '';
+        list.hidden = true;
+      }
+    });
+  }
+
+  return { tokenize, decodePostings, search, attach };
+})();
+
+document.addEventListener('DOMContentLoaded', () => {
+  const input = document.getElementById('site-search-input');
+  const list = document.getElementById('site-search-results');
+  if (input && list) SiteSearch.attach(input, list);
+});
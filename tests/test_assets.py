@@ -0,0 +1,109 @@
+"""
+Tests for asset fingerprinting
+"""
+
+import json
+from pathlib import Path
+
+from src.builders.assets import AssetManifest, AssetPipeline, fingerprinted_name
+from src.builders.image_formats import ImageFormats, ResponsiveImages
+
+
+class TestAssetPipeline:
+    """Test fingerprinted copies, CSS rewriting and cleanup"""
+
+    def make_output(self, temp_dir: Path) -> Path:
+        docs = temp_dir / 'docs'
+        (docs / 'images').mkdir(parents=True)
+        (docs / 'style.css').write_text('header { background: url("images/banner.png") no-repeat; }\n')
+        (docs / 'script.js').write_text('console.log("hi");\n')
+        (docs / 'images' / 'banner.png').write_bytes(b'\x89PNG banner')
+        (docs / 'index.html').write_text('<p>Home</p>')
+        return docs
+
+    def run(self, docs: Path, temp_dir: Path) -> tuple[AssetManifest, bool]:
+        return AssetPipeline(docs, temp_dir / 'cache' / 'assets.json').run(
+            ['style.css', 'script.js', 'images/banner.png', 'index.html']
+        )
+
+    def test_copies_assets_to_hashed_names(self, temp_dir: Path) -> None:
+        """Test that assets get a content-hashed copy next to the original, and pages do not"""
+        docs = self.make_output(temp_dir)
+
+        manifest, changed = self.run(docs, temp_dir)
+
+        assert changed
+        assert set(manifest.assets) == {'style.css', 'script.js', 'images/banner.png'}
+        for original, name in manifest.assets.items():
+            assert name.startswith(original.rsplit('.', 1)[0] + '.')
+            assert (docs / name).is_file() and (docs / original).is_file()
+        assert (docs / manifest.assets['script.js']).read_bytes() == (docs / 'script.js').read_bytes()
+        assert json.loads((docs / 'asset-manifest.json').read_text()) == manifest.assets
+
+    def test_css_references_are_rewritten(self, temp_dir: Path) -> None:
+        """Test that url() in a stylesheet points at the fingerprinted image"""
+        docs = self.make_output(temp_dir)
+
+        manifest, _ = self.run(docs, temp_dir)
+
+        css = (docs / manifest.assets['style.css']).read_text()
+        assert f'url("{manifest.assets["images/banner.png"]}")' in css
+
+    def test_unchanged_assets_keep_their_names(self, temp_dir: Path) -> None:
+        """Test that a second build reports no change and only renames the edited asset"""
+        docs = self.make_output(temp_dir)
+        first, _ = self.run(docs, temp_dir)
+
+        again, changed = self.run(docs, temp_dir)
+        assert not changed and again.assets == first.assets
+
+        (docs / 'images' / 'banner.png').write_bytes(b'\x89PNG new banner')
+        second, changed = self.run(docs, temp_dir)
+
+        assert changed
+        assert second.assets['script.js'] == first.assets['script.js']
+        assert second.assets['images/banner.png'] != first.assets['images/banner.png']
+        # The stylesheet references the image, so its name changes with it
+        assert second.assets['style.css'] != first.assets['style.css']
+        assert not (docs / first.assets['images/banner.png']).exists()
+        assert not (docs / first.assets['style.css']).exists()
+
+
+class TestAssetManifest:
+    """Test mapping URLs onto fingerprinted copies"""
+
+    def test_url_keeps_query_and_fragment(self) -> None:
+        """Test that only the path of a URL is mapped"""
+        manifest = AssetManifest({'style.css': fingerprinted_name('style.css', 'ab' * 32)})
+
+        assert manifest.url('style.css?v=2') == 'style.ababababab.css?v=2'
+        assert manifest.url('other.css#x') == 'other.css#x'
+
+    def test_external_css_urls_are_left_alone(self) -> None:
+        """Test that data, absolute and unknown URLs are not rewritten"""
+        manifest = AssetManifest({'images/a.png': 'images/a.0123456789.png'})
+        css = 'a { background: url(data:image/png;base64,xx); } b { background: url(https://x.org/a.png); }'
+
+        assert manifest.rewrite_css(css, 'style.css') == css
+        assert manifest.rewrite_css('c { background: url(../images/a.png); }', 'css/site.css') == (
+            'c { background: url(../images/a.0123456789.png); }'
+        )
+
+    def test_responsive_images_use_fingerprinted_urls(self) -> None:
+        """Test that the <img> and every srcset candidate reference fingerprinted copies"""
+        formats = ImageFormats(widths=(480,), raster_formats=('webp', 'png'))
+        assets = {
+            'images/chart.png': 'images/chart.aaaaaaaaaa.png',
+            'images/chart-480w.webp': 'images/chart-480w.bbbbbbbbbb.webp',
+            'images/chart-480w.png': 'images/chart-480w.cccccccccc.png',
+            'images/photo.png': 'images/photo.dddddddddd.png',
+        }
+        images = ResponsiveImages({'images/chart.png': formats}, assets)
+
+        tag = images.img_tag('images/chart.png', 'Chart')
+        assert 'src="images/chart.aaaaaaaaaa.png"' in tag
+        assert 'images/chart-480w.bbbbbbbbbb.webp 480w' in tag
+        assert 'images/chart-480w.cccccccccc.png 480w' in tag
+
+        html = images.rewrite('<p><img alt="Photo" src="images/photo.png" /></p>')
+        assert html == '<p><img src="images/photo.dddddddddd.png" alt="Photo" /></p>'
@@ -0,0 +1,66 @@
+"""
+Tests for the synthetic site generator and benchmark comparison
+"""
+
+from pathlib import Path
+
+from benchmarks.runner import bench_markdown, compare
+from benchmarks.synthetic import generate_site, synthetic_prices
+from src.builders.markdown_processor import MarkdownProcessor
+
+
+def results(**medians: float) -> dict:
+    """Minimal results file with the given median times"""
+    return {'benchmarks': {name: {'median_s': median} for name, median in medians.items()}}
+
+
+class TestSyntheticSite:
+    """Test synthetic site generation"""
+
+    def test_generates_requested_page_count(self, temp_dir: Path) -> None:
+        """Test that the site has the requested number of pages and the real templates"""
+        site = generate_site(temp_dir / 'site', pages=5, years=1)
+
+        assert len(list((site / 'src' / 'content').glob('*.md'))) == 5
+        assert (site / 'src' / 'content' / 'index.md').exists()
+        assert (site / 'src' / 'templates' / 'page.html').exists()
+
+    def test_pages_use_tabs_and_images(self, temp_dir: Path) -> None:
+        """Test that synthetic pages exercise the shortcode and image paths"""
+        site = generate_site(temp_dir / 'site', pages=2, years=1)
+        content = (site / 'src' / 'content' / 'page00001.md').read_text()
+
+        _, html = MarkdownProcessor().convert(content)
+        assert 'tab-container' in html
+        assert 'chart-wrapper' in html
+
+    def test_prices_cover_every_day(self) -> None:
+        """Test that price history has one row per day for the requested years"""
+        lines = synthetic_prices(years=2).splitlines()
+
+        assert lines[0] == 'Date,SP500,Bitcoin'
+        assert len(lines) == 1 + int(2 * 365.25)
+
+    def test_markdown_benchmark_counts_pages(self, temp_dir: Path) -> None:
+        """Test that a benchmark result records its items and samples"""
+        site = generate_site(temp_dir / 'site', pages=3, years=1)
+        result = bench_markdown(site, repeat=2)
+
+        assert result['items'] == 3
+        assert len(result['samples']) == 2
+        assert result['min_s'] <= result['median_s']
+
+
+class TestCompare:
+    """Test comparison against a baseline"""
+
+    def test_flags_slowdown_beyond_threshold(self) -> None:
+        """Test that only benchmarks slower than the threshold are regressions"""
+        baseline = results(fast=1.0, slow=1.0)
+        current = results(fast=1.05, slow=1.5)
+
+        assert compare(baseline, current, threshold=0.1) == ['slow']
+
+    def test_ignores_benchmarks_missing_from_one_side(self) -> None:
+        """Test that added or removed benchmarks are reported but never fail"""
+        assert compare(results(old=1.0), results(new=9.0)) == []
@@ -0,0 +1,51 @@
+"""
+Tests for the build manifest module - Core functionality only
+"""
+
+from pathlib import Path
+
+from src.builders.build_manifest import BuildManifest, BuildTarget
+
+
+class TestBuildManifest:
+    """Test incremental build bookkeeping"""
+
+    def test_target_is_fresh_until_input_changes(self, temp_dir: Path) -> None:
+        """Test that a recorded target goes stale when an input changes"""
+        source = temp_dir / "page.md"
+        source.write_text("# Page")
+        output_dir = temp_dir / "docs"
+        output_dir.mkdir()
+        (output_dir / "page.html").write_text("<h1>Page</h1>")
+
+        target = BuildTarget("page.html", "page", (source,))
+        manifest = BuildManifest(temp_dir / "manifest.json")
+        assert not manifest.is_fresh(target, output_dir)
+
+        manifest.record(target)
+        manifest.save()
+        assert BuildManifest.load(temp_dir / "manifest.json").is_fresh(target, output_dir)
+
+        source.write_text("# Changed page")
+        assert not BuildManifest.load(temp_dir / "manifest.json").is_fresh(target, output_dir)
+
+    def test_missing_output_is_stale(self, temp_dir: Path) -> None:
+        """Test that a deleted output is rebuilt even if its inputs are unchanged"""
+        source = temp_dir / "style.css"
+        source.write_text("body {}")
+        target = BuildTarget("style.css", "static", (source,))
+
+        manifest = BuildManifest(temp_dir / "manifest.json")
+        manifest.record(target)
+
+        assert not manifest.is_fresh(target, temp_dir / "docs")
+
+    def test_orphans(self, temp_dir: Path) -> None:
+        """Test that outputs no longer produced by any target are reported"""
+        source = temp_dir / "a.md"
+        source.write_text("a")
+        manifest = BuildManifest(temp_dir / "manifest.json")
+        manifest.record(BuildTarget("a.html", "page", (source,)))
+        manifest.record(BuildTarget("b.html", "page", (source,)))
+
+        assert manifest.orphans([BuildTarget("a.html", "page", (source,))]) == ["b.html"]
@@ -0,0 +1,130 @@
+"""
+Tests for the data catalog
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.builders import data_catalog
+from src.builders.data_catalog import DataCatalog, SchemaError
+
+PORTFOLIO_CSV = """Year,PersonA_Savings,PersonA_401k,PersonA_Total,PersonA_Lower,PersonA_Upper
+2025,65000,37000,102000,99000,105000
+2030,72500,51500,124000,114000,134000
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_process_cache() -> None:
+    """Start every test without frames parsed by earlier tests"""
+    data_catalog._FRAMES.clear()
+
+
+def write_data(data_dir: Path, sample_csv_data: str) -> None:
+    """Write a market trends and a portfolio dataset"""
+    data_dir.mkdir(exist_ok=True)
+    (data_dir / 'market_trends.csv').write_text(sample_csv_data)
+    (data_dir / 'personA_portfolio.csv').write_text(PORTFOLIO_CSV)
+
+
+class TestDataCatalog:
+    """Test schema-checked dataset loading and caching"""
+
+    def test_columns_parsed_with_declared_dtypes(self, temp_dir: Path, sample_csv_data: str) -> None:
+        """Test that dates are parsed and numeric columns get their declared dtypes"""
+        write_data(temp_dir, sample_csv_data)
+        catalog = DataCatalog(temp_dir)
+
+        trends = catalog.frame('market_trends')
+        portfolio = catalog.frame('personA_portfolio')
+
+        assert str(trends['Date'].dtype) == 'datetime64[ns]'
+        assert str(trends['SP500'].dtype) == 'float64'
+        assert str(portfolio['PersonA_Total'].dtype) == 'int64'
+
+    def test_schema_mismatch_is_rejected(self, temp_dir: Path) -> None:
+        """Test that missing columns and unparseable values raise SchemaError"""
+        (temp_dir / 'market_trends.csv').write_text("Date,SP500\n2020-01-01,1.0\n")
+        (temp_dir / 'personA_portfolio.csv').write_text(PORTFOLIO_CSV.replace('65000', 'lots'))
+        catalog = DataCatalog(temp_dir)
+
+        with pytest.raises(SchemaError, match='expected columns'):
+            catalog.frame('market_trends')
+        with pytest.raises(SchemaError):
+            catalog.frame('personA_portfolio')
+        with pytest.raises(SchemaError, match='No schema'):
+            catalog.schema('unknown')
+
+    def test_frames_are_not_shared_between_readers(self, temp_dir: Path, sample_csv_data: str) -> None:
+        """Test that changes a plot makes to its frame are not seen by the next reader"""
+        write_data(temp_dir, sample_csv_data)
+        catalog = DataCatalog(temp_dir)
+
+        first = catalog.frame('market_trends')
+        first['SP500'] = 0.0
+        first['Extra'] = 1
+
+        second = catalog.frame('market_trends')
+        assert 'Extra' not in second.columns
+        assert second['SP500'].iloc[0] == 3230.78
+
+    def test_in_place_changes_do_not_reach_the_cache(self, temp_dir: Path, sample_csv_data: str) -> None:
+        """Test that modifying a returned frame's values in place leaves later reads unchanged"""
+        write_data(temp_dir, sample_csv_data)
+        catalog = DataCatalog(temp_dir)
+
+        first = catalog.frame('market_trends')
+        first['SP500'] *= 2
+        first.loc[0, 'Bitcoin'] = -1.0
+
+        second = catalog.frame('market_trends')
+        assert second['SP500'].iloc[0] == 3230.78
+        assert second['Bitcoin'].iloc[0] == 7200.17
+        # Separate buffers, so this holds without copy-on-write too (pandas 2)
+        third = catalog.frame('market_trends')
+        assert not np.shares_memory(second['SP500'].to_numpy(), third['SP500'].to_numpy())
+
+    def test_each_dataset_parsed_once_per_process(self, temp_dir: Path, sample_csv_data: str,
+                                                  monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that repeated reads reuse the parsed frame until the file changes"""
+        write_data(temp_dir, sample_csv_data)
+        calls = []
+        parse_csv = data_catalog.parse_csv
+        monkeypatch.setattr(data_catalog, 'parse_csv', lambda *args: calls.append(args) or parse_csv(*args))
+
+        DataCatalog(temp_dir).frame('personA_portfolio')
+        DataCatalog(temp_dir).frame('personA_portfolio')
+        assert len(calls) == 1
+
+        (temp_dir / 'personA_portfolio.csv').write_text(PORTFOLIO_CSV + "2031,1,1,1,1,1\n")
+        assert len(DataCatalog(temp_dir).frame('personA_portfolio')) == 3
+        assert len(calls) == 2
+
+    def test_binary_cache_skips_csv_parsing(self, temp_dir: Path, sample_csv_data: str,
+                                            monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a later build reads the binary cache instead of the CSV"""
+        data_dir, cache_dir = temp_dir / 'data', temp_dir / 'cache'
+        write_data(data_dir, sample_csv_data)
+        expected = DataCatalog(data_dir, cache_dir).frame('market_trends')
+
+        # A new process has no parsed frames and must not need pandas' CSV parser
+        data_catalog._FRAMES.clear()
+        monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: pytest.fail('CSV was parsed'))
+        cached = DataCatalog(data_dir, cache_dir).frame('market_trends')
+
+        pd.testing.assert_frame_equal(cached, expected)
+
+    def test_changed_file_replaces_cache_entry(self, temp_dir: Path, sample_csv_data: str) -> None:
+        """Test that editing a dataset leaves a single, current cache entry"""
+        data_dir, cache_dir = temp_dir / 'data', temp_dir / 'cache'
+        write_data(data_dir, sample_csv_data)
+        DataCatalog(data_dir, cache_dir).frame('personA_portfolio')
+
+        (data_dir / 'personA_portfolio.csv').write_text(PORTFOLIO_CSV.replace('2030', '2031'))
+        frame = DataCatalog(data_dir, cache_dir).frame('personA_portfolio')
+
+        assert list(frame['Year']) == [2025, 2031]
+        assert len(list(cache_dir.glob('personA_portfolio-*.npz'))) == 1
@@ -0,0 +1,78 @@
+"""
+Tests for watch mode - Core functionality only
+"""
+
+from pathlib import Path
+
+from src.builders.dev_server import FileWatcher
+from src.builders.site_builder import SiteBuilder
+
+
+def make_project(root: Path) -> SiteBuilder:
+    """Minimal source tree with one page, one template, one static file and the CSVs"""
+    for name in ['content', 'templates', 'static', 'data']:
+        (root / 'src' / name).mkdir(parents=True)
+    (root / 'src' / 'content' / 'index.md').write_text('# Home')
+    (root / 'src' / 'content' / 'privacy.md').write_text('# Privacy')
+    (root / 'src' / 'templates' / 'base.html').write_text('{{ content }}')
+    (root / 'src' / 'static' / 'style.css').write_text('body {}')
+    for name in ['market_trends', 'personA_portfolio', 'personB_portfolio', 'personC_portfolio']:
+        (root / 'src' / 'data' / f'{name}.csv').write_text('Year\n2025\n')
+
+    builder = SiteBuilder(str(root))
+    for target in builder.collect_targets():
+        builder.manifest.record(target)
+    return builder
+
+
+class TestWatchMode:
+    """Test change detection and change-to-output mapping"""
+
+    def test_file_watcher_reports_changes(self, temp_dir: Path) -> None:
+        """Test that added, modified and deleted files are all reported"""
+        (temp_dir / 'a.md').write_text('a')
+        (temp_dir / 'b.md').write_text('b')
+        watcher = FileWatcher([temp_dir])
+        assert watcher.poll() == set()
+
+        (temp_dir / 'a.md').write_text('a changed')
+        (temp_dir / 'b.md').unlink()
+        (temp_dir / 'c.md').write_text('c')
+
+        assert watcher.poll() == {temp_dir / 'a.md', temp_dir / 'b.md', temp_dir / 'c.md'}
+        assert watcher.poll() == set()
+
+    def test_changes_map_to_affected_outputs(self, temp_dir: Path) -> None:
+        """Test that each kind of source change only touches its own outputs"""
+        builder = make_project(temp_dir)
+        targets = builder.collect_targets()
+        src = temp_dir / 'src'
+
+        def affected(path: Path) -> list[str]:
+            return sorted(t.output for t in builder.affected_targets(targets, {path}))
+
+        assert affected(src / 'content' / 'privacy.md') == ['privacy.html']
+        assert affected(src / 'templates' / 'base.html') == ['index.html', 'privacy.html']
+        assert affected(src / 'static' / 'style.css') == ['style.css']
+        assert affected(src / 'data' / 'personB_portfolio.csv') == [
+            'images/comparative_wealth.png', 'images/comparative_wealth.svg', 'images/personB-1600w.png',
+            'images/personB-1600w.webp', 'images/personB-480w.png', 'images/personB-480w.webp',
+            'images/personB-960w.png', 'images/personB-960w.webp', 'images/personB.png',
+        ]
+
+    def test_navigation_change_affects_every_page(self, temp_dir: Path) -> None:
+        """Test that a nav edit in one page's frontmatter re-renders all pages, and a body edit does not"""
+        builder = make_project(temp_dir)
+        builder.index_pages()
+        targets = builder.collect_targets()
+        for target in targets:
+            builder.manifest.record(target)
+        privacy = temp_dir / 'src' / 'content' / 'privacy.md'
+
+        privacy.write_text('# Privacy, edited')
+        assert not builder.index_pages()
+
+        privacy.write_text('---\nnav: "main"\nnav_title: "Privacy"\n---\n# Privacy')
+        assert builder.index_pages()
+        changed = {privacy, builder.navigation_path}
+        assert sorted(t.output for t in builder.affected_targets(targets, changed)) == ['index.html', 'privacy.html']
@@ -0,0 +1,96 @@
+"""
+Tests for the downsampling engine
+"""
+
+from pathlib import Path
+from typing import Any
+
+import matplotlib
+import numpy as np
+import pytest
+
+matplotlib.use('Agg')  # Use non-interactive backend for testing
+
+import matplotlib.pyplot as plt
+
+from benchmarks.synthetic import synthetic_prices
+from src.builders import plot_generator
+from src.builders.downsample import downsample, lttb_indices, minmax_indices
+
+
+def noisy_series(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """A random walk with one sharp spike in the middle"""
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(size=n))
+    y[n // 2] += 100
+    return np.arange(n), y
+
+
+class TestDownsample:
+    """Test the LTTB and min/max reducers"""
+
+    @pytest.mark.parametrize('method', ['lttb', 'minmax'])
+    def test_output_bounded_and_keeps_endpoints(self, method: str) -> None:
+        """Test that long series are reduced to the budget with both ends kept"""
+        x, y = noisy_series(10_000)
+        small_x, small_y = downsample(x, y, 500, method)
+
+        assert len(small_x) <= 500
+        assert small_x[0] == 0 and small_x[-1] == 9_999
+        assert np.all(np.diff(small_x) > 0)
+        assert np.array_equal(small_y, y[small_x])
+
+    @pytest.mark.parametrize('method', ['lttb', 'minmax'])
+    def test_spike_survives(self, method: str) -> None:
+        """Test that a single-sample spike is kept by both reducers"""
+        x, y = noisy_series(10_000)
+        small_x, _ = downsample(x, y, 200, method)
+
+        assert 5_000 in small_x
+
+    def test_short_series_unchanged(self) -> None:
+        """Test that series within the budget are returned as they are"""
+        x, y = noisy_series(50)
+
+        assert np.array_equal(lttb_indices(x, y, 100), np.arange(50))
+        assert np.array_equal(minmax_indices(y, 100), np.arange(50))
+
+    def test_lttb_handles_dates(self) -> None:
+        """Test that datetime x values are reduced and returned as dates"""
+        dates = np.arange('2015-01-01', '2025-01-01', dtype='datetime64[D]').astype('datetime64[ns]')
+        values = np.linspace(0, 1, len(dates))
+
+        small_dates, _ = downsample(dates, values, 100)
+
+        assert small_dates.dtype == dates.dtype
+        assert len(small_dates) == 100
+
+    def test_unknown_method_rejected(self) -> None:
+        """Test that an unknown method name raises ValueError"""
+        with pytest.raises(ValueError):
+            downsample(np.arange(10), np.arange(10), 5, 'average')
+
+
+class TestPlotDownsampling:
+    """Test that plots reduce long histories automatically"""
+
+    def test_ten_year_daily_series_bounded(self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a 10-year daily history plots at most one point per output pixel"""
+        csv_file = temp_dir / 'market_trends.csv'
+        csv_file.write_text(synthetic_prices(years=10))
+        rows = len(csv_file.read_text().splitlines()) - 1
+
+        plotted: list[int] = []
+
+        def capture(save_path: str, save_kwargs: dict[str, Any], formats: Any) -> None:
+            figure = plt.gcf()
+            plotted.extend(len(line.get_xdata()) for ax in figure.axes for line in ax.get_lines())
+            pixels = figure.get_figwidth() * save_kwargs['dpi']
+            assert all(count <= pixels for count in plotted)
+            plt.close()
+
+        monkeypatch.setattr(plot_generator, 'save_figure', capture)
+        plot_generator.create_market_trends_plot(str(csv_file), str(temp_dir / 'market_trends.png'))
+
+        assert len(plotted) == 2
+        assert all(count < rows for count in plotted)
@@ -0,0 +1,115 @@
+"""
+Tests for the figure rendering engine - Core functionality only
+"""
+
+import os
+from pathlib import Path
+
+import matplotlib
+import pytest
+from PIL import Image
+
+matplotlib.use('Agg')  # Use non-interactive backend for testing
+
+import matplotlib.pyplot as plt
+
+from src.builders.figures import FigureJob, render_figures, save_figure
+from src.builders.icon_generator import icon_jobs
+from src.builders.image_formats import ImageFormats
+from src.builders.reproducible import ESSENTIAL_CHUNKS, normalize_png, png_chunk_types
+
+
+def transparent_style() -> None:
+    """Style used by the test jobs"""
+    plt.rcParams['figure.facecolor'] = 'none'
+
+
+def write_marker(save_path: str, text: str) -> None:
+    """Tiny job body: record the facecolor in effect while rendering"""
+    Path(save_path).write_text(f"{text}:{plt.rcParams['figure.facecolor']}")
+
+
+def draw_chart(save_path: str, formats: ImageFormats = ImageFormats()) -> None:
+    """Small line chart with text, saved like the site's plots"""
+    plt.figure(figsize=(2, 1))
+    plt.plot([1, 3, 2])
+    plt.title('Trend')
+    save_figure(save_path, {'dpi': 50}, formats)
+
+
+class TestRenderFigures:
+    """Test figure job rendering"""
+
+    def test_style_does_not_leak_between_jobs(self, temp_dir: Path) -> None:
+        """Test that each job runs with its own style and leaves rcParams untouched"""
+        before = plt.rcParams['figure.facecolor']
+        jobs = [
+            FigureJob('a.txt', write_marker, {'save_path': str(temp_dir / 'a.txt'), 'text': 'a'},
+                      style=transparent_style),
+            FigureJob('b.txt', write_marker, {'save_path': str(temp_dir / 'b.txt'), 'text': 'b'}),
+        ]
+
+        render_figures(jobs)
+
+        assert (temp_dir / 'a.txt').read_text() == 'a:none'
+        assert (temp_dir / 'b.txt').read_text() == f'b:{before}'
+        assert plt.rcParams['figure.facecolor'] == before
+
+    def test_process_pool_keeps_job_order(self, temp_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that pooled rendering writes every output and logs in job order"""
+        jobs = [
+            FigureJob(f'{i}.txt', write_marker,
+                      {'save_path': str(temp_dir / f'{i}.txt'), 'text': str(i)},
+                      label=f'job {i}', style=transparent_style)
+            for i in range(4)
+        ]
+
+        render_figures(jobs, workers=2)
+
+        assert capsys.readouterr().out.split() == ['job', '0', 'job', '1', 'job', '2', 'job', '3']
+        for i in range(4):
+            assert (temp_dir / f'{i}.txt').read_text() == f'{i}:none'
+
+
+class TestReproducibleOutput:
+    """Test that unchanged figures are byte-identical across builds"""
+
+    def test_two_builds_write_identical_bytes(self, temp_dir: Path) -> None:
+        """Test that rendering the same icons and chart twice gives the same files"""
+        outputs = []
+        for build in ('first', 'second'):
+            images_dir = temp_dir / build
+            images_dir.mkdir()
+            jobs = icon_jobs(str(images_dir))[:1] + [
+                FigureJob('chart.png', draw_chart, {'save_path': str(images_dir / 'chart.png'),
+                                                    'formats': ImageFormats(svg=True, widths=(64,))})
+            ]
+            render_figures(jobs)
+            outputs.append({path.name: path.read_bytes() for path in sorted(images_dir.iterdir())})
+
+        assert len(outputs[0]) == 7 + 4
+        assert outputs[0] == outputs[1]
+
+    def test_pngs_keep_only_essential_chunks(self, temp_dir: Path) -> None:
+        """Test that version text and physical size are stripped without changing pixels"""
+        save_path = temp_dir / 'chart.png'
+        render_figures([FigureJob('chart.png', draw_chart, {'save_path': str(save_path)})])
+
+        data = save_path.read_bytes()
+        assert b'Matplotlib' not in data
+        assert set(png_chunk_types(data)) <= ESSENTIAL_CHUNKS
+        with Image.open(save_path) as image:
+            assert image.size[0] > 0
+
+    def test_normalize_png_replaces_the_file(self, temp_dir: Path) -> None:
+        """Test that stripping never writes through a hard link to the original bytes"""
+        path = temp_dir / 'a.png'
+        Image.new('RGB', (4, 4), 'red').save(path, dpi=(300, 300))
+        original = path.read_bytes()
+        link = temp_dir / 'link.png'
+        os.link(path, link)
+
+        assert normalize_png(path)
+        assert link.read_bytes() == original
+        assert b'pHYs' not in path.read_bytes()
+        assert not normalize_png(path)
@@ -0,0 +1,115 @@
+"""
+Tests for figure output formats and responsive image markup
+"""
+
+from pathlib import Path
+
+import matplotlib
+from PIL import Image
+
+matplotlib.use('Agg')  # Use non-interactive backend for testing
+
+import matplotlib.pyplot as plt
+
+from src.builders.figures import save_figure
+from src.builders.image_formats import (
+    ImageFormats,
+    ResponsiveImages,
+    write_raster_variants,
+)
+from src.builders.markdown_processor import MarkdownProcessor
+
+RASTER = ImageFormats(widths=(40, 80))
+VECTOR = ImageFormats(svg=True)
+
+
+class TestImageFormats:
+    """Test writing figure variants"""
+
+    def test_variant_paths(self) -> None:
+        """Test that every variant is named after the primary image"""
+        paths = ImageFormats(svg=True, widths=(480,)).variant_paths(Path('images/chart.png'))
+
+        assert [p.as_posix() for p in paths] == [
+            'images/chart.svg', 'images/chart-480w.webp', 'images/chart-480w.png'
+        ]
+
+    def test_raster_variants_are_downscaled(self, temp_dir: Path) -> None:
+        """Test that each width is written as PNG and WebP at the right size"""
+        save_path = temp_dir / 'chart.png'
+        Image.new('RGBA', (200, 100), 'blue').save(save_path)
+
+        write_raster_variants(save_path, RASTER)
+
+        for path in RASTER.variant_paths(save_path):
+            with Image.open(path) as image:
+                assert image.format == path.suffix.lstrip('.').upper()
+                assert image.width in (40, 80)
+                assert image.height == image.width // 2
+
+    def test_save_figure_writes_reproducible_svg(self, temp_dir: Path) -> None:
+        """Test that the vector copy keeps text as text and is identical across saves"""
+        outputs = []
+        for name in ('a.png', 'b.png'):
+            plt.plot([1, 2, 3])
+            plt.title('Trend')
+            save_figure(str(temp_dir / name), {'dpi': 50}, VECTOR)
+            outputs.append((temp_dir / name).with_suffix('.svg').read_text())
+
+        assert outputs[0] == outputs[1]
+        assert '>Trend</text>' in outputs[0]
+        assert (temp_dir / 'a.png').exists()
+
+
+class TestResponsiveImages:
+    """Test responsive image markup"""
+
+    def test_image_without_variants_is_plain(self) -> None:
+        """Test that images without variants keep their original markup"""
+        images = ResponsiveImages({'images/chart.png': RASTER})
+
+        assert images.img_tag('images/photo.png', 'Photo', loading='lazy') == \
+            '<img src="images/photo.png" alt="Photo" loading="lazy" />'
+
+    def test_raster_variants_get_srcset_and_sizes(self) -> None:
+        """Test that WebP and PNG widths are offered with matching sizes"""
+        tag = ResponsiveImages({'images/chart.png': RASTER}).img_tag('images/chart.png', 'Chart')
+
+        assert tag.startswith('<picture><source srcset="images/chart-40w.webp 40w, images/chart-80w.webp 80w"')
+        assert 'type="image/webp"' in tag
+        assert '<img src="images/chart.png" srcset="images/chart-40w.png 40w, images/chart-80w.png 80w"' in tag
+        assert tag.count(f'sizes="{RASTER.sizes}"') == 2
+
+    def test_vector_variant_preferred_over_png(self) -> None:
+        """Test that the SVG is offered first with the PNG as fallback"""
+        tag = ResponsiveImages({'images/chart.png': VECTOR}).img_tag('images/chart.png', 'Chart')
+
+        assert tag == ('<picture><source srcset="images/chart.svg" type="image/svg+xml" />'
+                       '<img src="images/chart.png" alt="Chart" /></picture>')
+
+    def test_rewrite_upgrades_inline_images_once(self) -> None:
+        """Test that inline images are upgraded and existing pictures are left alone"""
+        images = ResponsiveImages({'images/chart.png': VECTOR})
+        html = '<p><img alt="Chart" src="images/chart.png" title="T" /></p>'
+
+        rewritten = images.rewrite(html)
+
+        assert rewritten.count('<picture>') == 1
+        assert 'title="T"' in rewritten
+        assert images.rewrite(rewritten) == rewritten
+
+    def test_markdown_images_in_tabs_and_paragraphs(self) -> None:
+        """Test that standalone and tabbed images both get responsive markup"""
+        processor = MarkdownProcessor(ResponsiveImages({'images/chart.png': RASTER}))
+        content = """![Chart](images/chart.png)
+
+{{< tabs >}}
+{{< tab "One" "one" >}}
+![Chart](images/chart.png)
+{{< /tab >}}
+{{< /tabs >}}
+"""
+        _, html = processor.convert(content)
+
+        assert html.count('srcset="images/chart-40w.png 40w') == 2
+        assert '<div class="chart-wrapper"><picture>' in html
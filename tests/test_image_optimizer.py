@@ -0,0 +1,155 @@
+"""
+Tests for PNG optimization
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from src.builders.image_optimizer import (
+    COLOR_RGB,
+    COLOR_RGBA,
+    MIN_PSNR,
+    ImageOptimizer,
+    encode_png,
+    optimize_png,
+    psnr,
+)
+
+
+def pixels(data: bytes) -> np.ndarray:
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert('RGBA'))
+
+
+def png_bytes(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def flat_chart(size: int = 300) -> Image.Image:
+    """Antialiased lines and bars in a few colours, like the site's charts"""
+    image = Image.new('RGB', (size * 4, size * 4), 'white')
+    draw = ImageDraw.Draw(image)
+    for i, color in enumerate(('#0a1f44', '#4da3d8', '#e07a5f')):
+        draw.rectangle((40 + i * 300, 600, 240 + i * 300, 1150), fill=color)
+        draw.line([(0, 500 - i * 100), (1200, 100 + i * 150)], fill=color, width=12)
+    return image.resize((size, size), Image.Resampling.LANCZOS)
+
+
+class TestEncodePng:
+    """Test the PNG encoder"""
+
+    def test_round_trips_every_filter(self) -> None:
+        """Test that adaptive filtering of noisy and flat rows decodes to the same pixels"""
+        rng = np.random.default_rng(0)
+        rgba = rng.integers(0, 256, (40, 30, 4), dtype=np.uint8)
+        rgba[10:20] = 7
+        rgba[25:] = np.linspace(0, 255, 30, dtype=np.uint8)[None, :, None]
+
+        assert (pixels(encode_png(rgba, COLOR_RGBA)) == rgba).all()
+        assert (pixels(encode_png(rgba[..., :3], COLOR_RGB))[..., :3] == rgba[..., :3]).all()
+
+
+class TestOptimizePng:
+    """Test choosing the smallest acceptable encoding"""
+
+    def test_few_colours_become_an_exact_palette(self) -> None:
+        """Test that an image with at most 256 colours is stored losslessly as a palette"""
+        image = Image.new('RGBA', (200, 100), (0, 0, 0, 0))
+        ImageDraw.Draw(image).rectangle((20, 20, 120, 80), fill=(77, 163, 216, 255))
+        original = png_bytes(image)
+
+        data, method = optimize_png(original)
+
+        assert method == 'lossless'
+        assert (pixels(data) == pixels(original)).all()
+        with Image.open(io.BytesIO(data)) as optimized:
+            assert optimized.mode == 'P'
+
+    def test_flat_chart_is_quantized_within_tolerance(self) -> None:
+        """Test that an antialiased chart becomes a palette image close to the original"""
+        original = png_bytes(flat_chart())
+
+        data, method = optimize_png(original)
+
+        assert method == 'palette'
+        assert len(data) < len(original) / 2
+        assert psnr(pixels(original), pixels(data)) >= MIN_PSNR
+
+    def test_noise_is_never_quantized(self) -> None:
+        """Test that an image a palette cannot represent keeps its exact pixels"""
+        noise = np.random.default_rng(1).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+        original = png_bytes(Image.fromarray(noise))
+
+        data, method = optimize_png(original)
+
+        assert method in ('lossless', 'original')
+        assert len(data) <= len(original)
+        assert (pixels(data)[..., :3] == noise).all()
+
+
+class TestImageOptimizer:
+    """Test optimizing files in place with a cache"""
+
+    def test_results_are_cached_by_input_hash(self, temp_dir: Path) -> None:
+        """Test that the same rendered bytes are restored from the cache instead of re-encoded"""
+        path = temp_dir / 'chart.png'
+        original = png_bytes(flat_chart())
+        path.write_bytes(original)
+        optimizer = ImageOptimizer(temp_dir / 'cache')
+
+        [first] = optimizer.run([('chart.png', path)])
+        optimized = path.read_bytes()
+        assert not first.cached and first.saved > 0 and first.after == len(optimized)
+
+        # Already optimized: left alone
+        [second] = optimizer.run([('chart.png', path)])
+        assert second.cached and second.before == len(original)
+
+        # Re-rendered to the same bytes: restored
+        path.unlink()
+        path.write_bytes(original)
+        [third] = optimizer.run([('chart.png', path)])
+        assert third.cached and path.read_bytes() == optimized
+
+    def test_never_writes_through_hard_links(self, temp_dir: Path) -> None:
+        """Test that a file hard-linked into the render cache keeps its rendered bytes there"""
+        path = temp_dir / 'chart.png'
+        original = png_bytes(flat_chart())
+        path.write_bytes(original)
+        link = temp_dir / 'render-cache.png'
+        os.link(path, link)
+
+        ImageOptimizer().run([('chart.png', path)])
+
+        assert link.read_bytes() == original
+        assert path.read_bytes() != original
+
+    def test_cache_is_pruned_to_its_size_limit(self, temp_dir: Path) -> None:
+        """Test that superseded results are evicted once over max_bytes and orphaned images are deleted"""
+        path = temp_dir / 'chart.png'
+        cache_dir = temp_dir / 'cache'
+        cache_dir.mkdir()
+        (cache_dir / 'orphan.png').write_bytes(b'left behind')
+
+        path.write_bytes(png_bytes(flat_chart(300)))
+        [first] = ImageOptimizer(cache_dir).run([('chart.png', path)])
+        assert not (cache_dir / 'orphan.png').exists()
+        assert len(list(cache_dir.glob('*.png'))) == 1
+
+        # The figure changes; the cache only has room for one result
+        changed = png_bytes(flat_chart(320))
+        path.unlink()
+        path.write_bytes(changed)
+        room_for_one = max(first.after, len(optimize_png(changed)[0])) + 1
+        ImageOptimizer(cache_dir, max_bytes=room_for_one).run([('chart.png', path)])
+
+        blobs = list(cache_dir.glob('*.png'))
+        assert len(blobs) == 1 and blobs[0].read_bytes() == path.read_bytes()
+        assert len(json.loads((cache_dir / 'index.json').read_text())['images']) == 1
@@ -0,0 +1,57 @@
+"""
+Import-time regression tests for the build system
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries that are only needed to draw figures
+HEAVY_MODULES = ('matplotlib', 'pandas', 'numpy', 'seaborn')
+
+# Agreed budget for importing the site builder in a fresh interpreter.
+# Markdown, Jinja2 and YAML take well under this; matplotlib alone exceeds it.
+IMPORT_BUDGET_S = 0.5
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'elapsed': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def import_in_subprocess(module: str) -> dict:
+    """Import module in a fresh interpreter and report its cost and loaded modules"""
+    result = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+class TestImportTime:
+    """Test that heavy plotting libraries are only imported when rendering"""
+
+    @pytest.mark.parametrize('module', [
+        'src.builders.site_builder',
+        'src.builders.plot_generator',
+        'src.builders.icon_generator',
+        'src.builders.svg_icons',
+    ])
+    def test_heavy_libraries_not_imported(self, module: str) -> None:
+        """Test that importing builders does not load plotting libraries"""
+        loaded = set(import_in_subprocess(module)['modules'])
+
+        assert not loaded & set(HEAVY_MODULES)
+
+    def test_site_builder_import_within_budget(self) -> None:
+        """Test that the site builder imports within the agreed budget"""
+        # Best of three to keep a busy machine from failing the test
+        elapsed = min(import_in_subprocess('src.builders.site_builder')['elapsed'] for _ in range(3))
+
+        assert elapsed < IMPORT_BUDGET_S
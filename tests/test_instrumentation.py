@@ -0,0 +1,156 @@
+"""
+Tests for crew instrumentation
+"""
+
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.agents.crew_agents import run_crew
+from src.agents.instrumentation import (
+    CrewInstrumentation,
+    TokenPrices,
+    estimate_tokens,
+    record_retry,
+    record_usage,
+)
+from src.agents.llm_cache import LLMCache, StubLLM
+from src.agents.scheduler import DagScheduler, run_task
+
+
+def read_log(path: Path) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestCrewInstrumentation:
+    """Test per-task metrics and the JSON-lines log"""
+
+    def test_crew_run_with_stub_model_is_logged(self, temp_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that every crew task gets a log line with tokens and cost, followed by the totals"""
+        log_path = temp_dir / 'crew.jsonl'
+        instrumentation = CrewInstrumentation(log_path, prices=TokenPrices(1.0, 2.0))
+
+        run_crew(StubLLM(), instrumentation=instrumentation)
+
+        records = read_log(log_path)
+        tasks, summary = records[:-1], records[-1]
+        assert len(tasks) == 8 and all(record['event'] == 'task' for record in tasks)
+        forecast = next(record for record in tasks if record['task'] == 'forecast')
+        assert forecast['agent'] == 'ForecastAgent' and forecast['model_calls'] == 1
+        assert forecast['prompt_tokens'] > forecast['completion_tokens'] > 0
+        assert forecast['cost_usd'] == pytest.approx(
+            (forecast['prompt_tokens'] + 2 * forecast['completion_tokens']) / 1e6, abs=1e-6
+        )
+        assert summary['event'] == 'summary' and summary['tasks'] == 8
+        assert summary['prompt_tokens'] == sum(record['prompt_tokens'] for record in tasks)
+        assert 'Crew task metrics' in capsys.readouterr().out
+
+    def test_retries_are_reported_by_the_retrying_layer(self) -> None:
+        """Test that wrapping never retries, and retries made inside the runner are counted through the hook"""
+        attempts = []
+
+        def client_with_retries(task: Any, context: list[str]) -> str:
+            # First attempt rate limited, second succeeds
+            attempts.append(task.name)
+            record_retry()
+            attempts.append(task.name)
+            return 'x' * 40
+
+        def failing(task: Any, context: list[str]) -> str:
+            attempts.append(task.name)
+            raise TimeoutError('rate limited')
+
+        instrumentation = CrewInstrumentation()
+        tasks = [SimpleNamespace(name='research', description='Verify the facts'), SimpleNamespace(name='fetch')]
+        runners = {'research': client_with_retries, 'fetch': failing}
+        wrapped = instrumentation.wrap(lambda task, context: runners[task.name](task, context))
+        result = DagScheduler(wrapped, listeners=[instrumentation]).run(tasks)
+
+        research, fetch = instrumentation.metrics['research'], instrumentation.metrics['fetch']
+        assert attempts == ['research', 'research', 'fetch']
+        assert (research.model_calls, research.retries) == (2, 1)
+        assert research.completion_tokens == estimate_tokens('x' * 40) == 10
+        assert (fetch.status, fetch.model_calls, fetch.retries) == ('failed', 1, 0)
+        assert not result.ok
+
+    def test_reported_usage_replaces_estimates(self) -> None:
+        """Test that token counts reported by the client are used instead of text estimates"""
+        def client(task: Any, context: list[str]) -> str:
+            record_usage(1234, 56)
+            return 'short'
+
+        instrumentation = CrewInstrumentation()
+        DagScheduler(instrumentation.wrap(client), listeners=[instrumentation]).run([SimpleNamespace(name='a')])
+
+        metrics = instrumentation.metrics['a']
+        assert (metrics.prompt_tokens, metrics.completion_tokens) == (1234, 56)
+
+    def test_default_runner_reports_crewai_retries_and_usage(self) -> None:
+        """Test that run_task reports the task's retry count and the agent's token usage during the call"""
+        class TokenProcess:
+            def __init__(self) -> None:
+                self.prompt_tokens, self.completion_tokens = 500, 20
+
+            def get_summary(self) -> SimpleNamespace:
+                return SimpleNamespace(prompt_tokens=self.prompt_tokens, completion_tokens=self.completion_tokens)
+
+        class CrewTask:
+            name = 'research'
+
+            def __init__(self) -> None:
+                self.agent = SimpleNamespace(name='ResearcherAgent', _token_process=TokenProcess())
+                self.retry_count = 0
+
+            def execute_sync(self, context: str) -> SimpleNamespace:
+                # One guardrail retry, two model calls between them
+                self.retry_count += 1
+                self.agent._token_process.prompt_tokens += 300
+                self.agent._token_process.completion_tokens += 40
+                return SimpleNamespace(raw='findings')
+
+        instrumentation = CrewInstrumentation()
+        result = DagScheduler(instrumentation.wrap(run_task), listeners=[instrumentation]).run([CrewTask()])
+
+        metrics = instrumentation.metrics['research']
+        assert result.outputs == {'research': 'findings'}
+        assert (metrics.model_calls, metrics.retries) == (2, 1)
+        assert (metrics.prompt_tokens, metrics.completion_tokens) == (300, 40)
+
+    def test_queue_wait_and_wall_time(self) -> None:
+        """Test that a task waiting for the single worker records its queue wait separately"""
+        def slow(task: Any, context: list[str]) -> str:
+            time.sleep(0.03)
+            return ''
+
+        instrumentation = CrewInstrumentation()
+        tasks = [SimpleNamespace(name='a'), SimpleNamespace(name='b')]
+        DagScheduler(slow, max_concurrency=1, listeners=[instrumentation]).run(tasks)
+
+        a, b = instrumentation.metrics['a'], instrumentation.metrics['b']
+        assert a.wall_s >= 0.03 and b.wall_s >= 0.03
+        assert b.queue_wait_s >= 0.025 > a.queue_wait_s
+
+    def test_cached_responses_use_no_tokens(self, temp_dir: Path) -> None:
+        """Test that a task answered from the response cache records no model calls"""
+        with LLMCache(temp_dir / 'llm.sqlite3') as cache:
+            run_crew(StubLLM(), cache=cache)
+            instrumentation = CrewInstrumentation()
+            run_crew(StubLLM(), cache=cache, instrumentation=instrumentation)
+
+        summary = instrumentation.summary()
+        assert summary['tasks'] == 8
+        assert summary['model_calls'] == summary['prompt_tokens'] == summary['cost_usd'] == 0
+
+    def test_replay_stub_model_is_measured(self) -> None:
+        """Test that responses from the replay stub model count as model calls with tokens"""
+        instrumentation = CrewInstrumentation()
+
+        run_crew(replay=True, instrumentation=instrumentation)
+
+        summary = instrumentation.summary()
+        assert summary['tasks'] == summary['model_calls'] == 8
+        assert summary['prompt_tokens'] > 0 and summary['completion_tokens'] > 0
@@ -0,0 +1,149 @@
+"""
+Tests for the agent response cache
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from src.agents.crew_agents import run_crew
+from src.agents.llm_cache import (
+    CachedRunner,
+    LLMCache,
+    cache_key,
+    documents_fingerprint,
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_task(description: str = 'Summarise the files', role: str = 'Summariser') -> SimpleNamespace:
+    agent = SimpleNamespace(name='SummarizerAgent', role=role, goal='Be concise')
+    return SimpleNamespace(name='summarise', agent=agent, description=description, expected_output='Bullets')
+
+
+class CountingRunner:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def __call__(self, task: Any, context: list[str]) -> str:
+        self.calls.append(task.name)
+        return f'{task.name} answer'
+
+
+class TestCacheKey:
+    """Test what a cached response depends on"""
+
+    def test_key_changes_with_agent_task_context_and_documents(self) -> None:
+        """Test that the role, description, upstream output and document fingerprint are all in the key"""
+        base = cache_key(make_task(), ['research notes'])
+
+        assert cache_key(make_task(), ['research notes']) == base
+        assert cache_key(make_task(role='Editor'), ['research notes']) != base
+        assert cache_key(make_task(description='Summarise again'), ['research notes']) != base
+        assert cache_key(make_task(), ['other notes']) != base
+        assert cache_key(make_task(), ['research notes'], fingerprint='abc') != base
+
+    def test_documents_fingerprint_follows_file_contents(self, temp_dir: Path) -> None:
+        """Test that editing a document changes the fingerprint"""
+        (temp_dir / 'report.pdf').write_bytes(b'first')
+        before = documents_fingerprint(temp_dir)
+
+        assert documents_fingerprint(temp_dir) == before
+        (temp_dir / 'report.pdf').write_bytes(b'second')
+        assert documents_fingerprint(temp_dir) != before
+
+
+class TestLLMCache:
+    """Test storage, expiry and eviction"""
+
+    def test_responses_persist_across_connections(self, temp_dir: Path) -> None:
+        """Test that a response stored by one run is read back by the next"""
+        path = temp_dir / 'llm.sqlite3'
+        with LLMCache(path) as cache:
+            cache.put('k', 'answer')
+
+        with LLMCache(path) as cache:
+            assert cache.get('k') == 'answer'
+            assert cache.get('missing') is None
+            assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_responses_expire_after_ttl(self, temp_dir: Path) -> None:
+        """Test that a response older than the TTL is treated as missing and removed"""
+        clock = Clock()
+        with LLMCache(temp_dir / 'llm.sqlite3', ttl_s=60, clock=clock) as cache:
+            cache.put('k', 'answer')
+            clock.now += 59
+            assert cache.get('k') == 'answer'
+            clock.now += 2
+            assert cache.get('k') is None
+            assert len(cache) == 0
+
+    def test_least_recently_used_responses_are_evicted(self, temp_dir: Path) -> None:
+        """Test that going over max_bytes drops the response read longest ago"""
+        clock = Clock()
+        with LLMCache(temp_dir / 'llm.sqlite3', max_bytes=25, clock=clock) as cache:
+            for key in ('a', 'b'):
+                cache.put(key, key * 10)
+                clock.now += 1
+            assert cache.get('a') == 'a' * 10
+            clock.now += 1
+
+            cache.put('c', 'c' * 10)
+
+            assert cache.get('b') is None
+            assert cache.get('a') is not None and cache.get('c') is not None
+            assert cache.size == 20 and cache.stats.evictions == 1
+
+
+class TestCachedRunner:
+    """Test running crew tasks through the cache"""
+
+    def test_second_run_reuses_every_response(self, temp_dir: Path) -> None:
+        """Test that an unchanged crew is answered entirely from the cache on the next run"""
+        runner = CountingRunner()
+        with LLMCache(temp_dir / 'llm.sqlite3') as cache:
+            first = run_crew(runner, cache=cache)
+            assert len(runner.calls) == 8
+
+            second = run_crew(runner, cache=cache)
+
+        assert len(runner.calls) == 8
+        assert second.outputs == first.outputs
+
+    def test_changed_upstream_output_invalidates_dependents(self, temp_dir: Path) -> None:
+        """Test that a task is asked again when the context it receives changes"""
+        runner = CountingRunner()
+        with LLMCache(temp_dir / 'llm.sqlite3') as cache:
+            cached = CachedRunner(runner, cache)
+            task = make_task()
+            cached(task, ['v1'])
+            cached(task, ['v1'])
+            cached(task, ['v2'])
+
+        assert runner.calls == ['summarise', 'summarise']
+
+    def test_replay_runs_offline_and_deterministically(self) -> None:
+        """Test that replay never calls the model and gives the same outputs every time"""
+        def offline(task: Any, context: list[str]) -> str:
+            raise AssertionError('replay must not call the model')
+
+        first = run_crew(offline, replay=True)
+        second = run_crew(offline, replay=True)
+
+        assert first.ok and len(first.outputs) == 8
+        assert first.outputs == second.outputs
+
+    def test_replay_prefers_recorded_responses(self, temp_dir: Path) -> None:
+        """Test that replay returns recorded responses and stubs only the rest"""
+        with LLMCache(temp_dir / 'llm.sqlite3') as cache:
+            recorded = run_crew(CountingRunner(), cache=cache)
+            replayed = run_crew(CountingRunner(), cache=cache, replay=True)
+
+        assert replayed.outputs == recorded.outputs
@@ -0,0 +1,44 @@
+"""
+Tests for the page renderer module - Core functionality only
+"""
+
+from pathlib import Path
+
+from src.builders.page_renderer import render_pages
+
+TEMPLATES_DIR = str(Path(__file__).parent.parent / "src" / "templates")
+
+
+class TestRenderPages:
+    """Test serial and parallel page rendering"""
+
+    def write_pages(self, temp_dir: Path, sample_markdown_content: str) -> list[Path]:
+        pages = []
+        for name in ['index', 'economy', 'privacy']:
+            page = temp_dir / f"{name}.md"
+            page.write_text(sample_markdown_content.replace("Test Page", f"{name} page"))
+            pages.append(page)
+        return pages
+
+    def test_parallel_output_matches_serial(self, temp_dir: Path, sample_markdown_content: str) -> None:
+        """Test that pooled rendering is byte-identical and in input order"""
+        pages = self.write_pages(temp_dir, sample_markdown_content)
+
+        serial = list(render_pages(pages, TEMPLATES_DIR, workers=1))
+        parallel = list(render_pages(pages, TEMPLATES_DIR, workers=2))
+
+        assert [r.output for r in parallel] == ['index.html', 'economy.html', 'privacy.html']
+        assert [r.html for r in parallel] == [r.html for r in serial]
+        assert all(r.html and 'economy page' in r.html for r in serial[1:2])
+
+    def test_errors_are_collected_per_page(self, temp_dir: Path, sample_markdown_content: str) -> None:
+        """Test that a failing page is reported without stopping the others"""
+        pages = self.write_pages(temp_dir, sample_markdown_content)
+        broken = temp_dir / "broken.md"
+        broken.write_bytes(b"\xff\xfe not utf-8")
+
+        results = list(render_pages([broken] + pages, TEMPLATES_DIR, workers=1))
+
+        assert results[0].html is None
+        assert results[0].error is not None and 'UnicodeDecodeError' in results[0].error
+        assert all(r.html for r in results[1:])
@@ -0,0 +1,87 @@
+"""
+Tests for precompressed output variants
+"""
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from src.builders import precompress
+from src.builders.precompress import Precompressor, variant_path
+
+CSS = "body { color: #0a1f44; }\n" * 200
+
+
+class TestPrecompressor:
+    """Test writing, skipping and cleaning up compressed siblings"""
+
+    def make_output(self, temp_dir: Path) -> Path:
+        docs = temp_dir / 'docs'
+        (docs / 'search').mkdir(parents=True)
+        (docs / 'style.css').write_text(CSS)
+        (docs / 'index.html').write_text('<p>' + 'AI safety ' * 300 + '</p>')
+        (docs / 'search' / 'ab.json').write_text('{}')
+        (docs / 'photo.png').write_bytes(b'\x89PNG' * 100)
+        return docs
+
+    def test_writes_smaller_variants_only(self, temp_dir: Path) -> None:
+        """Test that text files get a gzip sibling unless compressing would not save bytes"""
+        docs = self.make_output(temp_dir)
+
+        results = {result.output: result for result in Precompressor(docs, workers=2).run()}
+
+        assert gzip.decompress((docs / 'style.css.gz').read_bytes()).decode() == CSS
+        assert results['style.css'].variants['.gz'] < len(CSS) / 10
+        assert not (docs / 'search' / 'ab.json.gz').exists()
+        assert results['search/ab.json'].variants == {}
+        assert 'photo.png' not in results
+
+    def test_output_is_deterministic(self, temp_dir: Path) -> None:
+        """Test that recompressing the same bytes gives identical files"""
+        docs = self.make_output(temp_dir)
+        Precompressor(docs).run()
+        first = (docs / 'style.css.gz').read_bytes()
+
+        (docs / 'style.css.gz').unlink()
+        Precompressor(docs).run()
+
+        assert (docs / 'style.css.gz').read_bytes() == first
+
+    def test_unchanged_files_are_skipped(self, temp_dir: Path) -> None:
+        """Test that only files whose content hash changed are recompressed"""
+        docs = self.make_output(temp_dir)
+        cache_path = temp_dir / 'cache' / 'precompress.json'
+        Precompressor(docs, cache_path).run()
+
+        assert all(result.skipped for result in Precompressor(docs, cache_path).run())
+
+        (docs / 'index.html').write_text('<p>' + 'Resilience ' * 300 + '</p>')
+        (docs / 'style.css.gz').unlink()
+        rerun = {result.output: result for result in Precompressor(docs, cache_path).run()}
+
+        assert [output for output, result in rerun.items() if not result.skipped] == ['index.html', 'style.css']
+        assert gzip.decompress((docs / 'index.html.gz').read_bytes()).startswith(b'<p>Resilience')
+
+    def test_stale_variants_are_removed(self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that variants of deleted files, and of encoders no longer available, are removed"""
+        docs = self.make_output(temp_dir)
+        Precompressor(docs).run()
+        variant_path(docs / 'style.css', '.zst').write_bytes(b'old')
+
+        (docs / 'index.html').unlink()
+        monkeypatch.setattr(precompress, 'encoders', lambda: {'.gz': precompress._gzip_compress})
+        Precompressor(docs).run()
+
+        assert not (docs / 'index.html.gz').exists()
+        assert not (docs / 'style.css.zst').exists()
+        assert (docs / 'style.css.gz').exists()
+
+    @pytest.mark.skipif('.zst' not in precompress.encoders(), reason="no zstd encoder installed")
+    def test_zstd_variant(self, temp_dir: Path) -> None:
+        """Test that a zstd sibling is written when an encoder is available"""
+        docs = self.make_output(temp_dir)
+
+        results = {result.output: result for result in Precompressor(docs).run()}
+
+        assert results['style.css'].variants['.zst'] < len(CSS) / 10
@@ -0,0 +1,56 @@
+"""
+Tests for build profiling - Core functionality only
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src.builders import profiling
+from src.builders.profiling import BuildProfiler, Stopwatch
+
+
+class TestBuildProfiler:
+    """Test stage and output measurements"""
+
+    def test_stopwatch_measures_wall_time(self) -> None:
+        """Test that the stopwatch captures elapsed time and memory growth"""
+        with Stopwatch() as stopwatch:
+            time.sleep(0.02)
+
+        assert stopwatch.timing.wall_s >= 0.02
+        assert stopwatch.timing.rss_growth_mb >= 0
+
+    def test_memory_is_growth_per_stage_and_peak_per_build(self, temp_dir: Path,
+                                                           monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a stage after the largest one reports no growth, and the peak is reported once"""
+        high_water = iter([100.0, 400.0, 400.0, 400.0, 400.0])
+        monkeypatch.setattr(profiling, 'high_water_mb', lambda: next(high_water))
+        profiler = BuildProfiler()
+        with profiler.stage('figures'):
+            pass
+        with profiler.stage('pages'):
+            pass
+
+        report = profiler.report()
+        assert [stage['rss_growth_mb'] for stage in report['stages']] == [300.0, 0.0]
+        assert report['total']['peak_rss_mb'] == 400.0
+        assert all('peak_rss_mb' not in stage for stage in report['stages'])
+
+    def test_report_and_profile_dumps(self, temp_dir: Path) -> None:
+        """Test that stages, outputs and cProfile dumps end up in the report directory"""
+        profiler = BuildProfiler(profile_dir=temp_dir / "profiles")
+        with profiler.stage('pages'):
+            with Stopwatch() as stopwatch:
+                sum(range(1000))
+            profiler.record_output('pages', 'index.html', stopwatch.timing)
+        profiler.add_section('render_cache', {'hits': 1, 'misses': 0})
+        profiler.write_report(temp_dir / "build-report.json")
+
+        report = json.loads((temp_dir / "build-report.json").read_text())
+        assert [stage['stage'] for stage in report['stages']] == ['pages']
+        assert report['outputs'][0]['output'] == 'index.html'
+        assert report['render_cache'] == {'hits': 1, 'misses': 0}
+        assert (temp_dir / "profiles" / "pages.prof").stat().st_size > 0
@@ -0,0 +1,65 @@
+"""
+Tests for the figure render cache - Core functionality only
+"""
+
+import os
+from pathlib import Path
+
+from src.builders.figures import FigureJob
+from src.builders.render_cache import RenderCache
+
+
+def draw_text(csv_path: str, save_path: str) -> None:
+    """Stand-in figure function"""
+    Path(save_path).write_text(Path(csv_path).read_text().upper())
+
+
+class TestRenderCache:
+    """Test render cache keys, hits and eviction"""
+
+    def make_job(self, temp_dir: Path, style_key: str = 'style') -> FigureJob:
+        return FigureJob(
+            output='chart.png',
+            func=draw_text,
+            kwargs={'csv_path': str(temp_dir / 'data.csv'), 'save_path': str(temp_dir / 'out' / 'chart.png')},
+            inputs=(temp_dir / 'data.csv',),
+            style_key=style_key,
+        )
+
+    def test_key_tracks_data_and_style(self, temp_dir: Path) -> None:
+        """Test that the cache key changes with input bytes and style"""
+        (temp_dir / 'data.csv').write_text('a,b\n1,2\n')
+        cache = RenderCache(temp_dir / 'cache')
+        key = cache.key(self.make_job(temp_dir))
+
+        assert cache.key(self.make_job(temp_dir)) == key
+        assert cache.key(self.make_job(temp_dir, style_key='other')) != key
+
+        (temp_dir / 'data.csv').write_text('a,b\n1,3\n')
+        assert cache.key(self.make_job(temp_dir)) != key
+
+    def test_store_then_fetch(self, temp_dir: Path) -> None:
+        """Test that a stored render is restored on the next fetch"""
+        rendered = temp_dir / 'chart.png'
+        rendered.write_bytes(b'png bytes')
+        cache = RenderCache(temp_dir / 'cache')
+
+        destination = temp_dir / 'docs' / 'chart.png'
+        assert not cache.fetch('abc', [destination])
+
+        cache.store('abc', [rendered])
+        assert cache.fetch('abc', [destination])
+        assert destination.read_bytes() == b'png bytes'
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_eviction_removes_least_recently_used(self, temp_dir: Path) -> None:
+        """Test that the oldest entries are evicted once the size limit is exceeded"""
+        cache = RenderCache(temp_dir / 'cache', max_bytes=250)
+        for i, key in enumerate(['old', 'mid', 'new']):
+            source = temp_dir / 'chart.png'
+            source.write_bytes(b'x' * 100)
+            cache.store(key, [source])
+            os.utime(temp_dir / 'cache' / key, (1000 + i, 1000 + i))
+        cache.evict()
+
+        assert sorted(p.name for p in (temp_dir / 'cache').iterdir()) == ['mid', 'new']
@@ -0,0 +1,152 @@
+"""
+Tests for the crew task scheduler
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.agents.crew_agents import build_agents, build_tasks, run_crew
+from src.agents.scheduler import DagScheduler, task_dependencies
+
+
+def make_task(name: str, *context: Any) -> SimpleNamespace:
+    return SimpleNamespace(name=name, context=list(context))
+
+
+def diamond() -> list[SimpleNamespace]:
+    """a feeds b and c, which both feed d"""
+    a = make_task('a')
+    b = make_task('b', a)
+    c = make_task('c', a)
+    return [a, b, c, make_task('d', b, c)]
+
+
+class TestTaskDependencies:
+    """Test deriving the graph from task context"""
+
+    def test_crew_graph_follows_context(self) -> None:
+        """Test that data fetching and evaluation both depend only on research"""
+        graph = task_dependencies(build_tasks(build_agents()))
+
+        assert graph['data_fetch'] == ['research']
+        assert graph['evaluate'] == ['research']
+        assert graph['forecast'] == ['research', 'data_fetch']
+        assert graph['summarise'] == []
+
+    def test_context_sentinel_means_no_dependencies(self) -> None:
+        """Test that a non-list context, like CrewAI's NOT_SPECIFIED default, is treated as none"""
+        class NotSpecified:
+            def __bool__(self) -> bool:
+                return True
+
+        first = SimpleNamespace(name='first', context=NotSpecified())
+        second = make_task('second', first)
+
+        assert task_dependencies([first, second]) == {'first': [], 'second': ['first']}
+        result = DagScheduler(lambda task, context: task.name).run([first, second])
+        assert result.ok and result.outputs == {'first': 'first', 'second': 'second'}
+
+    def test_cycles_and_unscheduled_context_are_rejected(self) -> None:
+        """Test that a cycle or a context task missing from the list raises ValueError"""
+        a, b = make_task('a'), make_task('b')
+        a.context, b.context = [b], [a]
+        with pytest.raises(ValueError, match='cycle'):
+            task_dependencies([a, b])
+        with pytest.raises(ValueError, match='not scheduled'):
+            task_dependencies([make_task('c', make_task('missing'))])
+
+
+class TestDagScheduler:
+    """Test running tasks concurrently in dependency order"""
+
+    def test_independent_tasks_run_concurrently(self) -> None:
+        """Test that b and c run at the same time and d sees both outputs in context order"""
+        barrier = threading.Barrier(2, timeout=5)
+        contexts = {}
+
+        def runner(task: SimpleNamespace, context: list[str]) -> str:
+            contexts[task.name] = context
+            if task.name in ('b', 'c'):
+                barrier.wait()
+            return task.name.upper()
+
+        result = DagScheduler(runner, max_concurrency=2).run(diamond())
+
+        assert result.ok
+        assert contexts == {'a': [], 'b': ['A'], 'c': ['A'], 'd': ['B', 'C']}
+
+    def test_concurrency_limit_is_respected(self) -> None:
+        """Test that no more than max_concurrency tasks run at once, and the rest wait in the queue"""
+        tasks = [make_task(str(i)) for i in range(6)]
+        lock = threading.Lock()
+        active, peak = 0, 0
+
+        def runner(task: SimpleNamespace, context: list[str]) -> str:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return ''
+
+        result = DagScheduler(runner, max_concurrency=2).run(tasks)
+
+        assert peak == 2
+        assert max(run.queue_wait_s for run in result.runs.values()) > 0.01
+
+    def test_failure_skips_only_dependents(self) -> None:
+        """Test that a failed task's dependents are skipped while unrelated tasks still run"""
+        tasks = diamond() + [make_task('e')]
+
+        def runner(task: SimpleNamespace, context: list[str]) -> str:
+            if task.name == 'b':
+                raise RuntimeError('model unavailable')
+            return task.name
+
+        result = DagScheduler(runner).run(tasks)
+
+        statuses = {name: run.status for name, run in result.runs.items()}
+        assert statuses == {'a': 'done', 'b': 'failed', 'c': 'done', 'd': 'skipped', 'e': 'done'}
+        assert isinstance(result.runs['b'].error, RuntimeError)
+        assert not result.ok and result.failed == ['b']
+
+    def test_critical_path_is_the_slowest_chain(self) -> None:
+        """Test that the critical path follows the slower branch of the diamond"""
+        delays = {'a': 0.01, 'b': 0.01, 'c': 0.06, 'd': 0.01}
+
+        def runner(task: SimpleNamespace, context: list[str]) -> str:
+            time.sleep(delays[task.name])
+            return task.name
+
+        result = DagScheduler(runner).run(diamond())
+
+        assert result.critical_path == ['a', 'c', 'd']
+        assert result.critical_path_s <= result.wall_s
+
+
+class TestRunCrew:
+    """Test running the crew end to end against a stub runner"""
+
+    def test_crew_overlaps_branches(self) -> None:
+        """Test that every crew task runs, with the market branch overlapping the content branch"""
+        events = []
+
+        def runner(task: Any, context: list[str]) -> str:
+            time.sleep(0.02)
+            return f'{task.name} output'
+
+        result = run_crew(runner, listeners=[lambda event, run: events.append((event, run.name))])
+
+        assert result.ok and len(result.outputs) == 8
+        runs = result.runs
+        assert runs['data_fetch'].started_at < runs['evaluate'].finished_at
+        assert runs['forecast'].started_at < runs['develop'].finished_at
+        assert result.critical_path[:2] == ['summarise', 'research']
+        assert result.critical_path[-1] == 'deploy'
+        assert events.count(('finished', 'deploy')) == 1
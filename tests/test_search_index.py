@@ -0,0 +1,138 @@
+"""
+Tests for the client-side search index
+"""
+
+import itertools
+import json
+import random
+from pathlib import Path
+
+from src.builders.search_index import (
+    SearchDocument,
+    SearchIndex,
+    decode_postings,
+    encode_postings,
+    page_text,
+    shard_key,
+    tokenize,
+)
+
+PAGE = """<html><body>
+<nav><span class="label">Economy &amp; Policy</span></nav>
+<main><h1>Labour markets</h1><p>Automation reshapes <strong>labour</strong> and wages.</p>
+<script>var ignored = "javascript";</script></main>
+<footer>References</footer>
+</body></html>"""
+
+
+def write_page(directory: Path, name: str, text: str) -> SearchDocument:
+    path = directory / f'{name}.html'
+    path.write_text(f'<html><body><main><p>{text}</p></main></body></html>', encoding='utf-8')
+    return SearchDocument(path.name, name.title(), path)
+
+
+def read_shard(index: SearchIndex, term: str) -> dict[str, list[int]]:
+    return json.loads((index.index_dir / f'{shard_key(term)}.json').read_text(encoding='utf-8'))
+
+
+class TestTokenizing:
+    """Test text extraction and tokenizing"""
+
+    def test_only_main_content_is_indexed(self) -> None:
+        """Test that nav, footer and scripts are left out and entities are decoded"""
+        terms = tokenize(page_text(PAGE))
+
+        assert terms == ['labour', 'markets', 'automation', 'reshapes', 'labour', 'wages']
+
+    def test_tokenize_drops_stopwords_and_short_tokens(self) -> None:
+        """Test lowercasing, stopwords, one-letter tokens and non-ASCII words"""
+        assert tokenize("The AI in a Café, and its 2030 outlook") == ['ai', 'café', '2030', 'outlook']
+
+    def test_postings_round_trip_as_gaps(self) -> None:
+        """Test that document ids are stored as gaps from the previous id"""
+        postings = [(3, 2), (4, 1), (10, 5)]
+
+        assert encode_postings(postings) == [3, 2, 1, 1, 6, 5]
+        assert decode_postings(encode_postings(postings)) == postings
+
+    def test_shard_keys(self) -> None:
+        """Test that terms are sharded by their first two ASCII characters"""
+        assert shard_key('labour') == 'la'
+        assert shard_key('2030') == '20'
+        assert shard_key('café') == 'ca'
+        assert shard_key('éclair') == '_'
+
+
+class TestSearchIndex:
+    """Test writing and incrementally updating the sharded index"""
+
+    def test_build_writes_postings_per_shard(self, temp_dir: Path) -> None:
+        """Test that each term's shard lists the pages that contain it"""
+        documents = [
+            write_page(temp_dir, 'economy', 'labour markets and labour policy'),
+            write_page(temp_dir, 'society', 'labour and wellbeing'),
+        ]
+        index = SearchIndex(temp_dir)
+
+        stats = index.build(documents)
+        table = json.loads((index.index_dir / 'documents.json').read_text(encoding='utf-8'))
+
+        assert table['documents'] == [['economy.html', 'Economy'], ['society.html', 'Society']]
+        assert decode_postings(read_shard(index, 'labour')['labour']) == [(0, 2), (1, 1)]
+        assert decode_postings(read_shard(index, 'wellbeing')['wellbeing']) == [(1, 1)]
+        assert stats['documents'] == 2
+        assert set(table['shards']) == {path.stem for path in index.index_dir.glob('*.json')} - {'documents'}
+
+    def test_rebuild_only_tokenizes_changed_pages(self, temp_dir: Path) -> None:
+        """Test that unchanged pages are reused and unchanged shards are not rewritten"""
+        cache_path = temp_dir / 'cache' / 'search-terms.json'
+        documents = [
+            write_page(temp_dir, 'economy', 'labour markets'),
+            write_page(temp_dir, 'society', 'wellbeing'),
+        ]
+        SearchIndex(temp_dir, cache_path).build(documents)
+
+        unchanged = SearchIndex(temp_dir, cache_path)
+        unchanged.build(documents)
+        assert (unchanged.tokenized, unchanged.written) == (0, [])
+
+        write_page(temp_dir, 'society', 'wellbeing and community')
+        changed = SearchIndex(temp_dir, cache_path)
+        changed.build(documents)
+        assert (changed.tokenized, changed.reused) == (1, 1)
+        # A new shard is listed in the document table, so both are written
+        assert sorted(changed.written) == ['co.json', 'documents.json']
+
+        removed = SearchIndex(temp_dir, cache_path)
+        removed.build(documents[:1])
+        assert not (temp_dir / 'search' / 'we.json').exists()
+
+    def test_index_size_at_ten_thousand_pages(self, temp_dir: Path) -> None:
+        """Test that a 10k-page index stays compact and a one-word query downloads a small shard"""
+        rng = random.Random(0)
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        vocabulary = [''.join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(5000)]
+        # Word frequencies fall off like natural text, so a few words appear on nearly every page
+        cumulative = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+        documents = [
+            write_page(temp_dir, f'page{i:05d}', ' '.join(rng.choices(vocabulary, cum_weights=cumulative, k=60)))
+            for i in range(10_000)
+        ]
+
+        index = SearchIndex(temp_dir)
+        stats = index.build(documents)
+
+        shard_sizes = {path.stem: path.stat().st_size for path in index.index_dir.glob('*.json')}
+        table_size = shard_sizes.pop('documents')
+        postings_size = sum(shard_sizes.values())
+        absolute_size = sum(
+            len(json.dumps([value for pair in decode_postings(encoded) for value in pair], separators=(',', ':')))
+            for key in shard_sizes
+            for encoded in json.loads((index.index_dir / f'{key}.json').read_text()).values()
+        )
+
+        assert stats['documents'] == 10_000
+        assert stats['bytes'] / stats['documents'] < 400
+        assert max(shard_sizes.values()) < postings_size / 20
+        assert table_size < 400_000
+        assert postings_size < 0.8 * absolute_size
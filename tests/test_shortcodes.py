@@ -0,0 +1,69 @@
+"""
+Tests for the shortcode engine - Core functionality only
+"""
+
+import time
+
+from src.builders.markdown_processor import MarkdownProcessor
+from src.builders.shortcodes import Shortcode, parse
+
+
+class TestShortcodes:
+    """Test shortcode parsing and rendering"""
+
+    def test_tabs_render_buttons_and_panels(self) -> None:
+        """Test that tabs become buttons plus one panel per tab"""
+        content = (
+            '{{< tabs >}}\n'
+            '{{< tab "Tab 1" "tab1" >}}\n**One**\n{{< /tab >}}\n'
+            '{{< tab "Tab 2" "tab2" >}}\nTwo\n{{< /tab >}}\n'
+            '{{< /tabs >}}'
+        )
+        html = MarkdownProcessor().process_custom_shortcodes(content)
+
+        assert '<button class="tab-button active" data-tab="tab1">Tab 1</button>' in html
+        assert '<button class="tab-button" data-tab="tab2">Tab 2</button>' in html
+        assert '<div class="tab-content" id="tab1" style="display: block;">\n<p><strong>One</strong></p>' in html
+        assert 'id="tab2" style="display: none;"' in html
+
+    def test_nested_shortcodes(self) -> None:
+        """Test that a callout inside a tab is rendered inside the tab panel"""
+        content = (
+            '{{< tabs >}}{{< tab "A" "a" >}}\n'
+            '{{< callout "tip" "Remember" >}}\nDiversify.\n{{< /callout >}}\n'
+            '{{< /tab >}}{{< /tabs >}}'
+        )
+        html = MarkdownProcessor().process_custom_shortcodes(content)
+
+        panel = html[html.index('id="a"'):]
+        assert '<div class="callout callout-tip">' in panel
+        assert '<p class="callout-title">Remember</p>' in panel
+        assert '<p>Diversify.</p>' in panel
+
+    def test_figure_shortcode(self) -> None:
+        """Test the self-closing figure shortcode"""
+        html = MarkdownProcessor().process_custom_shortcodes(
+            '{{< figure "images/chart.png" "A chart" "Source: data" >}}'
+        )
+
+        assert '<figure class="chart-wrapper">' in html
+        assert '<img src="images/chart.png" alt="A chart" loading="lazy" />' in html
+        assert '<figcaption>Source: data</figcaption>' in html
+
+    def test_unterminated_blocks_stay_literal(self) -> None:
+        """Test that unclosed and unknown shortcodes are left as written"""
+        content = '{{< tabs >}}\n{{< tab "A" "a" >}}\ntext\n{{< unknown >}}'
+        nodes = parse(content)
+
+        assert not any(isinstance(node, Shortcode) for node in nodes)
+        assert ''.join(str(node) for node in nodes) == content
+
+    def test_many_unterminated_blocks_are_linear(self) -> None:
+        """Test that pathological pages do not trigger backtracking blowups"""
+        content = '{{< tabs >}}\n{{< tab "A" "a" >}}\nsome text\n' * 20000
+
+        started = time.perf_counter()
+        html = MarkdownProcessor().process_custom_shortcodes(content)
+
+        assert html == content
+        assert time.perf_counter() - started < 2.0
@@ -0,0 +1,103 @@
+"""
+Tests for the frontmatter-only site index
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.builders.site_index import SiteIndex, read_frontmatter
+
+
+def write_page(content_dir: Path, name: str, frontmatter: str, body: str = '# Body\n') -> Path:
+    content_dir.mkdir(parents=True, exist_ok=True)
+    path = content_dir / f'{name}.md'
+    path.write_text(f'---\n{frontmatter}\n---\n\n{body}', encoding='utf-8')
+    return path
+
+
+class TestReadFrontmatter:
+    """Test reading the frontmatter block alone"""
+
+    def test_stops_at_closing_marker(self, temp_dir: Path) -> None:
+        """Test that the body is never decoded, so a body that is not UTF-8 is harmless"""
+        path = temp_dir / 'page.md'
+        path.write_bytes(b'---\ntitle: "Page"\nnav_order: 3\n---\n\n\xff\xfe not utf-8\n')
+
+        assert read_frontmatter(path) == {'title': 'Page', 'nav_order': 3}
+
+    def test_missing_or_unterminated_frontmatter(self, temp_dir: Path) -> None:
+        """Test that pages without a complete frontmatter block have none"""
+        plain = temp_dir / 'plain.md'
+        plain.write_text('# Just markdown\n')
+        unterminated = temp_dir / 'open.md'
+        unterminated.write_text('---\ntitle: "Never closed"\n\n# Body\n')
+
+        assert read_frontmatter(plain) == {}
+        assert read_frontmatter(unterminated) == {}
+
+
+class TestSiteIndex:
+    """Test navigation and caching of the site index"""
+
+    def make_site(self, content_dir: Path) -> None:
+        write_page(content_dir, 'index', 'title: "Welcome"\nnav: "main"\nnav_order: 1\nnav_title: "Home"\nnav_icon: "home_icon.png"')
+        write_page(content_dir, 'economy', 'title: "Economy"\nnav: "main"\nnav_order: 2\nnav_icon: "economy_icon.png"')
+        write_page(content_dir, 'action', 'title: "Act"\nnav: "action"\nnav_icon: "action_icon.png"')
+        write_page(content_dir, 'references', 'title: "References"')
+
+    def test_navigation_follows_frontmatter(self, temp_dir: Path) -> None:
+        """Test ordering, nav titles, icons and which pages are left out of the nav"""
+        self.make_site(temp_dir)
+
+        navigation = SiteIndex(temp_dir).navigation()
+
+        assert navigation['pages'] == [
+            {'name': 'index', 'url': 'index.html', 'title': 'Home', 'icon': 'home_icon.png'},
+            {'name': 'economy', 'url': 'economy.html', 'title': 'Economy', 'icon': 'economy_icon.png'},
+        ]
+        assert navigation['action_page'] == {
+            'name': 'action', 'url': 'action.html', 'title': 'Act', 'icon': 'action_icon.png',
+        }
+
+    def test_bad_nav_order_falls_back_with_a_warning(self, temp_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that a nav_order that is not a number is treated as 0 and the page is named"""
+        write_page(temp_dir, 'typo', 'title: "Typo"\nnav: "main"\nnav_order: first')
+        write_page(temp_dir, 'listed', 'title: "Listed"\nnav: "main"\nnav_order: [1]')
+
+        pages = SiteIndex(temp_dir).refresh()
+
+        assert pages['typo'].nav_order == 0 and pages['listed'].nav_order == 0
+        output = capsys.readouterr().out
+        assert "typo.md: nav_order 'first'" in output
+        assert 'listed.md: nav_order [1]' in output
+
+    def test_cache_skips_unchanged_pages(self, temp_dir: Path) -> None:
+        """Test that only pages changed since the last scan have their frontmatter read"""
+        content_dir = temp_dir / 'content'
+        self.make_site(content_dir)
+        cache_path = temp_dir / 'site-index.json'
+        first = SiteIndex(content_dir, cache_path)
+        first.refresh()
+
+        write_page(content_dir, 'economy', 'title: "Economy & Policy"\nnav: "main"\nnav_order: 2')
+        second = SiteIndex(content_dir, cache_path)
+        pages = second.refresh()
+
+        assert (first.hits, first.misses) == (0, 4)
+        assert (second.hits, second.misses) == (3, 1)
+        assert pages['economy'].title == 'Economy & Policy'
+        assert pages == SiteIndex(content_dir).refresh()
+
+    def test_navigation_file_changes_only_with_the_nav(self, temp_dir: Path) -> None:
+        """Test that body and non-nav edits leave the navigation file alone"""
+        content_dir = temp_dir / 'content'
+        self.make_site(content_dir)
+        navigation_path = temp_dir / 'navigation.json'
+        assert SiteIndex(content_dir).write_navigation(navigation_path)
+
+        write_page(content_dir, 'references', 'title: "Sources"', body='# Edited\n')
+        assert not SiteIndex(content_dir).write_navigation(navigation_path)
+
+        write_page(content_dir, 'references', 'title: "Sources"\nnav: "main"\nnav_order: 9')
+        assert SiteIndex(content_dir).write_navigation(navigation_path)
@@ -0,0 +1,117 @@
+"""
+Tests for streaming, chunked price history ingestion
+"""
+
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_minute_prices
+from src.builders import data_catalog
+from src.builders.data_catalog import SCHEMAS, DataCatalog, SchemaError
+from src.builders.streaming import aggregate, stream_price_history
+
+SCHEMA = SCHEMAS['market_trends']
+
+PRICES_CSV = """Date,SP500,Bitcoin
+2024-01-01 09:30,10,100
+2024-01-01 12:00,12,90
+2024-01-01 16:00,11,95
+2024-01-02 09:30,20,200
+2024-01-02 16:00,19,210
+"""
+
+
+def peak_traced_mb(path: Path, chunk_rows: int) -> float:
+    """Peak Python allocations while streaming a file, in MB"""
+    tracemalloc.start()
+    try:
+        stream_price_history(path, SCHEMA, 'D', chunk_rows)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+class TestStreaming:
+    """Test chunked aggregation of price histories"""
+
+    def test_daily_ohlc(self, temp_dir: Path) -> None:
+        """Test open, high, low and close per day"""
+        path = temp_dir / 'market_trends.csv'
+        path.write_text(PRICES_CSV)
+
+        history = stream_price_history(path, SCHEMA, 'D')
+
+        assert history.rows == 5
+        assert list(history.periods) == list(np.array(['2024-01-01', '2024-01-02'], dtype='datetime64[ns]'))
+        assert history.ohlc['SP500'].tolist() == [[10, 12, 10, 11], [20, 20, 19, 19]]
+        assert history.close('Bitcoin').tolist() == [95, 210]
+
+    def test_chunk_boundaries_do_not_change_result(self, temp_dir: Path) -> None:
+        """Test that periods split across chunks are merged exactly"""
+        path = temp_dir / 'market_trends.csv'
+        write_minute_prices(path, 200_000, block_rows=1_000)
+
+        whole = stream_price_history(path, SCHEMA, 'h', chunk_rows=10**6)
+        chunked = stream_price_history(path, SCHEMA, 'h', chunk_rows=997)
+
+        assert np.array_equal(whole.periods, chunked.periods)
+        for column in ('SP500', 'Bitcoin'):
+            assert np.array_equal(whole.ohlc[column], chunked.ohlc[column])
+
+    def test_rolling_bands(self, temp_dir: Path) -> None:
+        """Test that bands surround the rolling mean of the closes"""
+        path = temp_dir / 'market_trends.csv'
+        path.write_text(PRICES_CSV)
+
+        mean, lower, upper = stream_price_history(path, SCHEMA).rolling_bands('SP500', window=2)
+
+        assert mean.tolist() == [11, 15]
+        assert lower.tolist() == [11, 7]
+        assert upper.tolist() == [11, 23]
+
+    def test_schema_mismatch_is_rejected(self, temp_dir: Path) -> None:
+        """Test that a file with the wrong columns raises SchemaError"""
+        path = temp_dir / 'market_trends.csv'
+        path.write_text("Date,SP500\n2024-01-01,1\n")
+
+        with pytest.raises(SchemaError):
+            stream_price_history(path, SCHEMA)
+
+    def test_memory_does_not_grow_with_file_size(self, temp_dir: Path) -> None:
+        """Test that peak memory is set by the chunk size, not the file size"""
+        small, large = temp_dir / 'small.csv', temp_dir / 'large.csv'
+        write_minute_prices(small, 1024 * 1024, block_rows=10_000)
+        write_minute_prices(large, 8 * 1024 * 1024, block_rows=10_000)
+
+        small_peak = peak_traced_mb(small, chunk_rows=5_000)
+        large_peak = peak_traced_mb(large, chunk_rows=5_000)
+
+        assert large_peak < 1.5 * small_peak
+        assert large_peak < large.stat().st_size / (1024 * 1024) / 2
+
+
+class TestPriceHistory:
+    """Test the catalog's choice between loading and streaming"""
+
+    def test_streamed_and_loaded_histories_match(self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that large files are streamed with the same result as loading them"""
+        write_minute_prices(temp_dir / 'market_trends.csv', 100_000, block_rows=1_000)
+        loaded = DataCatalog(temp_dir).price_history('market_trends')
+
+        monkeypatch.setattr(data_catalog, 'STREAMING_MIN_BYTES', 0)
+        monkeypatch.setattr(DataCatalog, 'frame', lambda self, name: pytest.fail('file was loaded whole'))
+        streamed = DataCatalog(temp_dir).price_history('market_trends')
+
+        pd.testing.assert_index_equal(pd.DatetimeIndex(loaded.periods), pd.DatetimeIndex(streamed.periods))
+        assert np.array_equal(loaded.ohlc['SP500'], streamed.ohlc['SP500'])
+
+    def test_aggregate_of_empty_history(self) -> None:
+        """Test that an empty history aggregates to empty arrays"""
+        history = aggregate([], SCHEMA)
+
+        assert history.rows == 0
+        assert len(history.periods) == 0
@@ -0,0 +1,66 @@
+"""
+Tests for the vector navigation icon sprite
+"""
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from src.builders.icon_generator import ICONS
+from src.builders.image_formats import ResponsiveImages
+from src.builders.svg_icons import sprite, symbol_id, write_sprite
+from src.builders.template_engine import TemplateEngine
+
+SVG = '{http://www.w3.org/2000/svg}'
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'src' / 'templates'
+
+
+class TestSprite:
+    """Test drawing the icons as SVG"""
+
+    def test_one_symbol_per_icon(self) -> None:
+        """Test that the sprite is valid SVG with a titled, non-empty symbol for every icon"""
+        root = ET.fromstring(sprite())
+
+        symbols = root.findall(f'{SVG}symbol')
+        assert [symbol.get('id') for symbol in symbols] == [symbol_id(icon) for icon in ICONS]
+        for symbol, config in zip(symbols, ICONS.values(), strict=True):
+            assert symbol.get('viewBox')
+            assert symbol.find(f'{SVG}title').text == config['title']
+            assert len(symbol) > 2
+
+    def test_symbol_ids(self) -> None:
+        """Test that symbols are named after the icon files the nav frontmatter uses"""
+        assert symbol_id('home_icon.png') == 'icon-home'
+        assert symbol_id('ai_icon.png') == 'icon-ai'
+
+    def test_sprite_is_only_rewritten_when_changed(self, temp_dir: Path) -> None:
+        """Test that an unchanged sprite is left alone"""
+        path = temp_dir / 'images' / 'icons.svg'
+
+        assert write_sprite(path)
+        assert not write_sprite(path)
+        assert path.read_text() == sprite()
+
+
+class TestNavIcons:
+    """Test how templates reference navigation icons"""
+
+    def test_sprite_icons_use_fingerprinted_sprite(self) -> None:
+        """Test that nav icons are <use> references into the fingerprinted sprite"""
+        images = ResponsiveImages(assets={'images/icons.svg': 'images/icons.0123456789.svg'})
+        engine = TemplateEngine(str(TEMPLATES_DIR), images, icon_sprite='images/icons.svg')
+
+        html = str(engine.env.globals['nav_icon']('economy_icon.png', 'Economy & Policy icon'))
+
+        assert html == (
+            '<svg class="nav-icon" role="img" aria-label="Economy &amp; Policy icon">'
+            '<use href="images/icons.0123456789.svg#icon-economy"/></svg>'
+        )
+
+    def test_png_fallback(self) -> None:
+        """Test that without a sprite each icon is its own image"""
+        engine = TemplateEngine(str(TEMPLATES_DIR))
+
+        html = str(engine.env.globals['nav_icon']('economy_icon.png', 'Economy icon'))
+
+        assert html == '<img src="images/economy_icon.png" alt="Economy icon" class="nav-icon" />'
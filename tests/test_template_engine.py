@@ -0,0 +1,92 @@
+"""
+Tests for the template engine - Bytecode cache only
+"""
+
+import shutil
+from pathlib import Path
+
+from src.builders.page_renderer import render_pages
+from src.builders.template_engine import TemplateEngine
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "src" / "templates"
+FRONTMATTER = {'title': 'Cached', 'tagline': 'Compiled once'}
+
+
+class TestTemplateBytecodeCache:
+    """Test that compiled templates are reused across engines and invalidated on edits"""
+
+    def copy_templates(self, temp_dir: Path) -> Path:
+        templates_dir = temp_dir / "templates"
+        shutil.copytree(TEMPLATES_DIR, templates_dir)
+        return templates_dir
+
+    def test_second_engine_loads_bytecode(self, temp_dir: Path) -> None:
+        """Test that precompiling fills the cache and a fresh engine only hits it"""
+        templates_dir = self.copy_templates(temp_dir)
+        cache_dir = temp_dir / "cache"
+
+        first = TemplateEngine(str(templates_dir), cache_dir=cache_dir)
+        count = first.precompile()
+        second = TemplateEngine(str(templates_dir), cache_dir=cache_dir)
+        second.precompile()
+
+        assert count == len(list(templates_dir.rglob("*.html")))
+        assert (first.bytecode_cache.hits, first.bytecode_cache.misses) == (0, count)
+        assert (second.bytecode_cache.hits, second.bytecode_cache.misses) == (count, 0)
+        assert (second.render_page('page.html', '<p>Body</p>', FRONTMATTER, 'economy')
+                == TemplateEngine(str(templates_dir)).render_page('page.html', '<p>Body</p>', FRONTMATTER, 'economy'))
+
+    def test_edited_template_is_recompiled(self, temp_dir: Path) -> None:
+        """Test that a template whose source changed misses and renders the new source"""
+        templates_dir = self.copy_templates(temp_dir)
+        cache_dir = temp_dir / "cache"
+        TemplateEngine(str(templates_dir), cache_dir=cache_dir).precompile()
+
+        page = templates_dir / "page.html"
+        page.write_text(page.read_text().replace('<main>', '<main><!-- edited -->'))
+        engine = TemplateEngine(str(templates_dir), cache_dir=cache_dir)
+        html = engine.render_page('page.html', '<p>Body</p>', FRONTMATTER, 'economy')
+
+        assert '<!-- edited -->' in html
+        assert engine.bytecode_cache.misses == 1
+
+    def test_render_pages_reports_cache_use(self, temp_dir: Path, sample_markdown_content: str) -> None:
+        """Test that page results carry the template cache hits and misses of their worker"""
+        page = temp_dir / "economy.md"
+        page.write_text(sample_markdown_content)
+        cache_dir = str(temp_dir / "cache")
+
+        cold = list(render_pages([page, page], str(TEMPLATES_DIR), workers=1, cache_dir=cache_dir))
+        warm = list(render_pages([page], str(TEMPLATES_DIR), workers=1, cache_dir=cache_dir))
+
+        assert sum(r.template_cache_misses for r in cold) == 4  # page.html, base.html and its two partials
+        assert sum(r.template_cache_hits for r in cold) == 0
+        assert (warm[0].template_cache_hits, warm[0].template_cache_misses) == (4, 0)
+        assert warm[0].html == cold[0].html
+
+
+class TestFragments:
+    """Test that shared page fragments are rendered once and spliced into every page"""
+
+    def test_nav_rendered_once_per_variant(self) -> None:
+        """Test that pages outside the nav share one nav fragment and nav pages get their own"""
+        engine = TemplateEngine(str(TEMPLATES_DIR))
+
+        for name in ['economy', 'extra-1', 'extra-2', 'economy', 'extra-3']:
+            engine.render_page('page.html', '<p>Body</p>', FRONTMATTER, name)
+
+        # One nav for economy, one for every other page, and one footer
+        assert engine.fragment_misses == 3
+        assert engine.fragment_hits == 7
+
+    def test_spliced_nav_marks_current_page(self) -> None:
+        """Test that the cached nav still highlights only the current page"""
+        engine = TemplateEngine(str(TEMPLATES_DIR))
+
+        economy = engine.render_page('page.html', '<p>Body</p>', FRONTMATTER, 'economy')
+        extra = engine.render_page('page.html', '<p>Body</p>', FRONTMATTER, 'extra')
+
+        assert economy.count('current-page') == 1
+        assert 'nav-button current-page" onclick="location.href=\'economy.html\'' in economy
+        assert 'current-page' not in extra
+        assert extra.count('<footer>') == 1